@@ -7,7 +7,9 @@ Generates all required graphic assets based on EDL concepts
 
 import os
 import json
+import sys
 from pathlib import Path
+from urllib.request import urlretrieve
 from typing import Dict, List, Optional
 
 # Install: pip install fal-client
@@ -19,19 +21,20 @@ except ImportError:
 
 # Import asset utilities
 try:
-    from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker
+    from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker, preflight
 except ImportError:
     # Fallback if running standalone
     import sys
     from pathlib import Path
     sys.path.append(str(Path(__file__).resolve().parent.parent))
     try:
-        from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker
+        from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker, preflight
     except ImportError:
         print("⚠️  asset_utils not found. Using legacy naming convention.")
         generate_filename = None
         extract_scene_number = None
         ManifestTracker = None
+        preflight = None
 
 # Import cost check function
 try:
@@ -69,25 +72,45 @@ BRAND_COLORS = {
 # Loaded from external YAML configuration
 DATA_PATH = Path(r"C:\projects\fal.ai\3_Simulation\Feb1Youtube\_source\batch_generation_data.yaml")
 
+# Parsed queues memoized by (path, mtime) so repeated loads skip the YAML parse
+_QUEUE_CACHE: Dict[tuple, List[Dict]] = {}
+
 def load_queue():
-    """Load generation queue from YAML"""
-    if not DATA_PATH.exists():
+    """Load generation queue from YAML (parsed once per file version; returns fresh copies)"""
+    try:
+        mtime = DATA_PATH.stat().st_mtime_ns
+    except OSError:
         print(f"⚠️  Configuration file not found: {DATA_PATH}")
         return []
     
+    cache_key = (str(DATA_PATH), mtime)
+    if cache_key in _QUEUE_CACHE:
+        # Shallow-copy entries so callers can't mutate the memoized queue
+        return [dict(asset) for asset in _QUEUE_CACHE[cache_key]]
+    
     try:
         import yaml
+        # Prefer the libyaml C parser; fall back to the pure-Python SafeLoader
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data.get("graphics", [])
+            data = yaml.load(f, Loader=loader)
+            queue = data.get("graphics", [])
     except ImportError:
         print("❌ PyYAML not installed. Run: pip install PyYAML")
         return []
     except Exception as e:
         print(f"❌ Error loading configuration: {e}")
         return []
+    
+    _QUEUE_CACHE[cache_key] = queue
+    return [dict(asset) for asset in queue]
+
 
-GENERATION_QUEUE = load_queue()
+def __getattr__(name):
+    """Load GENERATION_QUEUE on first access instead of at import time (PEP 562)"""
+    if name == "GENERATION_QUEUE":
+        return load_queue()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def generate_asset(asset_config: Dict, output_dir: Path, manifest: Optional[object] = None, version: int = 1) -> Dict:
@@ -160,9 +183,8 @@ def generate_asset(asset_config: Dict, output_dir: Path, manifest: Optional[obje
             print(f"💾 Metadata saved: {output_path}")
             
             # Download image
-            import urllib.request
             image_path = output_dir / filename_png
-            urllib.request.urlretrieve(image_url, image_path)
+            urlretrieve(image_url, image_path)
             print(f"💾 Image saved: {image_path}")
             
             # Add to manifest if provided
@@ -282,6 +304,11 @@ def process_queue(queue: List[Dict], output_dir: Path, manifest: Optional[object
 
 def main():
     """Main execution"""
+    # Fail fast on missing API key / PyYAML before prompting
+    # (process_queue only reads FAL_KEY, so that is the only key accepted here)
+    if preflight is not None and not preflight(OUTPUT_DIR, require_yaml=True, key_names=("FAL_KEY",)):
+        sys.exit(1)
+    
     # Confirm before proceeding
     print("\n" + "="*60)
     response = input("🤔 Proceed with generation? (yes/no): ").strip().lower()
@@ -289,7 +316,7 @@ def main():
         print("❌ Cancelled by user")
         return
         
-    process_queue(GENERATION_QUEUE, OUTPUT_DIR)
+    process_queue(load_queue(), OUTPUT_DIR)
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ Derived from: 3_Simulation/2026-02-15/input/source_graphics.md
 Cost: ~$0.01/image × ~25 infographics = ~$0.25 (budget: $0.50)
 """
 
+import argparse
 import sys
 from pathlib import Path
 from typing import Dict, List
@@ -16,28 +17,16 @@ from typing import Dict, List
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from base.base_asset_generator import BaseAssetGenerator
+from base.generator_config import SEEDS, BRAND_COLORS, DEFAULT_MODELS
 from paths_config import get_weekly_paths, get_latest_weekly_id
-
-# Consistency seeds for different asset categories
-SEEDS = {
-    "SEED_001": 42,      # B-roll (can vary)
-    "SEED_002": 123456,  # Infographics (MUST match)
-    "SEED_003": 789012,  # Motion graphics (brand)
-    "SEED_004": 345678,  # UI overlays (template)
-}
-
-# Brand color palette (reference for prompts)
-BRAND_COLORS = {
-    "primary_dark": "#1a1a2e",
-    "accent_blue": "#00d4ff",
-    "accent_purple": "#7b2cbf",
-    "secondary_teal": "#00bfa5",
-    "highlight_orange": "#ff6b35",
-    "text_white": "#ffffff",
-}
+from Utils.asset_utils import preflight
 
 # Model configuration
-DEFAULT_MODEL = "fal-ai/flux/schnell"
+DEFAULT_MODEL = DEFAULT_MODELS["image_fast"]
+
+# Shared prompt fragments appended to the infographic prompts below
+FORMAT_8K = "16:9, 8K"
+CARD_LAYOUT_8K = "dark background, modern tech card layout, " + FORMAT_8K
 
 # ─── Infographic Queue — derived from source_graphics.md ────────────────────
 
@@ -53,7 +42,8 @@ GENERATION_QUEUE = [
             "Clean modern infographic stat card on dark background: large bold glowing number '240' "
             "in white with gold accent, subtitle 'Workflows Managed' underneath in sans-serif font, "
             "subtle animated particle trail behind the number, minimal tech aesthetic, "
-            "GitHub dark theme colors #24292e background, accent gold #FFD700, 16:9, 8K"
+            "GitHub dark theme colors #24292e background, accent gold #FFD700, "
+            + FORMAT_8K
         ),
     },
     {
@@ -80,7 +70,8 @@ GENERATION_QUEUE = [
             "Split-screen infographic comparison: left side labeled 'Static Rules' with icon of "
             "a locked padlock and rigid grid pattern in grey tones; right side labeled 'Dynamic AI' "
             "with flowing liquid mercury icon and adaptive mesh in blue-gold tones, "
-            "clean dividing line, modern data visualization style, dark background, 16:9, 8K"
+            "clean dividing line, modern data visualization style, dark background, "
+            + FORMAT_8K
         ),
     },
     {
@@ -92,7 +83,8 @@ GENERATION_QUEUE = [
         "prompt": (
             "Dramatic infographic visual: iron chains breaking apart into golden particles, "
             "text overlay 'Breaking the Iron Chains' in bold white, dark moody background, "
-            "sparks flying, liberation metaphor, cinematic motion graphic style, 16:9, 8K"
+            "sparks flying, liberation metaphor, cinematic motion graphic style, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 4: The Clone Lab ---
@@ -106,7 +98,8 @@ GENERATION_QUEUE = [
             "Clean process infographic checklist on dark background: three steps with checkmarks, "
             "'Step 1: Clone Repository ✓', 'Step 2: Setup Environment ✓', 'Step 3: Run Agent ✓', "
             "green checkmark icons, modern sans-serif font, sidebar layout, "
-            "GitHub blue #0366d6 accent color, minimal UI design, 16:9, 8K"
+            "GitHub blue #0366d6 accent color, minimal UI design, "
+            + FORMAT_8K
         ),
     },
     {
@@ -119,7 +112,8 @@ GENERATION_QUEUE = [
             "Clean data comparison table infographic: 'VS Code vs Cursor AI' header, "
             "rows showing features like Free Tier, Local Agent, Git Support with checkmark and "
             "dash icons, modern flat design, dark background, blue and white color scheme, "
-            "professional tech presentation table style, 16:9, 8K"
+            "professional tech presentation table style, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 5: The Evolution ---
@@ -133,7 +127,8 @@ GENERATION_QUEUE = [
             "Flowchart infographic: 'User → Repository → Clone' with flowing arrow connections, "
             "cloud icon for source, laptop icon for local machine, file copy animation trail, "
             "abstract technical style, glowing blue connections on dark background, "
-            "minimal node-based diagram, 16:9, 8K"
+            "minimal node-based diagram, "
+            + FORMAT_8K
         ),
     },
     {
@@ -146,7 +141,8 @@ GENERATION_QUEUE = [
             "Futuristic progress bar infographic: circular progress indicator showing 78% complete, "
             "3D printer silhouette in background, percentage counter in large bold font, "
             "glowing cyan progress arc, dark background, clean modern data visualization, "
-            "tech HUD aesthetic, 16:9, 8K"
+            "tech HUD aesthetic, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 6: The Nursery ---
@@ -160,7 +156,8 @@ GENERATION_QUEUE = [
             "Inspirational quote infographic: 'Consistency is Your Magic Shield' in large bold "
             "white typography, decorative shield icon with golden glow, warm soft gradient "
             "background in purple-to-dark tones, elegant spacing, motivational poster style, "
-            "cinematic text layout, 16:9, 8K"
+            "cinematic text layout, "
+            + FORMAT_8K
         ),
     },
     {
@@ -172,7 +169,8 @@ GENERATION_QUEUE = [
         "prompt": (
             "Badge infographic overlay: shield-shaped badge icon with text 'Family-Tested Solution', "
             "warm golden and green colors, checkmark inside shield, friendly approachable design, "
-            "subtle glow effect, dark background with warm vignette, 16:9, 8K"
+            "subtle glow effect, dark background with warm vignette, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 7: The Crystal Ball ---
@@ -186,7 +184,8 @@ GENERATION_QUEUE = [
             "Tech platform comparison infographic: four quadrant layout showing abstract icons "
             "representing major AI platforms, each with a label — 'Search', 'Assistant', "
             "'Reasoning', 'Multi-modal', clean modern card-based design, dark gradient background, "
-            "subtle glow around each card, professional data visualization, 16:9, 8K"
+            "subtle glow around each card, professional data visualization, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 8: The Engine Room ---
@@ -200,7 +199,8 @@ GENERATION_QUEUE = [
             "Bold stat infographic: massive text '1000x' in white with motion blur streaks, "
             "subtitle 'Faster Deployment' below, speed lines radiating from center, "
             "energetic dark background with blue and orange energy trails, "
-            "dynamic typography, tech HUD style, 16:9, 8K"
+            "dynamic typography, tech HUD style, "
+            + FORMAT_8K
         ),
     },
     {
@@ -213,7 +213,8 @@ GENERATION_QUEUE = [
             "Horizontal bar chart infographic: 'Traditional' bar in grey at 10%, "
             "'AI-Powered' bar in glowing blue at 95%, clean comparison visualization, "
             "labels on left, percentages on right, dark background, modern flat design, "
-            "data dashboard aesthetic, 16:9, 8K"
+            "data dashboard aesthetic, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 9: The Digital Feast / LLMs ---
@@ -227,7 +228,7 @@ GENERATION_QUEUE = [
             "Feature card infographic: 'The Reasoning Layer' headline in bold white, "
             "abstract brain-circuit icon, bullet points 'Sonnet 3.5, 4.5, 4.6', "
             "'Best for: Complex Problems', card design with subtle orange-brown gradient border, "
-            "dark background, modern tech card layout, 16:9, 8K"
+            + CARD_LAYOUT_8K
         ),
     },
     {
@@ -240,7 +241,7 @@ GENERATION_QUEUE = [
             "Feature card infographic: 'The Versatile Leader' headline in bold white, "
             "abstract chat bubble icon with search lens, bullet points 'Search, Browsing, Plugins', "
             "'Best for: General Purpose', card with green gradient border, "
-            "dark background, modern tech card layout, 16:9, 8K"
+            + CARD_LAYOUT_8K
         ),
     },
     {
@@ -253,7 +254,7 @@ GENERATION_QUEUE = [
             "Feature card infographic: 'The Coding Disruptor' headline in bold white, "
             "abstract code terminal icon with lightning bolt, bullet points 'Free, Powerful', "
             "'Best for: Development', card with electric blue gradient border, "
-            "dark background, modern tech card layout, 16:9, 8K"
+            + CARD_LAYOUT_8K
         ),
     },
     {
@@ -266,7 +267,7 @@ GENERATION_QUEUE = [
             "Feature card infographic: 'The Versatile Platform' headline in bold white, "
             "abstract multi-faceted gem icon, bullet points 'Images, Code, Nano', "
             "'Best for: Multi-modal Tasks', card with purple-blue gradient border, "
-            "dark background, modern tech card layout, 16:9, 8K"
+            + CARD_LAYOUT_8K
         ),
     },
     {
@@ -279,7 +280,7 @@ GENERATION_QUEUE = [
             "Glowing stat infographic: large text '100+' in digital glitch aesthetic, "
             "flickering neon effect, subtitle 'AI Models Available' below, "
             "dark background with digital noise texture, cyberpunk data visualization, "
-            "16:9, 8K"
+            + FORMAT_8K
         ),
     },
     # --- Scene 10: The Power Station ---
@@ -293,7 +294,8 @@ GENERATION_QUEUE = [
             "Node-based workflow diagram infographic: connected nodes showing "
             "'Telegram/Email → n8n → MAC Filter → Internet Control', "
             "each node is a rounded rectangle with icon, flowing data arrows between nodes, "
-            "n8n orange brand color accents, dark background, clean technical diagram, 16:9, 8K"
+            "n8n orange brand color accents, dark background, clean technical diagram, "
+            + FORMAT_8K
         ),
     },
     {
@@ -305,7 +307,8 @@ GENERATION_QUEUE = [
         "prompt": (
             "Bold title infographic: 'The Internet Kill Switch' in stark white text with red "
             "glitch distortion effect, big red power button icon below, tech-noir aesthetic, "
-            "dark background with red accent lighting, dramatic and cyberpunk, 16:9, 8K"
+            "dark background with red accent lighting, dramatic and cyberpunk, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 11: The Tool Shed ---
@@ -319,7 +322,7 @@ GENERATION_QUEUE = [
             "GitHub-style stat box infographic: large number '37+' in bold white, "
             "subtitle 'Commits — Continuous Evolution' below, green contribution graph pattern "
             "in background, GitHub dark theme #24292e, modern developer dashboard aesthetic, "
-            "16:9, 8K"
+            + FORMAT_8K
         ),
     },
     {
@@ -332,7 +335,8 @@ GENERATION_QUEUE = [
             "Linear pipeline infographic: five connected stages 'Code → Test → Build → Deploy → Live', "
             "each stage is a node with green checkmark, arrow connections between them, "
             "horizontal flow left to right, clean flat design, green success color, "
-            "dark background, DevOps diagram style, 16:9, 8K"
+            "dark background, DevOps diagram style, "
+            + FORMAT_8K
         ),
     },
     {
@@ -345,7 +349,8 @@ GENERATION_QUEUE = [
             "Modern dashboard infographic grid: four metric cards in a 2x2 grid, "
             "'Compliance: 100%' in green, 'Accuracy: 98.5%' in blue, 'Uptime: 99.9%' in cyan, "
             "'Self-growth: ↑37 iterations' in gold, each with a circular progress ring, "
-            "dark background, clean data visualization design, 16:9, 8K"
+            "dark background, clean data visualization design, "
+            + FORMAT_8K
         ),
     },
     # --- Scene 12: The Balcony ---
@@ -359,7 +364,8 @@ GENERATION_QUEUE = [
             "Step-by-step call to action infographic: four numbered steps vertically — "
             "'1. Take Assessment', '2. Watch Simulation', '3. Clone Repository', '4. Build Your Future', "
             "each with a small icon, connecting dotted line between steps, "
-            "gold accent numbers, white text, dark gradient background, clean modern design, 16:9, 8K"
+            "gold accent numbers, white text, dark gradient background, clean modern design, "
+            + FORMAT_8K
         ),
     },
     {
@@ -371,7 +377,8 @@ GENERATION_QUEUE = [
         "prompt": (
             "Inspirational quote infographic: 'Zero Capital, Infinite Potential' in large bold "
             "white serif typography on dark background, subtle gold particle burst behind text, "
-            "minimal elegant design, motivational poster aesthetic, 16:9, 8K"
+            "minimal elegant design, motivational poster aesthetic, "
+            + FORMAT_8K
         ),
     },
 ]
@@ -380,13 +387,16 @@ GENERATION_QUEUE = [
 class InfographicsGenerator(BaseAssetGenerator):
     """Generator for infographic assets using base class architecture."""
 
-    def __init__(self, output_dir: Path, seeds: Dict[str, int], brand_colors: Dict[str, str]):
+    def __init__(self, output_dir: Path, seeds: Dict[str, int], brand_colors: Dict[str, str],
+                 max_workers: int = 1, force: bool = False):
         super().__init__(
             output_dir=output_dir,
             seeds=seeds,
             brand_colors=brand_colors,
             asset_type='infographic',
-            output_format='png'
+            output_format='png',
+            max_workers=max_workers,
+            force=force
         )
 
     def get_generation_queue(self) -> List[Dict]:
@@ -396,11 +406,21 @@ class InfographicsGenerator(BaseAssetGenerator):
 
 def main():
     """Main execution using base class architecture."""
+    parser = argparse.ArgumentParser(description="Generate infographic assets with fal.ai")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Concurrent fal.ai requests (max 4, default 1 = sequential)")
+    parser.add_argument("--batch-prompts-per-request", type=int, default=1, metavar="N",
+                        help="Request N images per prompt in one call (num_images, max 4) for seed exploration")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate assets whose output file already exists")
+    args = parser.parse_args()
+
     # Get latest weekly paths or use default
     weekly_id = get_latest_weekly_id() or "2026-02-15"
     paths = get_weekly_paths(weekly_id)
     output_dir = paths['output']
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if not preflight(output_dir):
+        sys.exit(1)
 
     print("=" * 60)
     print("📊 FAL.AI INFOGRAPHICS GENERATOR (Base Class Architecture)")
@@ -412,14 +432,18 @@ def main():
     generator = InfographicsGenerator(
         output_dir=output_dir,
         seeds=SEEDS,
-        brand_colors=BRAND_COLORS
+        brand_colors=BRAND_COLORS,
+        max_workers=min(max(args.workers, 1), 4),
+        force=args.force
     )
 
-    # Generate all assets
-    results = generator.generate_batch()
+    queue = generator.get_generation_queue()
+    num_images = min(max(args.batch_prompts_per_request, 1), 4)
+    if num_images > 1:
+        queue = [{**asset, "num_images": num_images} for asset in queue]
 
-    # Display results
-    generator.display_summary(results)
+    # Generate all assets
+    generator.process_queue(queue)
 
 
 if __name__ == "__main__":
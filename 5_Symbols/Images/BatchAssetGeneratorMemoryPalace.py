@@ -10,8 +10,14 @@ Cost: ~$0.01/image × 12 scenes = ~$0.12 total (budget: $1.00)
 """
 
 import os
+import re
 import json
+import argparse
+import shutil
+import subprocess
+import threading
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -23,199 +29,257 @@ except ImportError:
     print("❌ fal_client not installed. Run: pip install fal-client")
     exit(1)
 
-# Configuration
+# Optional Pillow fallback for lossless PNG recompression
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Shared request throttle and cache helpers (optional when running outside the repo)
+try:
+    from Utils.rate_limit import get_fal_rate_limiter
+    from Utils.generation_cache import compute_cache_key
+    from Utils.asset_utils import write_json_atomic
+    from Utils.http_utils import download_file, prewarm_dns
+    from Utils.log_utils import get_logger, flush_logs
+except ImportError:
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    try:
+        from Utils.rate_limit import get_fal_rate_limiter
+        from Utils.generation_cache import compute_cache_key
+        from Utils.asset_utils import write_json_atomic
+        from Utils.http_utils import download_file, prewarm_dns
+        from Utils.log_utils import get_logger, flush_logs
+    except ImportError:
+        import logging
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        get_logger = logging.getLogger
+        flush_logs = logging.shutdown
+        get_fal_rate_limiter = None
+        compute_cache_key = None
+        write_json_atomic = None
+        download_file = urllib.request.urlretrieve
+        prewarm_dns = None
+
+# Per-run spend limit shared by the worker threads (required: the run can't be budgeted without it)
+from Utils.budget import BudgetTracker
+
+# Buffered logger: records are written by a background listener thread
+log = get_logger(__name__)
+
+# Configuration (default output; created when a run starts, not at import)
 OUTPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/output")
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Model config — flux/schnell is ~$0.01 per image
 MODEL = "fal-ai/flux/schnell"
 COST_PER_IMAGE = 0.01
 BUDGET_LIMIT = 1.00
 
+# Constant amounts formatted once for the per-asset log lines
+_COST_STR = f"${COST_PER_IMAGE:.2f}"
+_BUDGET_STR = f"${BUDGET_LIMIT:.2f}"
+
+# fal.ai concurrent-job limit: never run more requests than this at once
+MAX_WORKERS = 4
+
 IMAGE_SIZE = {"width": 1920, "height": 1080}
 NUM_INFERENCE_STEPS = 4  # schnell is optimised for 4 steps
+SEED = 42  # SEED_001 (B-roll) — fixed so identical requests give identical images
+
+# Prompt → image cache reused across runs (keyed by the full request),
+# stored in the output directory of the run that loaded it
+PROMPT_CACHE_NAME = ".prompt_cache.json"
+_prompt_cache: Dict[str, Dict] = {}
+_prompt_cache_path: Optional[Path] = None
+MIN_PNG_BYTES = 1024  # smaller outputs are treated as incomplete
+_prompt_cache_lock = threading.Lock()
 
 # ─── Memory Palace Loci — one per storyboard scene ─────────────────────────
 
-GENERATION_QUEUE = [
-    {
-        "id": "MP.01",
-        "name": "mp_01_heavy_mic",
-        "scene": "Scene 1: The Heavy Mic (00:00:00 - 00:00:10)",
-        "prompt": (
-            "A surreal memory palace room: a colossal golden microphone, taller than a person, "
-            "stands on a polished obsidian pedestal in a grand cathedral-like space, dramatic "
-            "spotlight from above, swirling golden particle motes, gothic arched ceiling, "
-            "volumetric light beams, hyper-detailed, fantasy illustration style, 8K, "
-            "cinematic wide shot, no people"
-        ),
-    },
-    {
-        "id": "MP.02",
-        "name": "mp_02_the_pivot",
-        "scene": "Scene 2: The Pivot (00:00:10 - 00:00:35)",
-        "prompt": (
-            "A surreal memory palace room: a giant compass needle embedded in a marble floor, "
-            "spinning in a circular chamber with walls made of flowing water, people-shaped "
-            "silhouettes frozen mid-step, warm amber light from a skylight above, ancient "
-            "navigational maps carved into the walls, dreamlike atmosphere, fantasy illustration, "
-            "8K, cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.03",
-        "name": "mp_03_statues_vs_mercury",
-        "scene": "Scene 3: Statues vs Mercury (00:00:35 - 00:00:48)",
-        "prompt": (
-            "A surreal memory palace room split in two: left half has frozen grey stone statues "
-            "trapped in a cold, cracked marble hall; right half has a living mercury figure "
-            "flowing and shifting in a liquid chrome laboratory, dramatic contrast between "
-            "rigid and fluid, split-screen composition, hyper-detailed fantasy illustration, "
-            "8K, cinematic lighting, no people"
-        ),
-    },
-    {
-        "id": "MP.04",
-        "name": "mp_04_clone_lab",
-        "scene": "Scene 4: The Clone Lab (00:00:48 - 00:03:52)",
-        "prompt": (
-            "A surreal memory palace room: a vast futuristic laboratory with rows of glass "
-            "cloning pods, glowing green terminal screens showing scrolling code, holographic "
-            "DNA helixes floating in the air, dark metallic surfaces with neon reflections, "
-            "cyberpunk meets ancient alchemy aesthetic, hyper-detailed, fantasy illustration, "
-            "8K, cinematic wide shot, no people"
-        ),
-    },
-    {
-        "id": "MP.05",
-        "name": "mp_05_evolution",
-        "scene": "Scene 5: The Evolution (00:03:52 - 00:05:50)",
-        "prompt": (
-            "A surreal memory palace room: a giant 3D printer the size of a building, slowly "
-            "materializing a glowing humanoid figure layer by layer, surrounded by floating "
-            "geometric evolution diagrams, butterfly chrysalis motifs, bioluminescent plants, "
-            "futuristic greenhouse atmosphere, hyper-detailed, fantasy illustration, 8K, "
-            "cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.06",
-        "name": "mp_06_nursery",
-        "scene": "Scene 6: The Nursery (00:05:50 - 00:06:36)",
-        "prompt": (
-            "A surreal memory palace room: a warm, cozy nursery with an enormous glowing "
-            "GitHub Octocat nightlight casting soft purple light, floating code-block mobiles "
-            "hanging from the ceiling, a cradle made of circuit boards wrapped in soft blankets, "
-            "pastel colors, dreamy soft-focus atmosphere, fantasy illustration, 8K, "
-            "cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.07",
-        "name": "mp_07_crystal_ball",
-        "scene": "Scene 7: The Crystal Ball (00:06:36 - 00:08:26)",
-        "prompt": (
-            "A surreal memory palace room: a massive crystal ball on an ornate bronze stand, "
-            "inside the ball swirl miniature floating tech company logos and smart speakers, "
-            "mystical purple and blue fog curls around the base, ancient fortune-teller's "
-            "chamber with star-mapped ceiling, candles and fiber-optic cables intertwined, "
-            "hyper-detailed, fantasy illustration, 8K, cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.08",
-        "name": "mp_08_engine_room",
-        "scene": "Scene 8: The Engine Room (00:08:26 - 00:09:01)",
-        "prompt": (
-            "A surreal memory palace room: a steampunk engine room with massive brass gears "
-            "and spinning clock mechanisms, a giant clock face showing blurred hands moving "
-            "at 1000x speed, steam pipes, pressure gauges, copper boilers, sparks flying, "
-            "industrial Victorian aesthetic meets sci-fi, hyper-detailed, fantasy illustration, "
-            "8K, cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.09",
-        "name": "mp_09_digital_feast",
-        "scene": "Scene 9: The Digital Feast (00:09:01 - 00:11:45)",
-        "prompt": (
-            "A surreal memory palace room: a grand banquet table stretching into infinity, "
-            "covered with hundreds of glowing tablets and screens instead of food, each "
-            "screen showing different data visualizations, floating holographic fruit and "
-            "digital wine glasses, baroque dining hall with chandelier made of circuit boards, "
-            "hyper-detailed, fantasy illustration, 8K, cinematic overhead angle, no people"
-        ),
-    },
-    {
-        "id": "MP.10",
-        "name": "mp_10_power_station",
-        "scene": "Scene 10: The Power Station (00:11:45 - 00:13:15)",
-        "prompt": (
-            "A surreal memory palace room: a single giant glass bottle containing a captured "
-            "lightning bolt, arcing with electric blue energy, placed on a Tesla coil pedestal "
-            "in a dark industrial power station, copper wires radiating outward, electromagnetic "
-            "aurora dancing on the ceiling, hyper-detailed, fantasy illustration, 8K, "
-            "cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.11",
-        "name": "mp_11_tool_shed",
-        "scene": "Scene 11: The Tool Shed (00:13:15 - 00:17:24)",
-        "prompt": (
-            "A surreal memory palace room: a magical workshop with a vibrating toolbox that "
-            "radiates purple energy waves, tools floating in mid-air — wrenches, hammers, "
-            "screwdrivers orbiting like planets, walls covered in glowing blueprints, "
-            "a workbench made of stacked code repositories, sparks and particles everywhere, "
-            "hyper-detailed, fantasy illustration, 8K, cinematic, no people"
-        ),
-    },
-    {
-        "id": "MP.12",
-        "name": "mp_12_balcony",
-        "scene": "Scene 12: The Balcony (00:17:24 - End)",
-        "prompt": (
-            "A surreal memory palace room: a grand marble balcony overlooking a vast futuristic "
-            "city built entirely by drones, towers of light, flying vehicles, holographic "
-            "billboards, golden sunset sky, sweeping vista, a telescope on the balcony railing "
-            "pointing toward the horizon, sense of infinite possibility, hyper-detailed, "
-            "fantasy illustration, 8K, cinematic wide shot, no people"
-        ),
-    },
-]
-
-def generate_asset(asset_config: Dict, idx: int, total: int, cost_so_far: float, timestamp: str) -> Dict:
+# Scene prompts live next to this script and are parsed on first use only
+QUEUE_PATH = Path(__file__).resolve().with_name("memory_palace_queue.json")
+_QUEUE_CACHE: Dict[tuple, List[Dict]] = {}
+
+
+def load_queue() -> List[Dict]:
+    """Load the memory palace queue (parsed once per file version; returns fresh copies)"""
+    try:
+        mtime = QUEUE_PATH.stat().st_mtime_ns
+    except OSError:
+        log.warning("⚠️  Queue file not found: %s", QUEUE_PATH)
+        return []
+
+    cache_key = (str(QUEUE_PATH), mtime)
+    if cache_key not in _QUEUE_CACHE:
+        with open(QUEUE_PATH, "r", encoding="utf-8") as f:
+            _QUEUE_CACHE[cache_key] = json.load(f)
+    # Shallow-copy entries so callers can't mutate the memoized queue
+    return [dict(asset) for asset in _QUEUE_CACHE[cache_key]]
+
+
+def __getattr__(name):
+    """Load GENERATION_QUEUE on first access instead of at import time (PEP 562)"""
+    if name == "GENERATION_QUEUE":
+        return load_queue()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def build_arguments(asset_config: Dict) -> Dict:
+    """Arguments sent to fal.ai for one asset"""
+    return {
+        "prompt": asset_config["prompt"],
+        "image_size": IMAGE_SIZE,
+        "num_inference_steps": NUM_INFERENCE_STEPS,
+        "num_images": 1,
+        "seed": SEED,
+    }
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical prompt text: case, whitespace and separator punctuation do not change the image"""
+    return re.sub(r"[\s,;.]+", " ", prompt.lower()).strip()
+
+
+def prompt_cache_key(asset_config: Dict) -> Optional[str]:
+    """Cache key for an asset, so prompt edits that only touch formatting still hit"""
+    if compute_cache_key is None:
+        return None
+    arguments = build_arguments(asset_config)
+    arguments["prompt"] = normalize_prompt(arguments["prompt"])
+    return compute_cache_key(MODEL, arguments)
+
+
+def load_prompt_cache(output_dir: Path = OUTPUT_DIR) -> None:
+    """Load the prompt cache written by previous runs (missing or corrupt → empty)"""
+    global _prompt_cache_path
+    cache_path = Path(output_dir) / PROMPT_CACHE_NAME
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    with _prompt_cache_lock:
+        _prompt_cache_path = cache_path
+        _prompt_cache.clear()
+        if isinstance(data, dict):
+            _prompt_cache.update(data)
+
+
+def lookup_cached(asset_config: Dict) -> Optional[Dict]:
+    """Return the cached record for an identical earlier request if its PNG is still complete"""
+    key = prompt_cache_key(asset_config)
+    if key is None:
+        return None
+    with _prompt_cache_lock:
+        record = _prompt_cache.get(key)
+    if not record:
+        return None
+    try:
+        # A truncated or emptied file is regenerated rather than reused
+        if Path(record["local_path"]).stat().st_size >= MIN_PNG_BYTES:
+            return record
+    except (KeyError, OSError):
+        pass
+    return None
+
+
+def store_cached(asset_config: Dict, record: Dict) -> None:
+    """Write-through: remember a successful generation for later runs"""
+    key = prompt_cache_key(asset_config)
+    if key is None or write_json_atomic is None:
+        return
+    with _prompt_cache_lock:
+        if _prompt_cache_path is None:
+            return
+        _prompt_cache[key] = {k: record[k] for k in ("url", "local_path", "filename")}
+        try:
+            write_json_atomic(_prompt_cache_path, _prompt_cache)
+        except OSError as e:
+            log.warning("   ⚠️  Could not update prompt cache: %s", e)
+
+
+def generate_asset(
+    asset_config: Dict,
+    idx: int,
+    total: int,
+    budget: BudgetTracker,
+    timestamp: str,
+    output_dir: Path = OUTPUT_DIR,
+) -> Dict:
     """Generate a single memory palace asset using fal.ai"""
     name = asset_config["name"]
-    scene = asset_config["scene"]
+    scene = asset_config.get("scene", "")
+
+    # One record per asset header so parallel workers' lines stay together
+    log.info("\n[%s/%s] Generating: %s\n   Scene: %s\n   Cost so far: $%.2f / %s",
+             idx, total, name, scene, budget.spent, _BUDGET_STR)
 
-    print(f"\n[{idx}/{total}] Generating: {name}")
-    print(f"   Scene: {scene}")
-    print(f"   Cost so far: ${cost_so_far:.2f} / ${BUDGET_LIMIT:.2f}")
+    # Identical request already generated by an earlier run: no API call, no cost
+    cached = lookup_cached(asset_config)
+    if cached:
+        log.info("   ♻️  Cached: %s", cached["filename"])
+        return {"success": True, "cached": True, **cached}
 
-    # Budget guard
-    if cost_so_far + COST_PER_IMAGE > BUDGET_LIMIT:
-        msg = f"Budget exceeded (${cost_so_far:.2f} + ${COST_PER_IMAGE:.2f} > ${BUDGET_LIMIT:.2f})"
-        print(f"   ⛔ {msg}")
+    # Budget guard (reserved up front so concurrent requests cannot overspend)
+    if not budget.reserve(COST_PER_IMAGE):
+        msg = f"Budget exceeded (${budget.spent:.2f} + {_COST_STR} > {_BUDGET_STR})"
+        log.warning("   ⛔ %s", msg)
         return {"success": False, "error": msg}
 
+    result = _generate_image(asset_config, timestamp, Path(output_dir))
+    if result["success"]:
+        store_cached(asset_config, result)
+    else:
+        budget.release(COST_PER_IMAGE)
+    return result
+
+
+def compress_png(image_path: Path) -> None:
+    """Losslessly recompress a downloaded PNG (oxipng if installed, else Pillow)"""
+    before = image_path.stat().st_size
     try:
-        result = fal_client.subscribe(
-            MODEL,
-            arguments={
-                "prompt": asset_config["prompt"],
-                "image_size": IMAGE_SIZE,
-                "num_inference_steps": NUM_INFERENCE_STEPS,
-                "num_images": 1,
-            },
-        )
+        oxipng = shutil.which("oxipng")
+        if oxipng:
+            subprocess.run([oxipng, "-o2", "--strip", "safe", "-q", str(image_path)],
+                           check=True, capture_output=True)
+        elif PIL_AVAILABLE:
+            tmp_path = image_path.with_suffix(".tmp.png")
+            with Image.open(image_path) as img:
+                img.save(tmp_path, "PNG", optimize=True)
+            if tmp_path.stat().st_size < before:
+                os.replace(tmp_path, image_path)
+            else:
+                tmp_path.unlink()
+        else:
+            return
+    except (OSError, subprocess.CalledProcessError) as e:
+        log.warning("   ⚠️  PNG compression skipped: %s", e)
+        return
+    after = image_path.stat().st_size
+    if after < before:
+        log.info("   📦 Compressed: %.1fKB → %.1fKB", before / 1024, after / 1024)
+
+
+def _generate_image(asset_config: Dict, timestamp: str, output_dir: Path) -> Dict:
+    """Run the fal.ai request for one asset and download the image"""
+    name = asset_config["name"]
+
+    try:
+        # Stay under the plan's request rate while workers run in parallel
+        if get_fal_rate_limiter:
+            get_fal_rate_limiter().acquire()
+        result = fal_client.subscribe(MODEL, arguments=build_arguments(asset_config))
 
         if result and "images" in result and len(result["images"]) > 0:
             image_url = result["images"][0]["url"]
             filename = f"{name}_{timestamp}.png"
-            image_path = OUTPUT_DIR / filename
-            urllib.request.urlretrieve(image_url, image_path)
-            print(f"   ✅ Saved: {filename}")
+            image_path = output_dir / filename
+            download_file(image_url, image_path)
+            # Runs in this worker while the other workers wait on fal.ai
+            compress_png(image_path)
+            log.info("   ✅ Saved: %s", filename)
             return {
                 "success": True,
                 "url": image_url,
@@ -223,92 +287,175 @@ def generate_asset(asset_config: Dict, idx: int, total: int, cost_so_far: float,
                 "filename": filename,
             }
         else:
-            print("   ❌ No images returned")
+            log.error("   ❌ No images returned")
             return {"success": False, "error": "No images returned"}
 
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        log.error("   ❌ Error: %s", e)
         return {"success": False, "error": str(e)}
 
 
-def main():
-    """Main execution — no interactive prompt."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    total = len(GENERATION_QUEUE)
-    estimated_cost = total * COST_PER_IMAGE
+def process_queue(
+    queue: List[Dict],
+    output_dir: Path = OUTPUT_DIR,
+    manifest=None,
+    max_workers: int = MAX_WORKERS,
+    compact: bool = False,
+) -> List[Dict]:
+    """
+    Generate every memory palace asset in queue and write the run summary.
 
-    print("=" * 60)
-    print("🧠 FAL.AI MEMORY PALACE GENERATOR")
-    print(f"   Model: {MODEL} (~${COST_PER_IMAGE}/image)")
-    print(f"   Scenes: {total}")
-    print(f"   Estimated cost: ${estimated_cost:.2f} (budget: ${BUDGET_LIMIT:.2f})")
-    print(f"   Output: {OUTPUT_DIR}")
-    print("=" * 60)
+    Args:
+        queue: Assets to generate (id, name, scene, prompt)
+        output_dir: Directory for images, the prompt cache and summaries
+        manifest: Optional ManifestTracker to record generated assets in
+        max_workers: Concurrent fal.ai requests (capped at MAX_WORKERS)
+        compact: Write the summary JSON without indentation
 
-    # List scenes
-    for i, item in enumerate(GENERATION_QUEUE, 1):
-        print(f"  {i:>3}. {item['scene']}")
+    Returns:
+        One result per asset, in queue order
+    """
+    if not queue:
+        log.warning("⚠️  Memory palace queue is empty.")
+        return []
 
-    print(f"\n💰 Total estimated cost: ${estimated_cost:.2f}")
+    # Resolve the fal.ai hosts while the cache and output directory are set up
+    if prewarm_dns:
+        prewarm_dns()
 
-    # Check API key
-    api_key = os.environ.get("FAL_KEY")
-    if not api_key:
-        print("\n❌ ERROR: FAL_KEY not set. export FAL_KEY='your-key'")
-        return
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    max_workers = max(1, min(max_workers, MAX_WORKERS))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    total = len(queue)
+
+    load_prompt_cache(output_dir)
+
+    # Generate concurrently; results are keyed by id and reported in queue order
+    budget = BudgetTracker(BUDGET_LIMIT)
+    by_id = {}
+    summary_path = output_dir / f"memory_palace_summary_{timestamp}.json"
 
-    # Generate
-    results = []
-    cost_so_far = 0.0
+    # Each result is appended as one JSON line as it completes, so a crashed
+    # run still leaves a record of every finished asset
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+            open(summary_path.with_suffix(".ndjson"), "a", encoding="utf-8") as progress:
+        futures = {
+            executor.submit(generate_asset, asset, i, total, budget, timestamp, output_dir): asset
+            for i, asset in enumerate(queue, 1)
+        }
+        for future in as_completed(futures):
+            asset = futures[future]
+            record = {"asset_id": asset["id"], "name": asset["name"], **future.result()}
+            by_id[asset["id"]] = record
+            progress.write(json.dumps(record, default=str) + "\n")
+            progress.flush()
+            if manifest and record["success"]:
+                manifest.add_asset(
+                    filename=record["filename"],
+                    prompt=asset["prompt"],
+                    asset_type="memory_palace",
+                    asset_id=asset["id"],
+                    result_url=record.get("url"),
+                    local_path=record["local_path"],
+                    metadata={"scene": asset.get("scene", ""), "model": MODEL, "provider": "fal"},
+                )
 
-    for i, asset in enumerate(GENERATION_QUEUE, 1):
-        result = generate_asset(asset, i, total, cost_so_far, timestamp)
-        results.append({"asset_id": asset["id"], "name": asset["name"], **result})
-        if result["success"]:
-            cost_so_far += COST_PER_IMAGE
+    results = [by_id[asset["id"]] for asset in queue]
+    cost_so_far = budget.spent
 
     # Summary
-    successful = [r for r in results if r["success"]]
-    failed = [r for r in results if not r["success"]]
+    successful, failed = [], []
+    for r in results:
+        (successful if r["success"] else failed).append(r)
 
-    print("\n" + "=" * 60)
-    print("📊 GENERATION SUMMARY")
-    print("=" * 60)
-    print(f"✅ Successful: {len(successful)}/{total}")
-    print(f"❌ Failed:     {len(failed)}/{total}")
-    print(f"💰 Total cost: ${cost_so_far:.2f} / ${BUDGET_LIMIT:.2f} budget")
+    log.info("\n%s", "=" * 60)
+    log.info("📊 GENERATION SUMMARY")
+    log.info("=" * 60)
+    log.info("✅ Successful: %s/%s", len(successful), total)
+    log.info("❌ Failed:     %s/%s", len(failed), total)
+    log.info("💰 Total cost: $%.2f / %s budget", cost_so_far, _BUDGET_STR)
 
     if successful:
-        print(f"\n✅ Generated memory palace images:")
+        log.info("\n✅ Generated memory palace images:")
         for r in successful:
-            print(f"   • {r['name']} → {r['filename']}")
+            log.info("   • %s → %s", r["name"], r["filename"])
 
     if failed:
-        print(f"\n❌ Failed:")
+        log.info("\n❌ Failed:")
         for r in failed:
-            print(f"   • {r['name']} — {r.get('error', 'unknown')}")
-
-    # Save summary JSON
-    summary_path = OUTPUT_DIR / f"memory_palace_summary_{timestamp}.json"
-    with open(summary_path, "w") as f:
-        json.dump(
-            {
-                "generator": "BatchAssetGeneratorMemoryPalace",
-                "model": MODEL,
-                "timestamp": timestamp,
-                "total": total,
-                "successful": len(successful),
-                "failed": len(failed),
-                "total_cost_usd": cost_so_far,
-                "budget_usd": BUDGET_LIMIT,
-                "results": results,
-            },
-            f,
-            indent=2,
-        )
-
-    print(f"\n💾 Summary: {summary_path}")
-    print("✅ Done!")
+            log.info("   • %s — %s", r["name"], r.get("error", "unknown"))
+
+    # Save summary JSON (atomic, orjson-backed when available, unless compact)
+    summary = {
+        "generator": "BatchAssetGeneratorMemoryPalace",
+        "model": MODEL,
+        "timestamp": timestamp,
+        "total": total,
+        "successful": len(successful),
+        "failed": len(failed),
+        "total_cost_usd": cost_so_far,
+        "budget_usd": BUDGET_LIMIT,
+        "results": results,
+    }
+    if write_json_atomic and not compact:
+        write_json_atomic(summary_path, summary)
+    else:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(
+                summary,
+                f,
+                indent=None if compact else 2,
+                separators=(",", ":") if compact else None,
+                default=str,
+            )
+
+    log.info("\n💾 Summary: %s", summary_path)
+    flush_logs()
+    return results
+
+
+def main():
+    """Main execution — no interactive prompt."""
+    parser = argparse.ArgumentParser(description="Generate memory palace images with fal.ai")
+    parser.add_argument(
+        "--workers", type=int, default=MAX_WORKERS,
+        help=f"Concurrent fal.ai requests (1-{MAX_WORKERS}, default: {MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="Write the summary JSON without indentation",
+    )
+    args = parser.parse_args()
+
+    queue = load_queue()
+    total = len(queue)
+    estimated_cost = total * COST_PER_IMAGE
+
+    log.info("=" * 60)
+    log.info("🧠 FAL.AI MEMORY PALACE GENERATOR")
+    log.info("   Model: %s (~$%s/image)", MODEL, COST_PER_IMAGE)
+    log.info("   Scenes: %s", total)
+    log.info("   Estimated cost: $%.2f (budget: %s)", estimated_cost, _BUDGET_STR)
+    log.info("   Output: %s", OUTPUT_DIR)
+    log.info("=" * 60)
+
+    # List scenes
+    for i, item in enumerate(queue, 1):
+        log.info("  %3d. %s", i, item["scene"])
+
+    log.info("\n💰 Total estimated cost: $%.2f", estimated_cost)
+
+    # Check API key
+    api_key = os.environ.get("FAL_KEY")
+    if not api_key:
+        log.error("\n❌ ERROR: FAL_KEY not set. export FAL_KEY='your-key'")
+        flush_logs()
+        return
+
+    process_queue(queue, OUTPUT_DIR, max_workers=args.workers, compact=args.compact)
+    log.info("✅ Done!")
+    flush_logs()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,12 @@ Generates 5 compelling thumbnail images that capture key video themes
 """
 
 import os
+import sys
 import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
@@ -26,27 +31,52 @@ except ImportError:
 
 # Import asset utilities
 try:
-    from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker
+    from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker, write_json_atomic
+    from Utils.http_utils import download_file
+    from Utils.rate_limit import call_with_retry
+    from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+    from Utils.log_utils import get_logger, flush_logs
 except ImportError:
     # Fallback if running standalone
-    import sys
-    from pathlib import Path
     sys.path.append(str(Path(__file__).resolve().parent.parent))
     try:
-        from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker
+        from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker, write_json_atomic
+        from Utils.http_utils import download_file
+        from Utils.rate_limit import call_with_retry
+        from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+        from Utils.log_utils import get_logger, flush_logs
     except ImportError:
+        import logging
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        get_logger = logging.getLogger
+        flush_logs = logging.shutdown
         print("⚠️  asset_utils not found. Using legacy naming convention.")
         generate_filename = None
         extract_scene_number = None
         ManifestTracker = None
+        write_json_atomic = None
 
-# Configuration
+        def download_file(url, dest, conditional=False):
+            urllib.request.urlretrieve(url, dest)
+
+        call_with_retry = None
+        GenerationCache = None
+
+# Buffered logger: records are written by a background listener thread
+log = get_logger(__name__)
+
+# Configuration (default output; created when a run starts, not at import)
 OUTPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/output")
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # fal.ai model for image generation (classical fal.ai code)
 MODEL = "fal-ai/flux/schnell"
 
+# Thumbnails generated concurrently (each is a blocking network call)
+MAX_WORKERS = 5
+
+# ManifestTracker is shared by the worker threads
+_manifest_lock = threading.Lock()
+
 # Thumbnail specifications (YouTube recommended: 1280x720, 16:9 aspect ratio)
 THUMBNAIL_SPECS = {
     "image_size": {
@@ -54,209 +84,301 @@ THUMBNAIL_SPECS = {
         "height": 720
     },
     "num_inference_steps": 4,  # Fast generation with flux/schnell
-    "num_images": 1
+    "num_images": 1,
+    "seed": 42  # SEED_001 — fixed so identical requests give identical (cacheable) images
 }
 
+# Request arguments shared by every thumbnail (only the prompt varies)
+_BASE_ARGS = {
+    "image_size": THUMBNAIL_SPECS["image_size"],
+    "num_inference_steps": THUMBNAIL_SPECS["num_inference_steps"],
+    "num_images": THUMBNAIL_SPECS["num_images"],
+    "seed": THUMBNAIL_SPECS["seed"],
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ThumbPrompt:
+    """One thumbnail to generate (immutable, so worker threads can share it)"""
+    id: str
+    name: str
+    scene: int
+    prompt: str
+    description: str
+
+
 # 5 compelling thumbnail prompts based on video script themes
-THUMBNAIL_PROMPTS = [
-    {
-        "id": "thumbnail_01",
-        "name": "Delivery Pilot Transformation",
-        "scene": 1,
-        "prompt": (
+THUMBNAIL_PROMPTS = (
+    ThumbPrompt(
+        id="thumbnail_01",
+        name="Delivery Pilot Transformation",
+        scene=1,
+        prompt=(
             "Professional YouTube thumbnail: person holding massive oversized golden microphone, "
             "bold text 'DELIVERY PILOT' in electric blue and gold. Futuristic dark background "
             "with holographic 240+ workflow dashboard floating behind. Text overlay 'BECOME A "
             "DELIVERY PILOT' in modern bold sans-serif. High contrast, cinematic lighting, "
             "tech aesthetic, YouTube optimized 16:9 format, ultra HD."
         ),
-        "description": "Main thumbnail - the delivery pilot transformation journey"
-    },
-    {
-        "id": "thumbnail_02",
-        "name": "Static vs Dynamic AI",
-        "scene": 2,
-        "prompt": (
+        description="Main thumbnail - the delivery pilot transformation journey"
+    ),
+    ThumbPrompt(
+        id="thumbnail_02",
+        name="Static vs Dynamic AI",
+        scene=2,
+        prompt=(
             "Eye-catching YouTube thumbnail split-screen comparison. Left side: grey crumbling "
             "stone statues with chains and text 'OLD RULES' in faded red. Right side: liquid "
             "mercury Terminator-style figure morphing with glowing blue AI neural network, text "
             "'DYNAMIC AI' in vibrant cyan. Dramatic center divide with breaking chains. "
             "Bold text 'BREAK FREE' at top in gold. Dark moody lighting, 16:9 format, ultra sharp."
         ),
-        "description": "Static rules vs dynamic AI - breaking the iron chains"
-    },
-    {
-        "id": "thumbnail_03",
-        "name": "Zero Capital AI Startup",
-        "scene": 3,
-        "prompt": (
+        description="Static rules vs dynamic AI - breaking the iron chains"
+    ),
+    ThumbPrompt(
+        id="thumbnail_03",
+        name="Zero Capital AI Startup",
+        scene=3,
+        prompt=(
             "Striking YouTube thumbnail: bold text '$0 TO START' in large neon green letters "
             "at center. Icons for VS Code, GitHub, and Cursor AI floating around. Empty wallet "
             "transforming into a glowing laptop with AI workflows streaming out. Dark gradient "
             "background purple to black. Subtitle 'FREE AI TOOLS' in white. Professional "
             "marketing style, high energy, 16:9 aspect ratio, ultra HD."
         ),
-        "description": "Start with zero capital using free AI tools"
-    },
-    {
-        "id": "thumbnail_04",
-        "name": "LLM Digital Feast",
-        "scene": 4,
-        "prompt": (
+        description="Start with zero capital using free AI tools"
+    ),
+    ThumbPrompt(
+        id="thumbnail_04",
+        name="LLM Digital Feast",
+        scene=4,
+        prompt=(
             "Vibrant YouTube thumbnail: digital banquet table with 100 glowing tablets, each "
             "showing a different AI model logo. Four main dishes highlighted: Claude brain icon "
             "in orange, ChatGPT logo in green, DeepSeek code terminal in blue, Gemini gem in "
             "purple. Bold text 'CHOOSE YOUR AI' at top in white. Warm dramatic lighting, "
             "rich colors, feast aesthetic meets tech, 16:9 format, ultra HD."
         ),
-        "description": "The LLM feast - choosing between AI models"
-    },
-    {
-        "id": "thumbnail_05",
-        "name": "Internet Kill Switch Parenting",
-        "scene": 5,
-        "prompt": (
+        description="The LLM feast - choosing between AI models"
+    ),
+    ThumbPrompt(
+        id="thumbnail_05",
+        name="Internet Kill Switch Parenting",
+        scene=5,
+        prompt=(
             "Bold YouTube thumbnail: giant red emergency power button with text 'INTERNET KILL "
             "SWITCH' in stark white letters. GitHub and n8n workflow nodes connecting to home "
             "WiFi router. Protective shield icon with family silhouette. Dark cyberpunk "
             "background with red warning glow. Subtitle 'SMART PARENTING' in green. "
             "Dramatic tech-noir style, high contrast, 16:9 format, ultra HD."
         ),
-        "description": "The internet kill switch for smart parenting"
+        description="The internet kill switch for smart parenting"
+    )
+)
+
+
+def build_thumbnail_filename(thumb_config: ThumbPrompt, version: int = 1) -> str:
+    """Standardized filename for a thumbnail (asset utilities or legacy fallback)"""
+    if generate_filename:
+        return generate_filename(
+            scene_number=thumb_config.scene,
+            asset_type="thumbnail",
+            description=thumb_config.name,
+            extension="png",
+            version=version
+        )
+    # Fallback naming
+    clean_name = thumb_config.name.lower().replace(" ", "_")
+    return f"{thumb_config.scene:03d}_thumbnail_{clean_name}_v{version}.png"
+
+
+def _record_success(
+    thumb_config: ThumbPrompt,
+    filename: str,
+    filepath: Path,
+    image_url: Optional[str],
+    manifest: Optional[object],
+    timestamp: str,
+    cached: bool = False
+) -> Dict:
+    """Add a finished thumbnail to the manifest and build its result record"""
+    if manifest:
+        with _manifest_lock:
+            manifest.add_asset(
+                filename=filename,
+                prompt=thumb_config.prompt,
+                asset_type="thumbnail",
+                asset_id=thumb_config.id,
+                result_url=image_url,
+                local_path=str(filepath),
+                metadata={"description": thumb_config.description, "model": MODEL},
+                timestamp=timestamp,
+            )
+    
+    result_data = {
+        "id": thumb_config.id,
+        "name": thumb_config.name,
+        "filename": filename,
+        "filepath": str(filepath.absolute()),
+        "url": image_url,
+        "prompt": thumb_config.prompt,
+        "description": thumb_config.description,
+        "model": MODEL,
+        "image_size": THUMBNAIL_SPECS["image_size"],
+        "timestamp": timestamp,
+        "success": True
     }
-]
+    if cached:
+        result_data["cached"] = True
+    return result_data
 
 
-def generate_thumbnail(thumb_config: Dict, output_dir: Path, manifest: Optional[object] = None, version: int = 1) -> Dict:
+def generate_thumbnail(thumb_config: ThumbPrompt, output_dir: Path, manifest: Optional[object] = None, version: int = 1) -> Dict:
     """Generate a single thumbnail using fal.ai"""
-    print(f"\n{'='*60}")
-    print(f"🎨 Generating Thumbnail: {thumb_config['name']}")
-    print(f"   ID: {thumb_config['id']}")
-    print(f"   Theme: {thumb_config['description']}")
-    print(f"{'='*60}")
+    log.info("\n%s\n🎨 Generating Thumbnail: %s\n   ID: %s\n   Theme: %s\n%s",
+             "=" * 60, thumb_config.name, thumb_config.id, thumb_config.description, "=" * 60)
+    timestamp = datetime.now().isoformat()
     
     try:
         # Prepare arguments for fal.ai
-        arguments = {
-            "prompt": thumb_config["prompt"],
-            "image_size": THUMBNAIL_SPECS["image_size"],
-            "num_inference_steps": THUMBNAIL_SPECS["num_inference_steps"],
-            "num_images": THUMBNAIL_SPECS["num_images"],
-        }
+        arguments = {"prompt": thumb_config.prompt, **_BASE_ARGS}
+        filename = build_thumbnail_filename(thumb_config, version)
+        filepath = output_dir / filename
         
-        # Generate thumbnail using fal.ai
-        print("⏳ Sending request to fal.ai...")
-        result = fal_client.subscribe(
-            MODEL,
-            arguments=arguments,
-        )
+        # Identical request generated before: restore it from the content-addressed cache
+        cache = GenerationCache(output_dir / CACHE_DIR_NAME) if GenerationCache else None
+        cache_key = compute_cache_key(MODEL, arguments) if cache else None
+        if cache and cache.restore(cache_key, "png", filepath):
+            log.info("♻️  Restored from cache: %s", filepath)
+            image_url = cache.load_metadata(cache_key).get("url")
+            return _record_success(thumb_config, filename, filepath, image_url, manifest, timestamp, cached=True)
+        
+        # Generate thumbnail using fal.ai (rate limited; 429/5xx retried with backoff)
+        log.info("⏳ Sending request to fal.ai... (%s)", thumb_config.id)
+        if call_with_retry:
+            result = call_with_retry(fal_client.subscribe, MODEL, arguments=arguments)
+        else:
+            result = fal_client.subscribe(MODEL, arguments=arguments)
         
         # Download and save
         if result and "images" in result and len(result["images"]) > 0:
             image_url = result["images"][0]["url"]
-            print(f"✅ Generated successfully!")
-            print(f"   URL: {image_url}")
+            log.info("✅ Generated successfully!\n   URL: %s", image_url)
             
-            # Generate filename using asset utilities or fallback
-            if generate_filename:
-                filename = generate_filename(
-                    scene_number=thumb_config["scene"],
-                    asset_type="thumbnail",
-                    description=thumb_config["name"],
-                    extension="png",
-                    version=version
-                )
-            else:
-                # Fallback naming
-                clean_name = thumb_config["name"].lower().replace(" ", "_")
-                filename = f"{thumb_config['scene']:03d}_thumbnail_{clean_name}_v{version}.png"
+            # Download image (pooled keep-alive connection, streamed to disk).
+            # Conditional: an unchanged file is revalidated by ETag (304) instead of
+            # re-transferred, and a changed one is written to a fresh inode so a
+            # hardlink into the cache is never overwritten in place
+            log.info("⏳ Downloading to %s...", filepath)
+            download_file(image_url, filepath, conditional=True)
+            log.info("💾 Saved: %s", filepath)
             
-            filepath = output_dir / filename
+            if cache:
+                cache.store(cache_key, filepath, {"url": image_url, "model": MODEL, "arguments": arguments})
             
-            # Download image
-            import urllib.request
-            print(f"⏳ Downloading to {filepath}...")
-            urllib.request.urlretrieve(image_url, filepath)
-            print(f"💾 Saved: {filepath}")
-            
-            # Track in manifest
-            result_data = {
-                "id": thumb_config["id"],
-                "name": thumb_config["name"],
-                "filename": filename,
-                "filepath": str(filepath.absolute()),
-                "url": image_url,
-                "prompt": thumb_config["prompt"],
-                "description": thumb_config["description"],
-                "model": MODEL,
-                "image_size": THUMBNAIL_SPECS["image_size"],
-                "timestamp": datetime.now().isoformat(),
-                "success": True
-            }
-            
-            return result_data
+            return _record_success(thumb_config, filename, filepath, image_url, manifest, timestamp)
             
         else:
             error_msg = "No image URL in result"
-            print(f"❌ Generation failed: {error_msg}")
+            log.error("❌ Generation failed (%s): %s", thumb_config.id, error_msg)
             return {
-                "id": thumb_config["id"],
-                "name": thumb_config["name"],
+                "id": thumb_config.id,
+                "name": thumb_config.name,
                 "success": False,
                 "error": error_msg,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
     except Exception as e:
         error_msg = str(e)
-        print(f"❌ Error: {error_msg}")
+        log.error("❌ Error (%s): %s", thumb_config.id, error_msg)
         return {
-            "id": thumb_config["id"],
-            "name": thumb_config["name"],
+            "id": thumb_config.id,
+            "name": thumb_config.name,
             "success": False,
             "error": error_msg,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
+        }
+
+
+def process_queue(
+    queue: List[ThumbPrompt],
+    output_dir: Path = OUTPUT_DIR,
+    manifest: Optional[object] = None,
+    version: int = 1,
+    max_workers: int = MAX_WORKERS
+) -> List[Dict]:
+    """
+    Generate all thumbnails in queue concurrently.
+    Every job is submitted before any result is awaited, so the fal.ai
+    requests run in parallel; results are returned in queue order.
+    
+    Args:
+        queue: Thumbnail configurations (ThumbPrompt records or equivalent dicts)
+        output_dir: Directory to save thumbnails in
+        manifest: Optional ManifestTracker shared by all workers
+        version: Version number for the filenames
+        max_workers: Maximum concurrent fal.ai requests
+        
+    Returns:
+        List of result dictionaries, one per thumbnail
+    """
+    if not queue:
+        return []
+    queue = [c if isinstance(c, ThumbPrompt) else ThumbPrompt(**c) for c in queue]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    results: List[Optional[Dict]] = [None] * len(queue)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(queue), max_workers))) as executor:
+        futures = {
+            executor.submit(generate_thumbnail, thumb_config, output_dir, manifest, version): i
+            for i, thumb_config in enumerate(queue)
         }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
 
 
 def main():
     """Main execution function"""
-    print("\n" + "="*60)
-    print("🎬 YouTube Thumbnail Generator")
-    print("   Using fal.ai flux/schnell model")
-    print("="*60)
+    log.info("\n%s", "=" * 60)
+    log.info("🎬 YouTube Thumbnail Generator")
+    log.info("   Using fal.ai flux/schnell model")
+    log.info("=" * 60)
     
-    # Generate all thumbnails
-    results = []
-    for i, thumb_config in enumerate(THUMBNAIL_PROMPTS, 1):
-        print(f"\n📸 Generating thumbnail {i}/{len(THUMBNAIL_PROMPTS)}...")
-        result = generate_thumbnail(thumb_config, OUTPUT_DIR, version=1)
-        results.append(result)
+    # Generate all thumbnails concurrently
+    log.info("\n📸 Generating %s thumbnails (up to %s at a time)...", len(THUMBNAIL_PROMPTS), MAX_WORKERS)
+    results = process_queue(THUMBNAIL_PROMPTS, OUTPUT_DIR, version=1)
     
     # Save summary
+    successful = sum(bool(r.get("success")) for r in results)
     summary = {
         "generator": "BatchAssetGeneratorThumbnails",
         "model": MODEL,
         "timestamp": datetime.now().isoformat(),
         "total_thumbnails": len(THUMBNAIL_PROMPTS),
-        "successful": sum(1 for r in results if r.get("success")),
-        "failed": sum(1 for r in results if not r.get("success")),
+        "successful": successful,
+        "failed": len(results) - successful,
         "results": results
     }
     
     summary_path = OUTPUT_DIR / "generation_summary.json"
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2)
+    if write_json_atomic:
+        write_json_atomic(summary_path, summary)  # orjson when installed
+    else:
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
     
     # Print summary
-    print("\n" + "="*60)
-    print("📊 GENERATION SUMMARY")
-    print("="*60)
-    print(f"✅ Successful: {summary['successful']}/{summary['total_thumbnails']}")
-    print(f"❌ Failed: {summary['failed']}/{summary['total_thumbnails']}")
-    print(f"📁 Output directory: {OUTPUT_DIR.absolute()}")
-    print(f"📝 Summary saved: {summary_path}")
-    print("="*60)
+    log.info("\n%s", "=" * 60)
+    log.info("📊 GENERATION SUMMARY")
+    log.info("=" * 60)
+    log.info("✅ Successful: %s/%s", summary["successful"], summary["total_thumbnails"])
+    log.info("❌ Failed: %s/%s", summary["failed"], summary["total_thumbnails"])
+    log.info("📁 Output directory: %s", OUTPUT_DIR.absolute())
+    log.info("📝 Summary saved: %s", summary_path)
+    log.info("=" * 60)
+    flush_logs()
     
     return summary
 
@@ -264,8 +386,9 @@ def main():
 if __name__ == "__main__":
     # Check for API key
     if not os.getenv("FAL_KEY"):
-        print("❌ Error: FAL_KEY environment variable not set")
-        print("   Set it with: export FAL_KEY='your-api-key-here'")
+        log.error("❌ Error: FAL_KEY environment variable not set")
+        log.error("   Set it with: export FAL_KEY='your-api-key-here'")
+        flush_logs()
         exit(1)
     
     main()
@@ -2,17 +2,62 @@
 Bulk Illustration Generator
 This script searches for images using Google Custom Search API and transforms them using fal.ai's image-to-image models.
 It falls back to text-to-image generation if the Google search fails or returns no results.
+Searches and generations are pipelined: each item's fal.ai transform starts as soon as
+its own search returns, while the remaining searches are still running.
 """
+import argparse
+import io
 import os
+import sys
+import urllib.request
 import requests
 import fal_client
 import yaml
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
 from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared fal.ai request throttle and resumable requests (optional when running outside the repo)
+try:
+    from Utils.rate_limit import get_fal_rate_limiter
+    from Utils.fal_utils import PendingRequests, PENDING_FILENAME, ResultMemo, fal_generate
+    from Utils.generation_cache import CACHE_DIR_NAME
+    from Utils.http_utils import fetch_bytes
+    from Utils.log_utils import get_logger, flush_logs
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    try:
+        from Utils.rate_limit import get_fal_rate_limiter
+        from Utils.fal_utils import PendingRequests, PENDING_FILENAME, ResultMemo, fal_generate
+        from Utils.generation_cache import CACHE_DIR_NAME
+        from Utils.http_utils import fetch_bytes
+        from Utils.log_utils import get_logger, flush_logs
+    except ImportError:
+        import logging
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        get_logger = logging.getLogger
+        flush_logs = logging.shutdown
+        get_fal_rate_limiter = None
+        PendingRequests = None
+        ResultMemo = None
+
+        def fal_generate(model, arguments, pending=None, memo=None, limiter=None):
+            result = fal_client.subscribe(model, arguments=arguments)
+            images = (result or {}).get("images")
+            return images[0]["url"] if images else None
+
+        def fetch_bytes(url):
+            with urllib.request.urlopen(url, timeout=120) as response:
+                return response.read()
+
+# Buffered logger: records are written by a background listener thread
+log = get_logger(__name__)
 
 # Load environment variables from ../.env
 env_path = Path(__file__).resolve().parent.parent / '.env'
@@ -35,29 +80,67 @@ REPO_ROOT = SCRIPT_DIR.parent.parent
 OUTPUT_DIR = REPO_ROOT / "3_Simulation" / "Feb1Youtube" / "generated_illustrations"
 DATA_PATH = REPO_ROOT / "3_Simulation" / "Feb1Youtube" / "_source" / "batch_generation_data.yaml"
 
+# Keep-alive session for the Google Custom Search API: one TLS handshake per
+# pooled connection instead of per search, with backoff on 429/5xx responses
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",)),
+))
+SEARCH_TIMEOUT = 30
+
+# Fixed seed: identical requests give identical images, so reruns and duplicate
+# items are answered from the result memo instead of paying fal.ai again
+SEED = 42
+
+# Concurrent Google searches and fal.ai generations (each is a blocking network call).
+# fal.ai requests are additionally spaced by the shared rate limiter (FAL_MAX_RPS).
+SEARCH_WORKERS = 4
+GENERATE_WORKERS = 5
+
+# JPG copies: optimized progressive encode (smaller files, visually identical at 90)
+JPEG_OPTIONS = {"quality": 90, "optimize": True, "progressive": True}
+
+# Parsed image sections memoized by (path, mtime) so repeated loads skip the YAML parse
+_CONFIG_CACHE: Dict[tuple, list] = {}
+
 def load_config() -> list:
-    """Load the images section from the batch generation data YAML."""
-    if not DATA_PATH.exists():
-        print(f"Error: Configuration file not found at {DATA_PATH}")
+    """Load the images section from the batch generation data YAML (parsed once per file version)."""
+    try:
+        mtime = DATA_PATH.stat().st_mtime_ns
+    except OSError:
+        log.error("Error: Configuration file not found at %s", DATA_PATH)
         return []
     
+    cache_key = (str(DATA_PATH), mtime)
+    if cache_key in _CONFIG_CACHE:
+        # Shallow-copy entries so callers can't mutate the memoized items
+        return [dict(item) for item in _CONFIG_CACHE[cache_key]]
+    
     try:
+        # Prefer the libyaml C parser; fall back to the pure-Python SafeLoader
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data.get('images', [])
+            data = yaml.load(f, Loader=loader)
+            items = data.get('images', [])
     except Exception as e:
-        print(f"Error loading YAML: {e}")
+        log.error("Error loading YAML: %s", e)
         return []
+    
+    _CONFIG_CACHE[cache_key] = items
+    return [dict(item) for item in items]
 
 def get_google_image(query: str) -> Optional[str]:
     """
     Search for an image using Google Custom Search API.
     """
     if not GOOGLE_API_KEY or not GOOGLE_CSE_ID:
-        print("Warning: Google API keys not set. Skipping search.")
+        log.warning("Warning: Google API keys not set. Skipping search.")
         return None
 
-    print(f"🔍 Searching Google for: '{query}'...")
+    log.info("🔍 Searching Google for: '%s'...", query)
     url = "https://www.googleapis.com/customsearch/v1"
     params = {
         'q': query,
@@ -68,74 +151,95 @@ def get_google_image(query: str) -> Optional[str]:
         'safe': 'active'
     }
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=SEARCH_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         
         if 'items' in data and len(data['items']) > 0:
             link = data['items'][0]['link']
-            print(f"   ✓ Found image: {link}")
+            log.info("   ✓ Found image: %s", link)
             return link
         else:
-            print(f"   ✗ No results found for query: {query}")
+            log.warning("   ✗ No results found for query: %s", query)
             return None
     except Exception as e:
-        print(f"   ✗ Error searching Google: {e}")
+        log.error("   ✗ Error searching Google: %s", e)
         return None
 
-def illustrate_image(image_url: str, prompt: str, model: str = "fal-ai/flux/dev/image-to-image") -> Optional[str]:
+def _fal_limiter() -> Optional[Any]:
+    """Shared fal.ai request throttle (None when running without Utils)"""
+    return get_fal_rate_limiter() if get_fal_rate_limiter else None
+
+def illustrate_image(
+    image_url: str,
+    prompt: str,
+    model: str = "fal-ai/flux/dev/image-to-image",
+    pending: Optional[Any] = None,
+    memo: Optional[Any] = None
+) -> Optional[str]:
     """
     Transform the image using fal.ai image-to-image model.
     """
     if not image_url:
         return None
         
-    print(f"🎨 Transforming image with prompt: {prompt[:50]}...")
+    log.info("🎨 Transforming image with prompt: %s...", prompt[:50])
     try:
-        result = fal_client.subscribe(
+        # Rate-limited and resumable; identical earlier requests come from the memo
+        return fal_generate(
             model,
-            arguments={
+            {
                 "image_url": image_url,
                 "prompt": prompt,
                 "strength": 0.75, # Balanced strength for transformation
                 "num_inference_steps": 28,
-                "guidance_scale": 3.5
-            }
+                "guidance_scale": 3.5,
+                "seed": SEED
+            },
+            pending,
+            memo,
+            limiter=_fal_limiter()
         )
-        if result and 'images' in result and len(result['images']) > 0:
-            return result['images'][0]['url']
-        return None
     except Exception as e:
-        print(f"   ✗ Error transforming image: {e}")
+        log.error("   ✗ Error transforming image: %s", e)
         return None
 
-def generate_text_to_image(prompt: str, model: str = "fal-ai/flux/dev") -> Optional[str]:
+def generate_text_to_image(
+    prompt: str,
+    model: str = "fal-ai/flux/dev",
+    pending: Optional[Any] = None,
+    memo: Optional[Any] = None
+) -> Optional[str]:
     """
     Generate an image from scratch using text-to-image (Fallback).
     """
-    print(f"🎨 Generating from text (Fallback): {prompt[:50]}...")
+    log.info("🎨 Generating from text (Fallback): %s...", prompt[:50])
     try:
-        result = fal_client.subscribe(
+        return fal_generate(
             model,
-            arguments={
+            {
                 "prompt": prompt,
                 "image_size": {
                     "width": 1920,
                     "height": 1080
                 },
                 "num_inference_steps": 30,
-                "guidance_scale": 3.5
-            }
+                "guidance_scale": 3.5,
+                "seed": SEED
+            },
+            pending,
+            memo,
+            limiter=_fal_limiter()
         )
-        if result and 'images' in result and len(result['images']) > 0:
-            return result['images'][0]['url']
-        return None
     except Exception as e:
-        print(f"   ✗ Error generating image: {e}")
+        log.error("   ✗ Error generating image: %s", e)
         return None
 
-def save_image(url: str, filename: str):
-    """Download and save the image in both PNG and JPG formats."""
+def save_image(url: str, filename: str, formats: Tuple[str, ...] = ("png", "jpg")) -> Optional[Path]:
+    """
+    Download and save the image in the requested formats (PNG and/or JPG).
+    Returns the PNG path (the JPG path when only JPG is requested), or None on failure.
+    """
     try:
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         filepath = OUTPUT_DIR / filename
@@ -144,74 +248,154 @@ def save_image(url: str, filename: str):
         if not filepath.suffix:
             filepath = filepath.with_suffix(".png")
 
-        print(f"💾 Saving to {filepath}...")
-        import urllib.request
-        urllib.request.urlretrieve(url, filepath)
-        print("   ✓ Saved PNG.")
+        # Download once into memory (shared pooled client): the server's PNG
+        # bytes are written as-is and decoded from memory for the JPG, so the
+        # file is never read back from disk
+        data = fetch_bytes(url)
+        if "png" in formats:
+            log.info("💾 Saving to %s...", filepath)
+            filepath.write_bytes(data)
+            log.info("   ✓ Saved PNG.")
         
-        # Also save as JPG
+        # JPG only on request: Pillow isn't touched otherwise
         jpg_filepath = filepath.with_suffix(".jpg")
-        print(f"💾 Converting and saving to {jpg_filepath}...")
-        img = Image.open(filepath)
-        # Convert to RGB if necessary (JPG doesn't support transparency)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Convert all non-RGB modes to RGBA first for consistent handling
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-            # Create RGB image with white background
-            rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-            rgb_img.paste(img, mask=img.split()[-1])
-            rgb_img.save(jpg_filepath, 'JPEG', quality=95)
-        else:
-            img.save(jpg_filepath, 'JPEG', quality=95)
-        print("   ✓ Saved JPG.")
+        if "jpg" in formats:
+            log.info("💾 Converting and saving to %s...", jpg_filepath)
+            # Header-only open: pixels are decoded once, by the save/convert that needs them,
+            # and the decoder is released as soon as the JPG is written
+            with Image.open(io.BytesIO(data)) as img:
+                if img.mode == 'RGB':
+                    # Already JPEG-compatible: encode directly, no canvas copy
+                    img.save(jpg_filepath, 'JPEG', **JPEG_OPTIONS)
+                elif img.mode in ('RGBA', 'LA', 'P'):
+                    # Convert to RGB (JPG doesn't support transparency):
+                    # all non-RGB modes go to RGBA first for consistent handling
+                    if img.mode != 'RGBA':
+                        img = img.convert('RGBA')
+                    # Create RGB image with white background
+                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+                    rgb_img.paste(img, mask=img.getchannel('A'))  # alpha plane only, no per-channel copies
+                    rgb_img.save(jpg_filepath, 'JPEG', **JPEG_OPTIONS)
+                else:
+                    img.save(jpg_filepath, 'JPEG', **JPEG_OPTIONS)
+            log.info("   ✓ Saved JPG.")
+        return filepath if "png" in formats else jpg_filepath
     except Exception as e:
-        print(f"   ✗ Error saving image: {e}")
+        log.error("   ✗ Error saving image: %s", e)
+        return None
 
-def process_batch():
-    items = load_config()
-    if not items:
-        print("No items to process.")
-        return
+def search_query_for(item: Dict[str, Any]) -> str:
+    """Search query for an item: explicit 'search_query', else its name."""
+    # Determine search query: explicit 'search_query' > 'name'
+    search_query = item.get('search_query')
+    if not search_query:
+        # Simple heuristic: use name logic or skip search if not intended
+        # For this requirement, we treat 'name' as a potential query if sensible
+        search_query = item.get('name', 'unnamed').replace('_', ' ')
+    return search_query
 
-    print(f"Found {len(items)} items in batch configuration.")
-    
-    for item in items:
-        name = item.get('name', 'unnamed')
-        prompt = item.get('prompt', '')
-        # Determine search query: explicit 'search_query' > 'name' > None
-        search_query = item.get('search_query')
-        if not search_query:
-            # Simple heuristic: use name logic or skip search if not intended
-            # For this requirement, we treat 'name' as a potential query if sensible
-            search_query = name.replace('_', ' ')
-        
-        print(f"\n[{name.upper()}] Processing...")
 
-        final_url = None
-        
-        # 1. Try Google Search + Image-to-Image
-        source_url = get_google_image(search_query)
-        
+def illustrate_item(
+    item: Dict[str, Any],
+    source_url: Optional[str],
+    pending: Optional[Any] = None,
+    memo: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Second pipeline stage: transform the searched image (or fall back to
+    text-to-image) and save the result.
+    """
+    name = item.get('name', 'unnamed')
+    prompt = item.get('prompt', '')
+    log.info("\n[%s] Processing...", name.upper())
+
+    final_url = None
+    
+    # 1. Image-to-Image from the Google Search result
+    if source_url:
+        # If search succeeded, try to illustrate it
+        final_url = illustrate_image(source_url, prompt, pending=pending, memo=memo)
+    
+    # 2. Fallback: Text-to-Image (Estimate)
+    if not final_url:
         if source_url:
-            # If search succeeded, try to illustrate it
-            final_url = illustrate_image(source_url, prompt)
-        
-        # 2. Fallback: Text-to-Image (Estimate)
-        if not final_url:
-            if source_url:
-                print("   ⚠️ Search succeeded but transformation failed. Fallback to Text-to-Image.")
-            else:
-                print("   ⚠️ Search failed or no results. Fallback to Text-to-Image.")
-            
-            final_url = generate_text_to_image(prompt)
-
-        # 3. Save Result
-        if final_url:
-            filename = f"{name}_illustration.png"
-            save_image(final_url, filename)
+            log.warning("   ⚠️ Search succeeded but transformation failed. Fallback to Text-to-Image.")
         else:
-            print(f"   ❌ Failed to generate any image for {name}")
+            log.warning("   ⚠️ Search failed or no results. Fallback to Text-to-Image.")
+        
+        final_url = generate_text_to_image(prompt, pending=pending, memo=memo)
+
+    # 3. Save Result
+    saved = save_image(final_url, f"{name}_illustration.png") if final_url else None
+    if final_url and saved is None and memo is not None:
+        # A memoized URL that no longer downloads must not be served to the next run
+        memo.discard_url(final_url)
+    if not final_url:
+        log.error("   ❌ Failed to generate any image for %s", name)
+    return {
+        "name": name,
+        "source_url": source_url,
+        "url": final_url,
+        "filepath": str(saved) if saved else None,
+        "success": saved is not None,
+    }
+
+
+def process_batch(
+    items: Optional[List[Dict[str, Any]]] = None,
+    search_workers: int = SEARCH_WORKERS,
+    generate_workers: int = GENERATE_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Search and illustrate every item as a two-stage pipeline.
+    All Google searches are submitted up front; as each one returns, its
+    fal.ai transform is handed to the generation pool, so later searches
+    overlap earlier generations.
+
+    Args:
+        items: Batch items (default: the images section of DATA_PATH)
+        search_workers: Concurrent Google searches
+        generate_workers: Concurrent fal.ai generations
+
+    Returns:
+        One result dict per item, in batch order
+    """
+    if items is None:
+        items = load_config()
+    if not items:
+        log.info("No items to process.")
+        return []
+
+    log.info("Found %s items in batch configuration.", len(items))
+
+    # Request ids of submitted generations, so an interrupted batch resumes them
+    pending = PendingRequests(OUTPUT_DIR / PENDING_FILENAME) if PendingRequests else None
+    if pending and len(pending):
+        log.info("↻ Resuming %s unfinished fal.ai request(s) from the last run", len(pending))
+    # Results of identical requests (duplicate items, reruns after a failure)
+    memo = ResultMemo(OUTPUT_DIR / CACHE_DIR_NAME) if ResultMemo else None
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(items), search_workers))) as search_pool, \
+            ThreadPoolExecutor(max_workers=max(1, min(len(items), generate_workers))) as generate_pool:
+        searches = {
+            search_pool.submit(get_google_image, search_query_for(item)): i
+            for i, item in enumerate(items)
+        }
+        generations = {}
+        for future in as_completed(searches):
+            i = searches[future]
+            generations[generate_pool.submit(illustrate_item, items[i], future.result(), pending, memo)] = i
+        for future in as_completed(generations):
+            results[generations[future]] = future.result()
+    flush_logs()
+    return results
 
 if __name__ == "__main__":
-    process_batch()
+    parser = argparse.ArgumentParser(description="Search and illustrate batch images with fal.ai")
+    parser.add_argument(
+        "--workers", type=int, default=GENERATE_WORKERS,
+        help=f"Concurrent fal.ai generations (default: {GENERATE_WORKERS})",
+    )
+    args = parser.parse_args()
+    process_batch(generate_workers=max(1, args.workers))
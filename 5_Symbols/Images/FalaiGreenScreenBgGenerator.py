@@ -7,12 +7,16 @@ Cost: ~$0.01/image × 13 backgrounds = ~$0.13 total (well under $0.50 budget)
 """
 
 import os
+import sys
 import json
 import re
+import threading
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # fal.ai client
 try:
@@ -21,6 +25,44 @@ except ImportError:
     print("❌ fal_client not installed. Run: pip install fal-client")
     exit(1)
 
+# Resumable fal.ai requests (optional when running outside the repo)
+try:
+    from Utils.fal_utils import PendingRequests, PENDING_FILENAME, fal_generate
+    from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+    from Utils.http_utils import download_file
+    from Utils.asset_utils import write_json_atomic
+    from Utils.log_utils import get_logger, flush_logs
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    try:
+        from Utils.fal_utils import PendingRequests, PENDING_FILENAME, fal_generate
+        from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+        from Utils.http_utils import download_file
+        from Utils.asset_utils import write_json_atomic
+        from Utils.log_utils import get_logger, flush_logs
+    except ImportError:
+        import logging
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        get_logger = logging.getLogger
+        flush_logs = logging.shutdown
+        PendingRequests = None
+
+        def fal_generate(model, arguments, pending=None, memo=None, limiter=None):
+            result = fal_client.subscribe(model, arguments=arguments)
+            images = (result or {}).get("images")
+            return images[0]["url"] if images else None
+
+        GenerationCache = None
+        download_file = urllib.request.urlretrieve
+        write_json_atomic = None
+
+# .env loader and per-run spend limit shared by the worker threads (required)
+from Utils.env_utils import load_env
+from Utils.budget import BudgetTracker
+
+# Buffered logger: records are written by a background listener thread
+log = get_logger(__name__)
+
 # Configuration
 OUTPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/output")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -32,141 +74,161 @@ BUDGET_LIMIT = 0.50
 
 IMAGE_SIZE = {"width": 1920, "height": 1080}
 NUM_INFERENCE_STEPS = 4  # schnell is optimised for 4 steps
+# Fixed seed: identical requests give identical (cacheable) backgrounds
+SEED = 42
+
+# Filename sanitizer, compiled once
+_SAFE_NAME_RE = re.compile(r'[^\w\-]')
+_DEDUP_RE = re.compile(r'_+')
+
+# Backgrounds generated concurrently: every request is queued at fal.ai up front
+# and each worker downloads its image while the others are still generating
+MAX_WORKERS = 5
 
 # ─── Green Screen Background Definitions ───────────────────────────────────
 
-AROLL_BACKGROUNDS = [
-    {
-        "id": "bg_01_heavy_mic",
-        "name": "Heavy Mic Stage",
-        "scene": "Scene 1: The Heavy Mic",
-        "timecode": "00:00:00 - 00:00:10",
-        "prompt": (
+@dataclass(frozen=True, slots=True)
+class Background:
+    """One background plate to generate (immutable, so worker threads can share it)"""
+    id: str
+    name: str
+    scene: str
+    timecode: str
+    prompt: str
+
+
+AROLL_BACKGROUNDS: Tuple[Background, ...] = (
+    Background(
+        id="bg_01_heavy_mic",
+        name="Heavy Mic Stage",
+        scene="Scene 1: The Heavy Mic",
+        timecode="00:00:00 - 00:00:10",
+        prompt=(
             "Empty dramatic stage, single spotlight from above, dark moody atmosphere, "
             "polished black floor with reflections, theatrical fog, volumetric light beams, "
             "wide shot perspective, no people, cinematic lighting, 8K, ultra detailed, "
             "film production background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_02_pivot",
-        "name": "Pivot Office",
-        "scene": "Scene 2: The Pivot",
-        "timecode": "00:00:10 - 00:00:35",
-        "prompt": (
+    ),
+    Background(
+        id="bg_02_pivot",
+        name="Pivot Office",
+        scene="Scene 2: The Pivot",
+        timecode="00:00:10 - 00:00:35",
+        prompt=(
             "Modern open-plan office, blurred background, warm ambient lighting, "
             "desks with monitors, busy city visible through floor-to-ceiling windows, "
             "soft bokeh, depth of field, no people, corporate startup aesthetic, "
             "cinematic color grading, background plate for green screen, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_03a_statues",
-        "name": "Stone Statue Hall",
-        "scene": "Scene 3A: Static Rules",
-        "timecode": "00:00:35 - 00:00:48",
-        "prompt": (
+    ),
+    Background(
+        id="bg_03a_statues",
+        name="Stone Statue Hall",
+        scene="Scene 3A: Static Rules",
+        timecode="00:00:35 - 00:00:48",
+        prompt=(
             "Grand museum hall filled with frozen stone statues, marble columns, "
             "classical architecture, dim moody lighting, dust particles in air, "
             "symmetrical composition, no people, wide shot, ancient Roman aesthetic, "
             "cinematic atmosphere, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_03b_mercury",
-        "name": "Mercury Lab",
-        "scene": "Scene 3B: Dynamic AI",
-        "timecode": "00:00:35 - 00:00:48",
-        "prompt": (
+    ),
+    Background(
+        id="bg_03b_mercury",
+        name="Mercury Lab",
+        scene="Scene 3B: Dynamic AI",
+        timecode="00:00:35 - 00:00:48",
+        prompt=(
             "Futuristic laboratory with liquid mercury flowing in glass tubes, "
             "neon blue and silver reflections, sci-fi aesthetic, clean surfaces, "
             "holographic displays, dark background with electric highlights, no people, "
             "cyberpunk inspired, cinematic lighting, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_04_clone_lab",
-        "name": "Clone Lab",
-        "scene": "Scene 4: The Clone Lab",
-        "timecode": "00:00:48 - 00:03:52",
-        "prompt": (
+    ),
+    Background(
+        id="bg_04_clone_lab",
+        name="Clone Lab",
+        scene="Scene 4: The Clone Lab",
+        timecode="00:00:48 - 00:03:52",
+        prompt=(
             "High-tech developer workspace, multiple large monitors showing code, "
             "dark room with RGB ambient lighting, terminal windows with green text, "
             "server racks in background, GitHub octocat logo on wall screen, "
             "no people, hacker aesthetic, cinematic, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_05_evolution",
-        "name": "Evolution Workshop",
-        "scene": "Scene 5: The Evolution",
-        "timecode": "00:03:52 - 00:05:50",
-        "prompt": (
+    ),
+    Background(
+        id="bg_05_evolution",
+        name="Evolution Workshop",
+        scene="Scene 5: The Evolution",
+        timecode="00:03:52 - 00:05:50",
+        prompt=(
             "Futuristic workshop with large industrial 3D printer in the center, "
             "glowing blue laser printing a human-shaped form, metallic surfaces, "
             "steam and particles in the air, warm industrial lighting, "
             "no people, sci-fi factory aesthetic, cinematic wide shot, "
             "background plate for green screen, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_06_nursery",
-        "name": "Nursery Room",
-        "scene": "Scene 6: The Nursery",
-        "timecode": "00:05:50 - 00:06:36",
-        "prompt": (
+    ),
+    Background(
+        id="bg_06_nursery",
+        name="Nursery Room",
+        scene="Scene 6: The Nursery",
+        timecode="00:05:50 - 00:06:36",
+        prompt=(
             "Cozy children's nursery room at night, soft warm lighting, "
             "glowing nightlight on bedside table, "
             "comfortable bed with soft blankets, plush toys, stars on ceiling, "
             "no people, family-friendly atmosphere, warm color palette, "
             "intimate cinematic lighting, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_07_crystal_ball",
-        "name": "Crystal Ball Tech Room",
-        "scene": "Scene 7: The Crystal Ball",
-        "timecode": "00:06:36 - 00:08:26",
-        "prompt": (
+    ),
+    Background(
+        id="bg_07_crystal_ball",
+        name="Crystal Ball Tech Room",
+        scene="Scene 7: The Crystal Ball",
+        timecode="00:06:36 - 00:08:26",
+        prompt=(
             "Mystical tech showroom, dark environment with floating holographic logos, "
             "technology company logos glowing softly in the air, "
             "crystal ball on pedestal in center emitting soft blue light, "
             "smart speaker on table, ethereal fog, magical tech atmosphere, "
             "no people, cinematic, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_08_engine_room",
-        "name": "Engine Room",
-        "scene": "Scene 8: The Engine Room",
-        "timecode": "00:08:26 - 00:09:01",
-        "prompt": (
+    ),
+    Background(
+        id="bg_08_engine_room",
+        name="Engine Room",
+        scene="Scene 8: The Engine Room",
+        timecode="00:08:26 - 00:09:01",
+        prompt=(
             "Industrial engine room with massive spinning gears and clockwork mechanisms, "
             "giant clock face on the wall with hands spinning fast, motion blur on gears, "
             "steam pipes, orange and blue industrial lighting, sparks flying, "
             "no people, steampunk meets high-tech aesthetic, dynamic energy, "
             "cinematic wide shot, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_09_digital_feast",
-        "name": "Digital Feast Table",
-        "scene": "Scene 9: The Digital Feast",
-        "timecode": "00:09:01 - 00:11:45",
-        "prompt": (
+    ),
+    Background(
+        id="bg_09_digital_feast",
+        name="Digital Feast Table",
+        scene="Scene 9: The Digital Feast",
+        timecode="00:09:01 - 00:11:45",
+        prompt=(
             "Grand futuristic banquet hall, long elegant table covered with glowing tablets "
             "and screens displaying AI logos, "
             "holographic menus floating above each tablet, ambient blue and purple lighting, "
             "no people, abundant tech feast aesthetic, overhead perspective elements, "
             "cinematic atmosphere, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_10_power_station",
-        "name": "Power Station",
-        "scene": "Scene 10: The Power Station",
-        "timecode": "00:11:45 - 00:13:15",
-        "prompt": (
+    ),
+    Background(
+        id="bg_10_power_station",
+        name="Power Station",
+        scene="Scene 10: The Power Station",
+        timecode="00:11:45 - 00:13:15",
+        prompt=(
             "Dark laboratory with a glass bottle containing a captured lightning bolt, "
             "electrical arcs and plasma inside glass container, Tesla coil aesthetic, "
             "workflow diagrams projected on walls, "
@@ -174,47 +236,131 @@ AROLL_BACKGROUNDS = [
             "no people, powerful contained energy, cinematic close-up environment, "
             "background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_11_tool_shed",
-        "name": "Tool Shed Workshop",
-        "scene": "Scene 11: The Tool Shed",
-        "timecode": "00:13:15 - 00:17:24",
-        "prompt": (
+    ),
+    Background(
+        id="bg_11_tool_shed",
+        name="Tool Shed Workshop",
+        scene="Scene 11: The Tool Shed",
+        timecode="00:13:15 - 00:17:24",
+        prompt=(
             "Energetic workshop with vibrating toolbox emitting blue colored energy, "
             "tools floating in the air surrounded by glowing particles, "
             "workbench with commit history scrolling on monitors, CI/CD pipeline visualization, "
             "green checkmarks floating in the air, no people, "
             "active workshop aesthetic, cinematic lighting, background plate, 16:9 aspect ratio"
         ),
-    },
-    {
-        "id": "bg_12_balcony",
-        "name": "Balcony Cityscape",
-        "scene": "Scene 12: The Balcony",
-        "timecode": "00:17:24 - End",
-        "prompt": (
+    ),
+    Background(
+        id="bg_12_balcony",
+        name="Balcony Cityscape",
+        scene="Scene 12: The Balcony",
+        timecode="00:17:24 - End",
+        prompt=(
             "Stunning futuristic cityscape viewed from a high-rise balcony at golden hour, "
             "flying drones building skyscrapers in the distance, gleaming towers, "
             "warm sunset glow, clouds below eye level, glass railing in foreground, "
             "no people, aspirational sci-fi utopia, epic scale, "
             "cinematic wide establishing shot, background plate, 16:9 aspect ratio"
         ),
-    },
-]
+    ),
+)
+
+
+def write_json(path: Path, data: Dict) -> None:
+    """Write indented JSON atomically (orjson when installed), plain json.dump standalone"""
+    if write_json_atomic:
+        write_json_atomic(path, data)
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+# One lock per request key, so concurrent duplicates wait for the first one's cache entry
+_key_locks: Dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+def _key_lock(key: Optional[str]) -> threading.Lock:
+    if key is None:
+        return threading.Lock()
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def generate_background(
+    bg: Background,
+    idx: int,
+    total: int,
+    budget: BudgetTracker,
+    timestamp: str,
+    pending: Optional[object] = None,
+    cache: Optional[object] = None
+) -> Dict:
+    """Generate, download and describe a single green screen background"""
+    # One record per header so parallel workers' lines stay together
+    log.info("\n[%s/%s] Generating: %s\n   Scene: %s (%s)\n   Cost so far: $%.2f / $%.2f",
+             idx, total, bg.name, bg.scene, bg.timecode, budget.spent, BUDGET_LIMIT)
+
+    arguments = {
+        "prompt": bg.prompt,
+        "image_size": IMAGE_SIZE,
+        "num_inference_steps": NUM_INFERENCE_STEPS,
+        "num_images": 1,
+        "seed": SEED,
+    }
+
+    safe_name = _DEDUP_RE.sub('_', _SAFE_NAME_RE.sub('_', bg.id.lower())).strip('_')
+    filename = f"{safe_name}_{timestamp}.png"
+    filepath = OUTPUT_DIR / filename
+
+    cache_key = compute_cache_key(MODEL, arguments) if cache else None
+    reserved = False
+    try:
+        with _key_lock(cache_key):
+            # Identical request generated before (rerun, duplicate prompt): no API call, no cost
+            if cache and cache.restore(cache_key, "png", filepath):
+                image_url = cache.load_metadata(cache_key).get("url")
+                cost = 0.0
+                log.info("   ♻️  Restored from cache: %s", filename)
+            else:
+                if not budget.reserve(COST_PER_IMAGE):
+                    log.warning("   ⚠️  Budget limit $%.2f reached. Skipping %s.", BUDGET_LIMIT, bg.name)
+                    return {"success": False, "name": bg.name, "error": "Budget limit reached"}
+                reserved = True
+
+                image_url = fal_generate(MODEL, arguments, pending)
+                if not image_url:
+                    log.error("   ❌ No images returned (%s)", bg.name)
+                    budget.release(COST_PER_IMAGE)
+                    return {"success": False, "name": bg.name, "error": "No images returned"}
+
+                # Generated (and billed): keep the reservation even if the download fails
+                reserved = False
+                download_file(image_url, filepath)  # pooled keep-alive connection
+                cost = COST_PER_IMAGE
+                log.info("   ✅ Saved: %s", filename)
+                if cache:
+                    cache.store(cache_key, filepath, {"url": image_url, "model": MODEL, "arguments": arguments})
+
+        # Save metadata
+        meta_path = OUTPUT_DIR / filename.replace('.png', '.json')
+        write_json(meta_path, {
+            **asdict(bg),
+            "filename": filename,
+            "result_url": image_url,
+            "generated_at": timestamp,
+            "model": MODEL,
+            "cost": cost,
+            "purpose": "green_screen_background",
+        })
 
+        return {"success": True, "name": bg.name, "filename": filename, "cached": cost == 0.0}
 
-def load_env():
-    """Load environment variables from .env file"""
-    env_path = Path(__file__).parent.parent / ".env"
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    value = value.strip('"').strip("'")
-                    os.environ[key] = value
+    except Exception as e:
+        if reserved:
+            budget.release(COST_PER_IMAGE)
+        log.error("   ❌ Error (%s): %s", bg.name, e)
+        return {"success": False, "name": bg.name, "error": str(e)}
 
 
 def main():
@@ -223,124 +369,95 @@ def main():
 
     api_key = os.environ.get("FAL_KEY")
     if not api_key:
-        print("❌ FAL_KEY not found in environment")
+        log.error("❌ FAL_KEY not found in environment")
+        flush_logs()
         return
 
-    total_count = len(AROLL_BACKGROUNDS)
+    backgrounds = [bg if isinstance(bg, Background) else Background(**bg) for bg in AROLL_BACKGROUNDS]
+    total_count = len(backgrounds)
     estimated_total = total_count * COST_PER_IMAGE
 
-    print(f"\n{'='*60}")
-    print("🟩 FAL.AI GREEN SCREEN BACKGROUND GENERATOR")
-    print(f"   Model: {MODEL} (~${COST_PER_IMAGE:.2f}/image)")
-    print(f"   Backgrounds: {total_count}")
-    print(f"   Estimated cost: ${estimated_total:.2f} (budget: ${BUDGET_LIMIT:.2f})")
-    print(f"   Output: {OUTPUT_DIR}")
-    print("="*60)
+    log.info("\n%s", "=" * 60)
+    log.info("🟩 FAL.AI GREEN SCREEN BACKGROUND GENERATOR")
+    log.info("   Model: %s (~$%.2f/image)", MODEL, COST_PER_IMAGE)
+    log.info("   Backgrounds: %s", total_count)
+    log.info("   Estimated cost: $%.2f (budget: $%.2f)", estimated_total, BUDGET_LIMIT)
+    log.info("   Output: %s", OUTPUT_DIR)
+    log.info("=" * 60)
 
-    if estimated_total > BUDGET_LIMIT:
-        print(f"\n❌ Estimated cost ${estimated_total:.2f} exceeds budget ${BUDGET_LIMIT:.2f}. Aborting.")
-        return
+    # Budget preflight: only the backgrounds the budget can pay for are submitted
+    # (rounded so float division doesn't lose one, e.g. 0.50 // 0.01 == 49.0)
+    max_allowed = min(total_count, int(round(BUDGET_LIMIT / COST_PER_IMAGE, 6)))
+    if max_allowed < total_count:
+        log.warning("\n⚠️  Estimated cost $%.2f exceeds budget $%.2f. Generating the first %s of %s backgrounds.",
+                    estimated_total, BUDGET_LIMIT, max_allowed, total_count)
 
-    for i, bg in enumerate(AROLL_BACKGROUNDS, 1):
-        print(f"   {i:2d}. [{bg['timecode']}] {bg['name']}")
+    for i, bg in enumerate(backgrounds, 1):
+        log.info("   %2d. [%s] %s", i, bg.timecode, bg.name)
 
-    print(f"\n💰 Total estimated cost: ${estimated_total:.2f}")
+    log.info("\n💰 Total estimated cost: $%.2f", estimated_total)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results = []
-    running_cost = 0.0
-
-    for i, bg in enumerate(AROLL_BACKGROUNDS, 1):
-        # Budget guard
-        if running_cost + COST_PER_IMAGE > BUDGET_LIMIT:
-            print(f"\n⚠️  Budget limit ${BUDGET_LIMIT:.2f} reached (spent ${running_cost:.2f}). Stopping.")
-            results.append({"success": False, "name": bg['name'], "error": "Budget limit reached"})
-            continue
-
-        print(f"\n[{i}/{total_count}] Generating: {bg['name']}")
-        print(f"   Scene: {bg['scene']} ({bg['timecode']})")
-        print(f"   Cost so far: ${running_cost:.2f} / ${BUDGET_LIMIT:.2f}")
-
-        try:
-            result = fal_client.subscribe(
-                MODEL,
-                arguments={
-                    "prompt": bg["prompt"],
-                    "image_size": IMAGE_SIZE,
-                    "num_inference_steps": NUM_INFERENCE_STEPS,
-                    "num_images": 1,
-                },
-            )
-
-            if result and "images" in result and len(result["images"]) > 0:
-                image_url = result["images"][0]["url"]
-
-                safe_name = re.sub(r'[^\w\-]', '_', bg['id'].lower())
-                safe_name = re.sub(r'_+', '_', safe_name).strip('_')
-                filename = f"{safe_name}_{timestamp}.png"
-
-                filepath = OUTPUT_DIR / filename
-                urllib.request.urlretrieve(image_url, filepath)
-                print(f"   ✅ Saved: {filename}")
-
-                # Save metadata
-                meta_path = OUTPUT_DIR / filename.replace('.png', '.json')
-                with open(meta_path, 'w') as f:
-                    json.dump({
-                        **bg,
-                        "filename": filename,
-                        "result_url": image_url,
-                        "generated_at": timestamp,
-                        "model": MODEL,
-                        "cost": COST_PER_IMAGE,
-                        "purpose": "green_screen_background",
-                    }, f, indent=2)
-
-                running_cost += COST_PER_IMAGE
-                results.append({"success": True, "name": bg['name'], "filename": filename})
-            else:
-                print(f"   ❌ No images returned")
-                results.append({"success": False, "name": bg['name'], "error": "No images returned"})
-
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            results.append({"success": False, "name": bg['name'], "error": str(e)})
+    budget = BudgetTracker(BUDGET_LIMIT)
+
+    # Request ids of submitted generations: a crashed or timed-out run resumes
+    # them on the next start instead of paying for the same background twice
+    pending = PendingRequests(OUTPUT_DIR / PENDING_FILENAME) if PendingRequests else None
+    if pending and len(pending):
+        log.info("\n↻ Resuming %s unfinished fal.ai request(s) from the last run", len(pending))
+    # Content-addressed cache of generated backgrounds (seeded, so identical requests match)
+    cache = GenerationCache(OUTPUT_DIR / CACHE_DIR_NAME) if GenerationCache else None
+
+    # All backgrounds in flight at once (up to MAX_WORKERS); results keep list order
+    results: List[Optional[Dict]] = [None] * max_allowed
+    with ThreadPoolExecutor(max_workers=max(1, min(max_allowed, MAX_WORKERS))) as executor:
+        futures = {
+            executor.submit(generate_background, bg, i, total_count, budget, timestamp, pending, cache): i - 1
+            for i, bg in enumerate(backgrounds[:max_allowed], 1)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    results.extend(
+        {"success": False, "name": bg.name, "error": "Budget limit reached"}
+        for bg in backgrounds[max_allowed:]
+    )
+    running_cost = budget.spent
 
     # ── Summary ──
     ok = [r for r in results if r["success"]]
     fail = [r for r in results if not r["success"]]
 
-    print(f"\n{'='*60}")
-    print("📊 GENERATION SUMMARY")
-    print("="*60)
-    print(f"✅ Successful: {len(ok)}/{len(results)}")
-    print(f"❌ Failed:     {len(fail)}/{len(results)}")
-    print(f"💰 Total cost: ${running_cost:.2f} / ${BUDGET_LIMIT:.2f} budget")
+    log.info("\n%s", "=" * 60)
+    log.info("📊 GENERATION SUMMARY")
+    log.info("=" * 60)
+    log.info("✅ Successful: %s/%s", len(ok), len(results))
+    log.info("❌ Failed:     %s/%s", len(fail), len(results))
+    log.info("💰 Total cost: $%.2f / $%.2f budget", running_cost, BUDGET_LIMIT)
 
     if ok:
-        print("\n✅ Generated backgrounds:")
+        log.info("\n✅ Generated backgrounds:")
         for r in ok:
-            print(f"   • {r['name']} → {r['filename']}")
+            log.info("   • %s → %s", r['name'], r['filename'])
     if fail:
-        print("\n❌ Failed backgrounds:")
+        log.info("\n❌ Failed backgrounds:")
         for r in fail:
-            print(f"   • {r['name']} — {r.get('error','')}")
+            log.info("   • %s — %s", r['name'], r.get('error',''))
 
     summary_path = OUTPUT_DIR / f"greenscreen_bg_falai_summary_{timestamp}.json"
-    with open(summary_path, 'w') as f:
-        json.dump({
-            "model": MODEL,
-            "cost_per_image": COST_PER_IMAGE,
-            "total_cost": running_cost,
-            "budget_limit": BUDGET_LIMIT,
-            "total": len(results),
-            "successful": len(ok),
-            "failed": len(fail),
-            "results": results,
-        }, f, indent=2)
-
-    print(f"\n💾 Summary: {summary_path}")
-    print("✅ Done!")
+    write_json(summary_path, {
+        "model": MODEL,
+        "cost_per_image": COST_PER_IMAGE,
+        "total_cost": running_cost,
+        "budget_limit": BUDGET_LIMIT,
+        "total": len(results),
+        "successful": len(ok),
+        "failed": len(fail),
+        "results": results,
+    })
+
+    log.info("\n💾 Summary: %s", summary_path)
+    log.info("✅ Done!")
+    flush_logs()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Gemini Combined Generator
+Runs GeminiGraphicsGenerator and GeminiGreenScreenBgGenerator as one batch:
+one confirmation, one genai client, one worker pool and one summary. Every
+request goes through the shared Imagen rate limiter, so the two sets of
+prompts fill each other's gaps instead of running back to back.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from Images import GeminiGraphicsGenerator as graphics
+    from Images import GeminiGreenScreenBgGenerator as greenscreen
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from Images import GeminiGraphicsGenerator as graphics
+    from Images import GeminiGreenScreenBgGenerator as greenscreen
+
+from google import genai
+from Utils.env_utils import load_env
+from Utils.gemini_utils import DRAFT_MODEL, summarize_results
+from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME
+from Utils.asset_utils import write_json_atomic
+
+# Imagen requests in flight across both generators (the shared limiter sets the pace)
+MAX_WORKERS = 4
+
+
+def collect_jobs() -> List[Dict]:
+    """Prompts of both generators, tagged with the generator they belong to"""
+    return (
+        [{"source": "graphics", "item": item} for item in graphics.collect_prompts()]
+        + [{"source": "greenscreen", "item": bg} for bg in greenscreen.collect_prompts()]
+    )
+
+
+def run_job(
+    job: Dict,
+    index: int,
+    total: int,
+    client,
+    timestamp: str,
+    caches: Dict[Path, object],
+    draft: bool,
+    force: bool
+) -> Dict:
+    """Generate one job with its own generator's worker (filenames, metadata and cache as standalone)"""
+    if job["source"] == "graphics":
+        output_dir = graphics.OUTPUT_DIR
+        result = graphics.generate_graphic(
+            job["item"], index, total, client, output_dir, timestamp, caches[output_dir], draft, force
+        )
+    else:
+        output_dir = greenscreen.OUTPUT_DIR
+        result = greenscreen.generate_background(
+            job["item"], index, total, client, timestamp, caches[output_dir], draft, force
+        )
+    return {"source": job["source"], **result}
+
+
+def main():
+    """Generate every Gemini graphic and green screen background in one run"""
+    parser = argparse.ArgumentParser(description="Generate all Gemini graphics and green screen backgrounds")
+    parser.add_argument(
+        "--draft", action="store_true",
+        help=f"Cheaper preview run: {DRAFT_MODEL}, '_draft' filenames, no metadata",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Regenerate images even if an identical prompt is cached (also: FAL_FORCE env var)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=MAX_WORKERS,
+        help=f"Concurrent Imagen requests (default: {MAX_WORKERS})",
+    )
+    args = parser.parse_args()
+    force = args.force or bool(os.environ.get("FAL_FORCE"))
+
+    load_env()
+
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        print("❌ GOOGLE_API_KEY not found in environment")
+        return
+
+    jobs = collect_jobs()
+    counts = {source: sum(1 for job in jobs if job["source"] == source) for source in ("graphics", "greenscreen")}
+
+    print(f"\n{'='*60}")
+    print("🎨 GEMINI COMBINED GENERATOR")
+    print(f"   Graphics: {counts['graphics']}")
+    print(f"   Green screen backgrounds: {counts['greenscreen']}")
+    print(f"   Total: {len(jobs)}")
+    if args.draft:
+        print(f"   Draft mode: {DRAFT_MODEL}, no metadata")
+    print("="*60)
+
+    if not jobs:
+        print("❌ Nothing to generate")
+        return
+
+    response = input("\n🤔 Proceed with generation? (yes/no): ").strip().lower()
+    if response not in ['yes', 'y']:
+        print("❌ Cancelled by user")
+        return
+
+    client = genai.Client(api_key=api_key)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # One cache per output directory, shared when both generators write to the same place
+    caches = {
+        output_dir: GenerationCache(output_dir / CACHE_DIR_NAME)
+        for output_dir in {graphics.OUTPUT_DIR, greenscreen.OUTPUT_DIR}
+    }
+
+    results: List[Optional[Dict]] = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(jobs), args.workers))) as executor:
+        futures = {
+            executor.submit(run_job, job, i, len(jobs), client, timestamp, caches, args.draft, force): i - 1
+            for i, job in enumerate(jobs, 1)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    # ── Summary ──
+    summary = summarize_results(results)
+
+    print(f"\n{'='*60}")
+    print("📊 GENERATION SUMMARY")
+    print("="*60)
+    print(f"✅ Successful: {summary['successful']}/{summary['total']}")
+    print(f"❌ Failed:     {summary['failed']}/{summary['total']}")
+    for r in results:
+        if not r["success"]:
+            print(f"   • [{r['source']}] {r['name']}")
+
+    summary_path = graphics.OUTPUT_DIR / f"gemini_combined_summary_{timestamp}.json"
+    write_json_atomic(summary_path, summary)
+
+    print(f"\n💾 Summary: {summary_path}")
+    print("✅ Done!")
+
+
+if __name__ == "__main__":
+    main()
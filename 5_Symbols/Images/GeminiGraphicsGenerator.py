@@ -4,9 +4,12 @@ Gemini Graphics Generator
 Generates graphics using Google Gemini API (Imagen 4) based on source_graphics.md
 """
 
+import argparse
+import mmap
 import os
-import json
+import sys
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -14,11 +17,23 @@ from typing import Dict, List, Optional
 # Google Generative AI
 try:
     from google import genai
-    from google.genai import types
 except ImportError:
     print("❌ google-genai not installed. Run: pip install google-genai")
     exit(1)
 
+# Shared Gemini helpers (.env, paced Imagen requests), generation cache and JSON writer
+try:
+    from Utils.gemini_utils import DRAFT_MODEL, IMAGEN_MODEL, generate_image, summarize_results
+    from Utils.env_utils import load_env
+    from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+    from Utils.asset_utils import write_json_atomic
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from Utils.gemini_utils import DRAFT_MODEL, IMAGEN_MODEL, generate_image, summarize_results
+    from Utils.env_utils import load_env
+    from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+    from Utils.asset_utils import write_json_atomic
+
 # Configuration
 INPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/input")
 OUTPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/output")
@@ -26,99 +41,98 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Image generation settings
 IMAGE_SETTINGS = {
-    "model": "imagen-4.0-generate-001",
+    "model": IMAGEN_MODEL,
     "width": 1920,
     "height": 1080,
 }
 
-def load_env():
-    """Load environment variables from .env file"""
-    env_path = Path(__file__).parent.parent / ".env"
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    value = value.strip('"').strip("'")
-                    os.environ[key] = value
+# source_graphics.md sections ("#### Graphic N: Title" up to the next graphic or rule),
+# matched on the raw bytes of the memory-mapped file (LF or CRLF line endings)
+GRAPHIC_PATTERN = re.compile(
+    rb'#### Graphic (\d+): ([^\r\n]+)\r?\n(.*?)(?=#### Graphic|\r?\n---\r?\n|\Z)',
+    re.DOTALL
+)
+
+# "- **Field:** value" lines inside a graphic section
+GRAPHIC_FIELDS_RE = re.compile(r'^[ \t]*- \*\*(Type|Visual|Style|Text):\*\*(.*)$', re.MULTILINE)
+
+# Parsed graphics memoized by (path, mtime) so repeated parses of an unchanged file are free
+_PARSED_CACHE: Dict[tuple, List[Dict]] = {}
+
+# Filename sanitizer, compiled once
+SAFE_NAME_RE = re.compile(r'[^\w\-]')
+SAFE_NAME_DEDUP_RE = re.compile(r'_+')
+
+def sanitize_name(name: str) -> str:
+    """Filename-safe form of a graphic name (computed once, when prompts are built)"""
+    return SAFE_NAME_DEDUP_RE.sub('_', SAFE_NAME_RE.sub('_', name.lower())).strip('_')
+
+# Graphics generated concurrently (each Imagen call is a blocking network request)
+MAX_WORKERS = 4
 
 def parse_graphics_markdown(file_path: Path) -> List[Dict]:
-    """Parse source_graphics.md and extract graphic prompts"""
+    """Parse source_graphics.md and extract graphic prompts (parsed once per file version)"""
     prompts = []
     
-    if not file_path.exists():
+    try:
+        stat = file_path.stat()
+    except OSError:
         print(f"⚠️  Graphics file not found: {file_path}")
         return prompts
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Parse graphics sections by "#### Graphic N:"
-    graphic_pattern = re.compile(
-        r'#### Graphic (\d+): ([^\n]+)\n(.*?)(?=#### Graphic|\n---\n|\Z)',
-        re.DOTALL
-    )
+    cache_key = (str(file_path), stat.st_mtime_ns)
+    if cache_key in _PARSED_CACHE:
+        # Shallow-copy entries so callers can't mutate the memoized prompts
+        return [dict(item) for item in _PARSED_CACHE[cache_key]]
     
-    matches = graphic_pattern.findall(content)
+    # Parse graphics sections by "#### Graphic N:" straight from the page cache;
+    # only the captured groups are decoded (mmap can't map an empty file)
+    matches = []
+    if stat.st_size:
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            matches = GRAPHIC_PATTERN.findall(mm)
     
     for num, title, body in matches:
-        # Extract details
-        graphic_type = ""
-        visual = ""
-        style = ""
-        text_content = ""
+        num, title, body = num.decode('ascii'), title.decode('utf-8'), body.decode('utf-8')
+        # Extract details (one scan of the body; a repeated field keeps its last value)
+        fields = {name: value.strip() for name, value in GRAPHIC_FIELDS_RE.findall(body)}
+        graphic_type = fields.get('Type', '')
+        visual = fields.get('Visual', '')
+        style = fields.get('Style', '')
+        text_content = fields.get('Text', '')
         
-        for line in body.split('\n'):
-            line = line.strip()
-            if line.startswith('- **Type:**'):
-                graphic_type = line.split('**Type:**')[-1].strip()
-            elif line.startswith('- **Visual:**'):
-                visual = line.split('**Visual:**')[-1].strip()
-            elif line.startswith('- **Style:**'):
-                style = line.split('**Style:**')[-1].strip()
-            elif line.startswith('- **Text:**'):
-                text_content = line.split('**Text:**')[-1].strip()
-        
-        # Build prompt
-        prompt_parts = [
+        # Build prompt (empty fields are dropped before the join)
+        prompt = ". ".join(filter(None, (
             "Professional video graphic asset",
             f"Title: {title}",
-        ]
-        
-        if graphic_type:
-            prompt_parts.append(f"Type: {graphic_type}")
-        if visual:
-            prompt_parts.append(f"Visual elements: {visual}")
-        if style:
-            prompt_parts.append(f"Style: {style}")
-        if text_content:
-            prompt_parts.append(f"Text displayed: {text_content}")
-        
-        prompt_parts.extend([
+            graphic_type and f"Type: {graphic_type}",
+            visual and f"Visual elements: {visual}",
+            style and f"Style: {style}",
+            text_content and f"Text displayed: {text_content}",
             "Modern tech aesthetic",
             "GitHub colors (#24292e black, #0366d6 blue)",
             "Clean minimalist design",
             "Sharp edges, professional look",
-            "16:9 aspect ratio for video overlay"
-        ])
-        
-        prompt = ". ".join(prompt_parts)
+            "16:9 aspect ratio for video overlay",
+        )))
         
+        name = title.strip().lower().replace(' ', '_').replace('"', '')
         prompts.append({
             "id": f"graphic_{int(num):02d}",
-            "name": title.strip().lower().replace(' ', '_').replace('"', ''),
+            "name": name,
+            "safe_name": sanitize_name(name),
             "prompt": prompt,
             "scene": f"Graphic {num}",
             "category": "graphic",
             "type": graphic_type,
         })
     
-    return prompts
+    _PARSED_CACHE[cache_key] = prompts
+    return [dict(item) for item in prompts]
 
 def get_additional_graphics() -> List[Dict]:
     """Additional commonly needed graphics"""
-    return [
+    graphics = [
         {
             "id": "graphic_stat_240",
             "name": "240_workflows_stat",
@@ -168,27 +182,13 @@ def get_additional_graphics() -> List[Dict]:
             "type": "quote_card"
         },
     ]
+    for item in graphics:
+        item["safe_name"] = sanitize_name(item["name"])
+    return graphics
 
-def generate_image_gemini(client, prompt: str) -> Optional[bytes]:
-    """Generate a single image using Imagen 4"""
-    try:
-        response = client.models.generate_images(
-            model=IMAGE_SETTINGS["model"],
-            prompt=prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-            )
-        )
-        
-        # Extract image from response
-        if response.generated_images and len(response.generated_images) > 0:
-            return response.generated_images[0].image.image_bytes
-        
-        return None
-        
-    except Exception as e:
-        print(f"❌ Generation error: {e}")
-        return None
+def collect_prompts() -> List[Dict]:
+    """Every graphic this script generates: source_graphics.md sections, then the additional graphics"""
+    return parse_graphics_markdown(INPUT_DIR / "source_graphics.md") + get_additional_graphics()
 
 def save_image(image_data: bytes, filename: str, output_dir: Path) -> Path:
     """Save image data to file"""
@@ -197,67 +197,121 @@ def save_image(image_data: bytes, filename: str, output_dir: Path) -> Path:
         f.write(image_data)
     return filepath
 
-def generate_all_graphics(prompts: List[Dict], client, output_dir: Path) -> List[Dict]:
-    """Generate all graphics from prompts"""
-    results = []
+def generate_graphic(
+    item: Dict,
+    index: int,
+    total: int,
+    client,
+    output_dir: Path,
+    timestamp: str,
+    cache: Optional[object] = None,
+    draft: bool = False,
+    force: bool = False
+) -> Dict:
+    """Generate (or restore from the cache unless force), save and describe a single graphic"""
+    # One print per header so parallel workers' lines stay together
+    print(f"\n[{index}/{total}] Generating: {item.get('name', item.get('id'))}\n"
+          f"   Category: {item.get('category', 'graphic')}\n"
+          f"   Type: {item.get('type', 'unknown')}\n"
+          f"   Prompt: {item['prompt'][:80]}...")
+    
+    # Filename-safe name is precomputed with the prompt (sanitized here only for external items)
+    safe_name = item.get('safe_name') or sanitize_name(item.get('name', item.get('id', 'graphic')))
+    # Draft images come from the cheaper model and are marked so they aren't mistaken for finals
+    model = DRAFT_MODEL if draft else IMAGE_SETTINGS["model"]
+    filename = f"gfx_{safe_name}_{timestamp}{'_draft' if draft else ''}.png"
+    filepath = output_dir / filename
+    
+    # A prompt generated by an earlier (partly failed) run is reused, not billed again;
+    # Imagen takes no seed, so force is the way to get a new take (it replaces the cached one)
+    cache_key = compute_cache_key(model, {"prompt": item['prompt']}) if cache else None
+    cached = bool(cache and not force and cache.restore(cache_key, "png", filepath))
+    if cached:
+        print(f"   ♻️  Restored from cache: {filename}")
+    else:
+        image_data = generate_image(client, item['prompt'], model)
+        
+        if not image_data:
+            print(f"   ❌ Failed to generate: {item.get('name', item.get('id'))}")
+            return {
+                "success": False,
+                "name": item.get('name', item.get('id')),
+                "error": "Generation failed"
+            }
+        
+        # Save image
+        filepath = save_image(image_data, filename, output_dir)
+        print(f"   ✅ Saved: {filepath.name}")
+        if cache:
+            cache.store(cache_key, filepath, {"model": model, "prompt": item['prompt']})
+    
+    # Save metadata (drafts are throwaway previews: image only)
+    if not draft:
+        metadata = {
+            **item,
+            "filename": filename,
+            "generated_at": timestamp,
+            "model": model,
+        }
+        
+        metadata_path = output_dir / f"{filename.replace('.png', '.json')}"
+        write_json_atomic(metadata_path, metadata)
+    
+    return {
+        "success": True,
+        "name": item.get('name', item.get('id')),
+        "filename": filename,
+        "filepath": str(filepath),
+        "cached": cached
+    }
+
+def generate_all_graphics(
+    prompts: List[Dict],
+    client,
+    output_dir: Path,
+    max_workers: int = MAX_WORKERS,
+    draft: bool = False,
+    force: bool = False
+) -> List[Dict]:
+    """Generate all graphics from prompts (concurrently; results keep prompt order)"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     print(f"\n{'='*60}")
     print("🎨 GEMINI GRAPHICS GENERATOR")
     print(f"   Total graphics: {len(prompts)}")
+    if draft:
+        print(f"   Draft mode: {DRAFT_MODEL}, no metadata")
     print(f"   Output: {output_dir}")
     print("="*60)
     
-    for i, item in enumerate(prompts, 1):
-        print(f"\n[{i}/{len(prompts)}] Generating: {item.get('name', item.get('id'))}")
-        print(f"   Category: {item.get('category', 'graphic')}")
-        print(f"   Type: {item.get('type', 'unknown')}")
-        print(f"   Prompt: {item['prompt'][:80]}...")
-        
-        image_data = generate_image_gemini(client, item['prompt'])
-        
-        if image_data:
-            # Generate filename - sanitize to remove invalid characters
-            safe_name = item.get('name', item.get('id', 'graphic'))
-            # Remove all characters that are problematic for filenames
-            safe_name = re.sub(r'[^\w\-]', '_', safe_name.lower())
-            safe_name = re.sub(r'_+', '_', safe_name).strip('_')
-            filename = f"gfx_{safe_name}_{timestamp}.png"
-            
-            # Save image
-            filepath = save_image(image_data, filename, output_dir)
-            print(f"   ✅ Saved: {filepath.name}")
-            
-            # Save metadata
-            metadata = {
-                **item,
-                "filename": filename,
-                "generated_at": timestamp,
-                "model": IMAGE_SETTINGS["model"],
-            }
-            
-            metadata_path = output_dir / f"{filename.replace('.png', '.json')}"
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            results.append({
-                "success": True,
-                "name": item.get('name', item.get('id')),
-                "filename": filename,
-                "filepath": str(filepath)
-            })
-        else:
-            print(f"   ❌ Failed to generate")
-            results.append({
-                "success": False,
-                "name": item.get('name', item.get('id')),
-                "error": "Generation failed"
-            })
+    # Content-addressed cache of earlier generations, so re-runs only pay for new prompts
+    cache = GenerationCache(output_dir / CACHE_DIR_NAME)
+    
+    # Imagen calls are blocking network requests: run several at once on one shared client
+    results: List[Optional[Dict]] = [None] * len(prompts)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(prompts), max_workers))) as executor:
+        futures = {
+            executor.submit(generate_graphic, item, i, len(prompts), client, output_dir, timestamp, cache, draft, force): i - 1
+            for i, item in enumerate(prompts, 1)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
     
     return results
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Generate video graphics with Imagen")
+    parser.add_argument(
+        "--draft", action="store_true",
+        help=f"Cheaper preview run: {DRAFT_MODEL}, '_draft' filenames, no metadata",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Regenerate images even if an identical prompt is cached (also: FAL_FORCE env var)",
+    )
+    args = parser.parse_args()
+    
     # Load environment
     load_env()
     
@@ -294,27 +348,21 @@ def main():
         return
     
     # Generate graphics
-    results = generate_all_graphics(all_prompts, client, OUTPUT_DIR)
+    force = args.force or bool(os.environ.get("FAL_FORCE"))
+    results = generate_all_graphics(all_prompts, client, OUTPUT_DIR, draft=args.draft, force=force)
     
     # Summary
-    successful = [r for r in results if r["success"]]
-    failed = [r for r in results if not r["success"]]
+    summary = summarize_results(results)
     
     print(f"\n{'='*60}")
     print("📊 GENERATION SUMMARY")
     print("="*60)
-    print(f"✅ Successful: {len(successful)}/{len(results)}")
-    print(f"❌ Failed: {len(failed)}/{len(results)}")
+    print(f"✅ Successful: {summary['successful']}/{summary['total']}")
+    print(f"❌ Failed: {summary['failed']}/{summary['total']}")
     
     # Save summary
     summary_path = OUTPUT_DIR / f"gemini_graphics_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(summary_path, 'w') as f:
-        json.dump({
-            "total": len(results),
-            "successful": len(successful),
-            "failed": len(failed),
-            "results": results,
-        }, f, indent=2)
+    write_json_atomic(summary_path, summary)
     
     print(f"\n💾 Summary saved: {summary_path}")
     print("\n✅ Done!")
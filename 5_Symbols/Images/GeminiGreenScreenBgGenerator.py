@@ -5,9 +5,11 @@ Generates A-roll backgrounds for green screen compositing using Imagen 4.
 Each scene has a unique environment that the host stands in front of.
 """
 
+import argparse
 import os
-import json
+import sys
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -15,20 +17,45 @@ from typing import Dict, List, Optional
 # Google Generative AI
 try:
     from google import genai
-    from google.genai import types
 except ImportError:
     print("❌ google-genai not installed. Run: pip install google-genai")
     exit(1)
 
+# Shared Gemini helpers (.env, paced Imagen requests), generation cache and JSON writer
+try:
+    from Utils.gemini_utils import DRAFT_MODEL, IMAGEN_MODEL, generate_image, summarize_results
+    from Utils.env_utils import load_env
+    from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+    from Utils.asset_utils import write_json_atomic
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from Utils.gemini_utils import DRAFT_MODEL, IMAGEN_MODEL, generate_image, summarize_results
+    from Utils.env_utils import load_env
+    from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+    from Utils.asset_utils import write_json_atomic
+
 # Configuration
 INPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/input")
 OUTPUT_DIR = Path("/Users/rifaterdemsahin/projects/fal.ai/3_Simulation/2026-02-15/output")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 IMAGE_SETTINGS = {
-    "model": "imagen-4.0-generate-001",
+    "model": IMAGEN_MODEL,
 }
 
+# Filename sanitizer, compiled once
+SAFE_NAME_RE = re.compile(r'[^\w\-]')
+SAFE_NAME_DEDUP_RE = re.compile(r'_+')
+
+
+def sanitize_name(name: str) -> str:
+    """Filename-safe form of a background id (computed once, when prompts are built)"""
+    return SAFE_NAME_DEDUP_RE.sub('_', SAFE_NAME_RE.sub('_', name.lower())).strip('_')
+
+
+# Backgrounds generated concurrently (each Imagen call is a blocking network request)
+MAX_WORKERS = 4
+
 # ─── Green Screen Background Definitions ───────────────────────────────────
 # Each entry maps a storyboard scene to the background the host will be
 # composited onto.  Prompts are tailored for *empty* environments (no people)
@@ -214,40 +241,80 @@ AROLL_BACKGROUNDS = [
     },
 ]
 
+def collect_prompts() -> List[Dict]:
+    """Every background this script generates, as copies with their filename stem ("safe_name") filled in"""
+    return [{**bg, "safe_name": sanitize_name(bg["id"])} for bg in AROLL_BACKGROUNDS]
+
 
-def load_env():
-    """Load environment variables from .env file"""
-    env_path = Path(__file__).parent.parent / ".env"
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    value = value.strip('"').strip("'")
-                    os.environ[key] = value
-
-
-def generate_image(client, prompt: str) -> Optional[bytes]:
-    """Generate a single background image using Imagen 4"""
-    try:
-        response = client.models.generate_images(
-            model=IMAGE_SETTINGS["model"],
-            prompt=prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-            )
-        )
-        if response.generated_images and len(response.generated_images) > 0:
-            return response.generated_images[0].image.image_bytes
-        return None
-    except Exception as e:
-        print(f"   ❌ Generation error: {e}")
-        return None
+def generate_background(
+    bg: Dict,
+    index: int,
+    total: int,
+    client,
+    timestamp: str,
+    cache: Optional[object] = None,
+    draft: bool = False,
+    force: bool = False
+) -> Dict:
+    """Generate (or restore from the cache unless force), save and describe a single background"""
+    # One print per header so parallel workers' lines stay together
+    print(f"\n[{index}/{total}] Generating: {bg['name']}\n"
+          f"   Scene: {bg['scene']} ({bg['timecode']})\n"
+          f"   Prompt: {bg['prompt'][:90]}...")
+
+    # Draft images come from the cheaper model and are marked so they aren't mistaken for finals
+    model = DRAFT_MODEL if draft else IMAGE_SETTINGS["model"]
+    safe_name = bg.get('safe_name') or sanitize_name(bg['id'])
+    filename = f"{safe_name}_{timestamp}{'_draft' if draft else ''}.png"
+    filepath = OUTPUT_DIR / filename
+
+    # A prompt generated by an earlier (partly failed) run is reused, not billed again;
+    # Imagen takes no seed, so force is the way to get a new take (it replaces the cached one)
+    cache_key = compute_cache_key(model, {"prompt": bg['prompt']}) if cache else None
+    cached = bool(cache and not force and cache.restore(cache_key, "png", filepath))
+    if cached:
+        print(f"   ♻️  Restored from cache: {filename}")
+    else:
+        image_data = generate_image(client, bg['prompt'], model)
+
+        if not image_data:
+            print(f"   ❌ Failed: {bg['name']}")
+            return {"success": False, "name": bg['name'], "error": "Generation failed"}
+
+        with open(filepath, 'wb') as f:
+            f.write(image_data)
+        print(f"   ✅ Saved: {filename}")
+        if cache:
+            cache.store(cache_key, filepath, {"model": model, "prompt": bg['prompt']})
+
+    # Save metadata (drafts are throwaway previews: image only)
+    if not draft:
+        meta_path = OUTPUT_DIR / filename.replace('.png', '.json')
+        write_json_atomic(meta_path, {
+            **bg,
+            "filename": filename,
+            "generated_at": timestamp,
+            "model": model,
+            "purpose": "green_screen_background",
+        })
+
+    return {"success": True, "name": bg['name'], "filename": filename, "cached": cached}
 
 
 def main():
     """Generate all A-roll green screen backgrounds"""
+    parser = argparse.ArgumentParser(description="Generate A-roll green screen backgrounds with Imagen")
+    parser.add_argument(
+        "--draft", action="store_true",
+        help=f"Cheaper preview run: {DRAFT_MODEL}, '_draft' filenames, no metadata",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Regenerate images even if an identical prompt is cached (also: FAL_FORCE env var)",
+    )
+    args = parser.parse_args()
+    force = args.force or bool(os.environ.get("FAL_FORCE"))
+
     load_env()
 
     api_key = os.environ.get("GOOGLE_API_KEY")
@@ -257,16 +324,18 @@ def main():
 
     client = genai.Client(api_key=api_key)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results = []
+    backgrounds = collect_prompts()
 
     print(f"\n{'='*60}")
     print("🟩 GEMINI GREEN SCREEN BACKGROUND GENERATOR")
-    print(f"   Backgrounds to generate: {len(AROLL_BACKGROUNDS)}")
+    print(f"   Backgrounds to generate: {len(backgrounds)}")
+    if args.draft:
+        print(f"   Draft mode: {DRAFT_MODEL}, no metadata")
     print(f"   Output: {OUTPUT_DIR}")
     print("="*60)
 
     # Preview
-    for i, bg in enumerate(AROLL_BACKGROUNDS, 1):
+    for i, bg in enumerate(backgrounds, 1):
         print(f"   {i:2d}. [{bg['timecode']}] {bg['name']}")
 
     response = input("\n🤔 Proceed with generation? (yes/no): ").strip().lower()
@@ -274,48 +343,29 @@ def main():
         print("❌ Cancelled by user")
         return
 
-    for i, bg in enumerate(AROLL_BACKGROUNDS, 1):
-        print(f"\n[{i}/{len(AROLL_BACKGROUNDS)}] Generating: {bg['name']}")
-        print(f"   Scene: {bg['scene']} ({bg['timecode']})")
-        print(f"   Prompt: {bg['prompt'][:90]}...")
-
-        image_data = generate_image(client, bg['prompt'])
-
-        if image_data:
-            safe_name = re.sub(r'[^\w\-]', '_', bg['id'].lower())
-            safe_name = re.sub(r'_+', '_', safe_name).strip('_')
-            filename = f"{safe_name}_{timestamp}.png"
-
-            filepath = OUTPUT_DIR / filename
-            with open(filepath, 'wb') as f:
-                f.write(image_data)
-            print(f"   ✅ Saved: {filename}")
-
-            # Save metadata
-            meta_path = OUTPUT_DIR / filename.replace('.png', '.json')
-            with open(meta_path, 'w') as f:
-                json.dump({
-                    **bg,
-                    "filename": filename,
-                    "generated_at": timestamp,
-                    "model": IMAGE_SETTINGS["model"],
-                    "purpose": "green_screen_background",
-                }, f, indent=2)
-
-            results.append({"success": True, "name": bg['name'], "filename": filename})
-        else:
-            print(f"   ❌ Failed")
-            results.append({"success": False, "name": bg['name'], "error": "Generation failed"})
+    # Content-addressed cache of earlier generations, so re-runs only pay for new prompts
+    cache = GenerationCache(OUTPUT_DIR / CACHE_DIR_NAME)
+
+    # Imagen calls are blocking network requests: run several at once on one shared client
+    results: List[Optional[Dict]] = [None] * len(backgrounds)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(backgrounds), MAX_WORKERS))) as executor:
+        futures = {
+            executor.submit(generate_background, bg, i, len(backgrounds), client, timestamp, cache, args.draft, force): i - 1
+            for i, bg in enumerate(backgrounds, 1)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
 
     # ── Summary ──
+    summary = summarize_results(results)
     ok = [r for r in results if r["success"]]
     fail = [r for r in results if not r["success"]]
 
     print(f"\n{'='*60}")
     print("📊 GENERATION SUMMARY")
     print("="*60)
-    print(f"✅ Successful: {len(ok)}/{len(results)}")
-    print(f"❌ Failed:     {len(fail)}/{len(results)}")
+    print(f"✅ Successful: {summary['successful']}/{summary['total']}")
+    print(f"❌ Failed:     {summary['failed']}/{summary['total']}")
 
     if ok:
         print("\n✅ Generated backgrounds:")
@@ -327,13 +377,7 @@ def main():
             print(f"   • {r['name']}")
 
     summary_path = OUTPUT_DIR / f"greenscreen_bg_summary_{timestamp}.json"
-    with open(summary_path, 'w') as f:
-        json.dump({
-            "total": len(results),
-            "successful": len(ok),
-            "failed": len(fail),
-            "results": results,
-        }, f, indent=2)
+    write_json_atomic(summary_path, summary)
 
     print(f"\n💾 Summary: {summary_path}")
     print("✅ Done!")
@@ -14,6 +14,8 @@ from typing import Dict, List
 
 try:
     import yaml
+    # Use the libyaml C parser when PyYAML was built with it
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ImportError:
     yaml = None
     print("⚠️  PyYAML not installed. YAML support disabled. Run: pip install PyYAML")
@@ -65,7 +67,7 @@ def load_config(config_path: Path) -> Dict:
                 if yaml is None:
                     print("❌ Cannot load YAML file. PyYAML not installed.")
                     return {}
-                result = yaml.safe_load(f)
+                result = yaml.load(f, Loader=YamlLoader)
                 return result if result is not None else {}
             else:
                 # Unknown format, try JSON as default
@@ -4,12 +4,29 @@ Asset Utilities
 Common utilities for asset generation including file naming and manifest tracking
 """
 
+import functools
+import importlib.util
+import io
 import json
+import os
 import re
+import sys
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
+# Optional fast JSON encoder (falls back to the standard library)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Process umask, read once at import so atomic writes get the same permissions as open()
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 # Optional imports for SVG to JPEG conversion
 try:
     import cairosvg
@@ -20,6 +37,9 @@ except (ImportError, OSError):
     SVG_CONVERSION_AVAILABLE = False
 
 
+# Naming helpers are pure and called with the same few inputs on every run,
+# so results are memoized
+@functools.lru_cache(maxsize=512)
 def clean_description(description: str) -> str:
     """
     Clean a description for use in filenames.
@@ -44,6 +64,7 @@ def clean_description(description: str) -> str:
     return clean
 
 
+@functools.lru_cache(maxsize=512)
 def generate_filename(
     scene_number: int,
     asset_type: str,
@@ -87,6 +108,7 @@ def generate_filename(
     return filename
 
 
+@functools.lru_cache(maxsize=512)
 def extract_scene_number(asset_id: str) -> int:
     """
     Extract scene number from asset ID (e.g., "1.1" -> 1, "4.2" -> 4)
@@ -103,6 +125,88 @@ def extract_scene_number(asset_id: str) -> int:
         return 0
 
 
+def write_json_atomic(path: Path, data: Any) -> Path:
+    """
+    Write data as indented JSON, replacing path atomically.
+    The JSON is written to a temporary file in the same directory and moved into
+    place with os.replace, so readers (and concurrent workers) never see a
+    half-written file. Uses orjson when installed; the json fallback writes
+    the same UTF-8 output (non-ASCII characters are not escaped).
+    
+    Args:
+        path: Destination JSON file
+        data: JSON-serializable data
+        
+    Returns:
+        The destination path
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if ORJSON_AVAILABLE:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with io.TextIOWrapper(f, encoding='utf-8') as text:
+                    json.dump(data, text, indent=2, ensure_ascii=False)
+        os.chmod(tmp_name, 0o666 & ~_UMASK)  # mkstemp creates 0600; match a regular open()
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def _module_available(name: str) -> bool:
+    """Return True if a module is importable, without importing it."""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def preflight(
+    output_dir: Optional[Path] = None,
+    require_yaml: bool = False,
+    key_names: Tuple[str, ...] = ("FAL_KEY", "FAL_API_KEY")
+) -> bool:
+    """
+    Fail fast on missing configuration before any generation work starts.
+    Checks the fal.ai API key, that required packages are importable (without
+    importing them) and that the output directory can be created.
+    
+    Args:
+        output_dir: Output directory to create (skipped if None)
+        require_yaml: Also require PyYAML (for generators reading YAML queues)
+        key_names: Environment variables accepted as the fal.ai API key
+                  (pass only the ones the caller actually reads)
+        
+    Returns:
+        True if every check passed, False otherwise (problems are printed)
+    """
+    problems = []
+    if not any(os.environ.get(name) for name in key_names):
+        problems.append(f"{' or '.join(key_names)} environment variable not set")
+    if not _module_available("fal_client"):
+        problems.append("fal_client not installed. Run: pip install fal-client")
+    if require_yaml and not _module_available("yaml"):
+        problems.append("PyYAML not installed. Run: pip install PyYAML")
+    if output_dir is not None:
+        try:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            problems.append(f"Cannot create output directory {output_dir}: {e}")
+    
+    for problem in problems:
+        print(f"❌ Preflight: {problem}")
+    return not problems
+
+
 class ManifestTracker:
     """
     Tracks all generated assets and creates a unified manifest.json
@@ -127,7 +231,8 @@ class ManifestTracker:
         asset_id: str,
         result_url: Optional[str] = None,
         local_path: Optional[str] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        timestamp: Optional[str] = None
     ):
         """
         Add an asset to the manifest
@@ -140,8 +245,10 @@ class ManifestTracker:
             result_url: URL of the generated asset (if available)
             local_path: Local path where the asset is saved
             metadata: Additional metadata to store
+            timestamp: ISO timestamp already taken by the caller (default: now)
         """
-        timestamp = datetime.now().isoformat()
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
         
         asset_entry = {
             "filename": filename,
@@ -178,8 +285,7 @@ class ManifestTracker:
             "assets": self.assets
         }
         
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest_data, f, indent=2)
+        write_json_atomic(manifest_path, manifest_data)
         
         print(f"\n📋 Manifest saved: {manifest_path}")
         print(f"   Total assets tracked: {len(self.assets)}")
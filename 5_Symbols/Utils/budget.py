@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Budget Utilities
+Spend tracking shared by generators that run paid requests from several
+worker threads against one per-run budget.
+"""
+
+import threading
+
+
+class BudgetTracker:
+    """Thread-safe spend tracker: cost is reserved before a request and released if it fails"""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.spent = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float) -> bool:
+        """Reserve cost against the budget; False if it would exceed the limit"""
+        with self._lock:
+            if self.spent + cost > self.limit:
+                return False
+            self.spent += cost
+            return True
+
+    def release(self, cost: float) -> None:
+        """Give back a reservation for a request that did not produce an image"""
+        with self._lock:
+            self.spent -= cost
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Environment Utilities
+.env loading shared by the generators: python-dotenv when installed,
+otherwise a single regex scan of simple KEY=value lines.
+"""
+
+import functools
+import os
+import re
+from pathlib import Path
+
+# .env loading (optional: a regex fallback parses simple KEY=value lines)
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
+# 5_Symbols/.env, shared by every generator
+ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+
+_ENV_LINE_RE = re.compile(r'^\s*(?:export\s+)?([A-Za-z_]\w*)\s*=\s*["\']?([^"\'\n]*)["\']?\s*$', re.M)
+
+
+@functools.lru_cache(maxsize=None)
+def load_env(env_path: Path = ENV_PATH) -> None:
+    """
+    Load environment variables from a .env file, once per path per process.
+    Variables already set in the environment win over the file.
+
+    Args:
+        env_path: .env file to load (default: 5_Symbols/.env)
+    """
+    if load_dotenv:
+        load_dotenv(env_path, override=False)
+    elif env_path.exists():
+        # One scan of the whole file instead of a split/strip per line
+        for key, value in _ENV_LINE_RE.findall(env_path.read_text()):
+            os.environ.setdefault(key, value)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+fal.ai Request Utilities
+Resumable fal.ai calls: each request is submitted to the queue and its
+request_id is written to a JSON sidecar before waiting for the result. If the
+script crashes or the connection drops mid-wait, the next run picks the billed
+request back up by id instead of paying for it a second time.
+Identical seeded requests can also be answered from a result memo (in memory,
+then on disk) without calling fal.ai at all.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import fal_client
+
+try:
+    from Utils.asset_utils import write_json_atomic
+    from Utils.generation_cache import compute_cache_key
+    from Utils.log_utils import get_logger
+    from Utils.rate_limit import call_with_retry
+except ImportError:
+    from asset_utils import write_json_atomic
+    from generation_cache import compute_cache_key
+    from log_utils import get_logger
+    from rate_limit import call_with_retry
+
+log = get_logger(__name__)
+
+# Sidecar file (inside a generator's output directory) listing in-flight requests
+PENDING_FILENAME = "pending_requests.json"
+
+# Resume responses meaning fal.ai no longer knows the request id. Anything else
+# (429/408 included) keeps the id, so a retry resumes instead of paying twice.
+REQUEST_GONE_STATUSES = frozenset({404, 410})
+
+
+class PendingRequests:
+    """Thread-safe JSON sidecar mapping request keys to submitted fal.ai request ids"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries: Dict[str, Dict[str, str]] = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Request id submitted for key, if it has not completed yet"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry["request_id"] if entry else None
+
+    def add(self, key: str, request_id: str, model: str) -> None:
+        """Record a submitted request (persisted before its result is awaited)"""
+        with self._lock:
+            self._entries[key] = {
+                "request_id": request_id,
+                "model": model,
+                "submitted_at": datetime.now().isoformat(),
+            }
+            self._save()
+
+    def discard(self, key: str) -> None:
+        """Forget a request once its result has been received"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        if self._entries:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, self._entries)
+        else:
+            self.path.unlink(missing_ok=True)
+
+
+class ResultMemo:
+    """
+    Results of identical seeded requests: an in-memory dict in front of one
+    {key}.result.json file per request in a cache directory. Concurrent callers
+    with the same request wait for the first one instead of paying twice.
+    Results hold fal CDN URLs, so a caller whose download fails calls
+    discard_url() and the next identical request is generated again.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self._results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._keys_by_url: Dict[str, Set[str]] = {}
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Lock serializing work on one request key"""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Optional[Any]:
+        """Memoized result for key (memory first, then disk), or None"""
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+        try:
+            with open(self.cache_dir / f"{key}.result.json", 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: Any) -> None:
+        """Remember a result in memory and on disk (disk failures only log)"""
+        with self._lock:
+            self._remember(key, result)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.cache_dir / f"{key}.result.json", result)
+        except (OSError, TypeError) as e:
+            log.warning("⚠️  Warning: Failed to cache result: %s", e)
+
+    def discard_url(self, url: str) -> None:
+        """Forget every memoized result that returned url (e.g. it no longer downloads)"""
+        with self._lock:
+            keys = self._keys_by_url.pop(url, set())
+            for key in keys:
+                self._results.pop(key, None)
+        for key in keys:
+            (self.cache_dir / f"{key}.result.json").unlink(missing_ok=True)
+
+    def _remember(self, key: str, result: Any) -> None:
+        # Caller holds self._lock
+        self._results[key] = result
+        images = result.get("images") if isinstance(result, dict) else None
+        for image in images or ():
+            if isinstance(image, dict) and image.get("url"):
+                self._keys_by_url.setdefault(image["url"], set()).add(key)
+
+
+def subscribe_resumable(
+    model: str,
+    arguments: Dict[str, Any],
+    pending: Optional[PendingRequests] = None,
+    memo: Optional[ResultMemo] = None
+) -> Any:
+    """
+    fal_client.subscribe that survives crashes and dropped connections.
+    With a PendingRequests sidecar, a request left over from an earlier run
+    (same model and arguments) is resumed by its request_id; otherwise the
+    request is submitted and its id recorded before the result is awaited.
+    With a ResultMemo, a seeded request that already completed is answered
+    from the memo (unseeded requests always go to fal.ai).
+
+    Args:
+        model: fal.ai model/application id
+        arguments: Model arguments
+        pending: Sidecar of in-flight requests (None: not persisted)
+        memo: Memo of completed seeded requests (None: no memoization)
+
+    Returns:
+        The model's result payload
+    """
+    if memo is None or arguments.get("seed") is None:
+        return _subscribe_pending(model, arguments, pending)
+
+    key = compute_cache_key(model, arguments)
+    with memo.key_lock(key):
+        result = memo.get(key)
+        if result is not None:
+            log.info("   ♻️  Reusing result of an identical request")
+            return result
+        result = _subscribe_pending(model, arguments, pending)
+        if result:
+            memo.put(key, result)
+        return result
+
+
+def fal_generate(
+    model: str,
+    arguments: Dict[str, Any],
+    pending: Optional[PendingRequests] = None,
+    memo: Optional[ResultMemo] = None,
+    limiter: Optional[Any] = None
+) -> Optional[str]:
+    """
+    Run an image request through subscribe_resumable and return the first
+    image's URL, the one fal.ai call shared by the image generators.
+    With a limiter the call is throttled and transient failures are retried;
+    a 429 pauses the limiter for every worker sharing it. Errors that remain
+    propagate so callers can report (or budget) them.
+
+    Args:
+        model: fal.ai model/application id
+        arguments: Model arguments
+        pending: Sidecar of in-flight requests (None: not persisted)
+        memo: Memo of completed seeded requests (None: no memoization)
+        limiter: Shared RateLimiter (None: unthrottled, no retries)
+
+    Returns:
+        URL of the first generated image, or None if none was returned
+    """
+    if limiter is not None:
+        result = call_with_retry(subscribe_resumable, model, arguments, pending, memo, limiter=limiter)
+    else:
+        result = subscribe_resumable(model, arguments, pending, memo)
+    images = result.get("images") if isinstance(result, dict) else None
+    if not images:
+        log.warning("   ⚠️  %s returned no images", model)
+        return None
+    return images[0]["url"]
+
+
+def _subscribe_pending(model: str, arguments: Dict[str, Any], pending: Optional[PendingRequests]) -> Any:
+    """Submit (or resume) a request, tracking its id in the pending sidecar"""
+    if pending is None:
+        return fal_client.subscribe(model, arguments=arguments)
+
+    key = compute_cache_key(model, arguments)
+    request_id = pending.get(key)
+    if request_id:
+        log.info("   ↻ Resuming fal.ai request %s", request_id)
+        try:
+            result = fal_client.sync_client.get_handle(model, request_id).get()
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            if status not in REQUEST_GONE_STATUSES:
+                raise  # still billed and maybe running: keep the id for a retry or the next run
+            # Unknown or expired request: fall through and submit a new one
+            log.warning("   ⚠️  Request %s can't be resumed (%s); resubmitting", request_id, status)
+            pending.discard(key)
+        else:
+            pending.discard(key)
+            return result
+
+    handle = fal_client.submit(model, arguments=arguments)
+    pending.add(key, handle.request_id, model)
+    result = handle.get()
+    pending.discard(key)
+    return result
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Gemini (Imagen) Utilities
+Code shared by the Gemini generators: the paced and retried Imagen request
+and the summary written at the end of a batch. Both scripts
+(or an orchestrator running them together) import one copy of this module,
+so they also share its Imagen rate limiter.
+"""
+
+from typing import Any, Dict, List, Optional
+
+# google-genai is only needed to build the request config
+try:
+    from google.genai import types
+except ImportError:
+    types = None
+
+try:
+    from Utils.log_utils import get_logger
+    from Utils.rate_limit import call_with_retry, get_imagen_rate_limiter
+except ImportError:
+    from log_utils import get_logger
+    from rate_limit import call_with_retry, get_imagen_rate_limiter
+
+log = get_logger(__name__)
+
+# Default Imagen model for the Gemini generators
+IMAGEN_MODEL = "imagen-4.0-generate-001"
+
+# Cheaper, faster variant for --draft runs that only check a prompt's concept
+DRAFT_MODEL = "imagen-4.0-fast-generate-001"
+
+
+def generate_image(client, prompt: str, model: str = IMAGEN_MODEL) -> Optional[bytes]:
+    """
+    Generate one image with Imagen. Requests are paced to the shared per-minute
+    Imagen quota and 429/5xx responses are retried with backoff.
+
+    Args:
+        client: google-genai Client (one instance shared by all workers)
+        prompt: Image prompt
+        model: Imagen model id
+
+    Returns:
+        PNG bytes of the generated image, or None if generation failed
+    """
+    try:
+        response = call_with_retry(
+            client.models.generate_images,
+            limiter=get_imagen_rate_limiter(),
+            model=model,
+            prompt=prompt,
+            config=types.GenerateImagesConfig(number_of_images=1),
+        )
+    except Exception as e:
+        log.error("   ❌ Generation error: %s", e)
+        return None
+    if response.generated_images:
+        return response.generated_images[0].image.image_bytes
+    return None
+
+
+def summarize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run summary saved next to a batch's images.
+
+    Args:
+        results: Per-item result dicts, each with a "success" flag
+
+    Returns:
+        Dict with total/successful/failed counts and the results themselves
+    """
+    successful = sum(1 for r in results if r["success"])
+    return {
+        "total": len(results),
+        "successful": successful,
+        "failed": len(results) - successful,
+        "results": results,
+    }
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Generation Cache
+Content-addressed on-disk cache for generated assets.
+The same model + arguments (prompt, seed, size, ...) deterministically produces
+the same output, so a repeated seeded request is served from disk instead of
+paying fal.ai again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from Utils.asset_utils import write_json_atomic
+    from Utils.log_utils import get_logger
+except ImportError:
+    from asset_utils import write_json_atomic
+    from log_utils import get_logger
+
+log = get_logger(__name__)
+
+# Cache directory name (created inside each generator's output directory)
+CACHE_DIR_NAME = ".cache"
+
+
+def compute_cache_key(model: str, arguments: Dict[str, Any]) -> str:
+    """
+    Compute a stable cache key for a generation request.
+
+    Args:
+        model: Model identifier (e.g., "fal-ai/flux/schnell")
+        arguments: The full arguments dict sent to the model (prompt, seed, size, ...)
+
+    Returns:
+        SHA-256 hex digest identifying the request
+    """
+    payload = {"m": model, "a": arguments}
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Hardlink src to dst, falling back to a copy (e.g., across filesystems).
+    Any existing file at dst is removed first so the link never aliases stale data.
+    """
+    dst = Path(dst)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class GenerationCache:
+    """
+    Stores generated assets as {key}.{extension} plus a {key}.json metadata
+    record inside a cache directory.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding cached assets (created on first store)
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def lookup(self, key: str, extension: str) -> Optional[Path]:
+        """Return the cached asset path for key, or None on a miss."""
+        path = self.cache_dir / f"{key}.{extension}"
+        return path if path.is_file() else None
+
+    def load_metadata(self, key: str) -> Dict:
+        """Return the metadata stored alongside a cached asset (empty if missing)."""
+        meta_path = self.cache_dir / f"{key}.json"
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def store(self, key: str, asset_path: Path, metadata: Optional[Dict] = None) -> Optional[Path]:
+        """
+        Add a generated asset to the cache.
+
+        Args:
+            key: Cache key from compute_cache_key()
+            asset_path: Path to the final (post-processed) asset
+            metadata: Optional metadata to keep with the asset
+
+        Returns:
+            Path of the cached asset, or None if caching failed
+        """
+        asset_path = Path(asset_path)
+        extension = asset_path.suffix.lstrip('.')
+        cached_path = self.cache_dir / f"{key}.{extension}"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            link_or_copy(asset_path, cached_path)
+            if metadata is not None:
+                write_json_atomic(self.cache_dir / f"{key}.json", metadata)
+            return cached_path
+        except OSError as e:
+            log.warning("⚠️  Warning: Failed to cache asset: %s", e)
+            return None
+
+    def restore(self, key: str, extension: str, dst: Path) -> bool:
+        """
+        Materialize a cached asset at dst.
+
+        Returns:
+            True if the asset was restored, False on a cache miss
+        """
+        cached_path = self.lookup(key, extension)
+        if cached_path is None:
+            return False
+        link_or_copy(cached_path, dst)
+        return True
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+HTTP Utilities
+Shared, pooled HTTP client for downloading generated assets.
+A single client keeps TLS connections to the fal.ai CDN alive across downloads
+(and negotiates HTTP/2 when the optional h2 package is installed), instead of
+opening a fresh connection for every file as urlretrieve does.
+"""
+
+import os
+import shutil
+import socket
+import threading
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Optional, Union
+
+# httpx ships with fal-client; fall back to urllib when it is missing
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = HTTPX_AVAILABLE
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Upper bound on pooled connections shared by all worker threads
+MAX_CONNECTIONS = 16
+DOWNLOAD_TIMEOUT = 120.0
+# 1 MiB reads: a 1-3 MB PNG is written in a handful of syscalls
+CHUNK_SIZE = 1 << 20
+# Retries for failed connection attempts (requests that reached the server are not retried)
+CONNECT_RETRIES = 3
+
+_client: Optional["httpx.Client"] = None
+_client_lock = threading.Lock()
+
+# fal.ai API and CDN hosts every run talks to
+FAL_HOSTS = ("queue.fal.run", "fal.run", "fal.media", "v3.fal.media")
+
+# Sidecar suffix holding the ETag of a conditionally downloaded file
+ETAG_SUFFIX = ".etag"
+
+# Per-thread read buffer reused across downloads
+_buffers = threading.local()
+
+
+def get_http_client() -> "httpx.Client":
+    """
+    Get the process-wide pooled HTTP client (created on first use).
+
+    Returns:
+        Thread-safe httpx.Client shared by all downloads
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            transport = httpx.HTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+                retries=CONNECT_RETRIES,
+            )
+            _client = httpx.Client(
+                transport=transport,
+                timeout=DOWNLOAD_TIMEOUT,
+                follow_redirects=True,
+            )
+        return _client
+
+
+def download_file(url: str, dest: Union[str, Path], conditional: bool = False) -> Path:
+    """
+    Stream a URL to a local file over the shared connection pool.
+    With conditional=True the response ETag is kept in a "<dest>.etag" sidecar,
+    and later downloads to the same path send If-None-Match. A 304 Not Modified
+    reply keeps the existing file without transferring the body again.
+
+    Args:
+        url: URL to download
+        dest: Destination file path
+        conditional: Revalidate an existing dest with its stored ETag
+
+    Returns:
+        Path of the written (or still current) file
+    """
+    dest = Path(dest)
+    if url.startswith("file:") or not HTTPX_AVAILABLE:
+        fd = _open_dest(dest)
+        try:
+            if url.startswith("file:"):
+                _copy_local(url, fd)
+            else:
+                _copy_urllib(url, fd)
+        finally:
+            os.close(fd)
+        return dest
+
+    etag_path = dest.with_name(dest.name + ETAG_SUFFIX)
+    headers = {}
+    if conditional and dest.exists():
+        try:
+            headers["If-None-Match"] = etag_path.read_text(encoding='utf-8').strip()
+        except OSError:
+            pass
+
+    with get_http_client().stream("GET", url, headers=headers) as response:
+        if response.status_code == 304:
+            return dest
+        response.raise_for_status()
+        if conditional:
+            # Write a fresh inode: dest may be a hardlink into a result cache
+            dest.unlink(missing_ok=True)
+        fd = _open_dest(dest)
+        try:
+            for chunk in response.iter_bytes(CHUNK_SIZE):
+                _write_all(fd, chunk)
+        finally:
+            os.close(fd)
+        etag = response.headers.get("ETag")
+
+    if conditional:
+        if etag:
+            etag_path.write_text(etag, encoding='utf-8')
+        else:
+            etag_path.unlink(missing_ok=True)
+    return dest
+
+
+def fetch_bytes(url: str) -> bytes:
+    """
+    Download a URL into memory over the shared connection pool.
+    For callers that decode the image anyway: the bytes can be written to disk
+    and handed to Pillow without reading the file back.
+
+    Args:
+        url: URL to download
+
+    Returns:
+        The response body
+    """
+    if HTTPX_AVAILABLE and not url.startswith("file:"):
+        response = get_http_client().get(url)
+        response.raise_for_status()
+        return response.content
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def _open_dest(dest: Path) -> int:
+    """Open dest for writing (created or truncated), binary mode on every platform"""
+    return os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+
+
+def _write_all(fd: int, data) -> None:
+    """os.write until every byte is written (it may write less than asked)"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _copy_local(url: str, fd: int) -> None:
+    """file:// URLs (dev/testing): kernel-side sendfile copy, no user-space buffers"""
+    src_path = urllib.request.url2pathname(urllib.parse.urlparse(url).path)
+    with open(src_path, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        try:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fd, src.fileno(), offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile for this platform/file pair: plain copy with 1 MiB reads
+            src.seek(0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            with open(fd, 'wb', closefd=False) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def _copy_urllib(url: str, fd: int) -> None:
+    """Fallback download: readinto a reused buffer instead of urlretrieve's 8 KiB copies"""
+    buf = getattr(_buffers, "buf", None)
+    if buf is None:
+        buf = _buffers.buf = bytearray(CHUNK_SIZE)
+    view = memoryview(buf)
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        while True:
+            n = response.readinto(buf)
+            if not n:
+                break
+            _write_all(fd, view[:n])
+
+
+def close_http_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def prewarm_dns(hosts=FAL_HOSTS, port: int = 443) -> threading.Thread:
+    """
+    Resolve hosts in the background so the first requests don't wait on DNS.
+    Best effort: lookup failures are ignored (the real request reports them).
+
+    Args:
+        hosts: Host names to resolve
+        port: Port passed to getaddrinfo
+
+    Returns:
+        The started daemon thread (join it to wait for the lookups)
+    """
+    def resolve():
+        for host in hosts:
+            try:
+                socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=resolve, name="dns-prewarm", daemon=True)
+    thread.start()
+    return thread
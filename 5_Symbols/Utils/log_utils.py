@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Logging Utilities
+Buffered console logging for generators that process assets concurrently.
+Records are handed to a QueueHandler and written by a single background
+QueueListener, so worker threads never contend on sys.stdout and lines from
+parallel assets are not interleaved mid-line.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Root logger name for all generator output
+LOGGER_NAME = "falai"
+
+_listener: Optional[QueueListener] = None
+_listener_started = False
+_listener_lock = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    """Install the QueueHandler/QueueListener pair once per process."""
+    global _listener, _listener_started
+    with _listener_lock:
+        if _listener is not None:
+            return
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler(sys.stdout)
+        # Messages already carry their own emoji/indentation, so emit them verbatim
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        root = logging.getLogger(LOGGER_NAME)
+        root.setLevel(logging.INFO)
+        root.addHandler(QueueHandler(log_queue))
+        root.propagate = False
+
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        _listener_started = True
+        atexit.register(flush_logs)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger whose records are written by the shared background listener.
+
+    Args:
+        name: Logger name (usually __name__)
+
+    Returns:
+        Logger under the "falai" hierarchy
+    """
+    _ensure_listener()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def flush_logs() -> None:
+    """
+    Write out every queued record before returning.
+    Call this before interactive input() prompts so they appear after the log lines.
+    """
+    with _listener_lock:
+        if not _listener_started:
+            return
+        # stop() drains the queue and joins the writer thread; restart it for later records
+        _listener.stop()
+        _listener.start()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Utilities
+Thread-safe token bucket that spaces fal.ai requests to the plan's
+requests-per-second limit, so parallel batches wait for a token instead of
+hitting the provider cap and failing, plus a jittered backoff retry for the
+transient 429/5xx responses that still get through. A 429 pauses the shared
+bucket for every worker, not just the one that was rejected.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+# Default fal.ai request rate (override with FAL_MAX_RPS for your plan)
+DEFAULT_MAX_RPS = 10.0
+
+# Default Imagen (Gemini API) requests per minute (override with IMAGEN_QPM for your quota)
+DEFAULT_IMAGEN_QPM = 20.0
+
+# HTTP statuses worth retrying: timeouts, rate limiting and server-side errors
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 5
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+class RateLimiter:
+    """Token bucket allowing max_rate requests per time_period seconds"""
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError("max_rate and time_period must be positive")
+        self.max_rate = float(max_rate)
+        self.time_period = float(time_period)
+        self._tokens = self.max_rate
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        rate = self.max_rate / self.time_period
+        self._tokens = min(self.max_rate, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) * self.time_period / self.max_rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold every acquire for seconds (e.g. a 429's Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_fal_limiter: Optional[RateLimiter] = None
+_fal_limiter_lock = threading.Lock()
+
+
+def get_fal_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide limiter shared by every fal.ai request.
+
+    Returns:
+        RateLimiter sized from FAL_MAX_RPS (default: DEFAULT_MAX_RPS per second)
+    """
+    global _fal_limiter
+    with _fal_limiter_lock:
+        if _fal_limiter is None:
+            try:
+                max_rps = float(os.environ.get("FAL_MAX_RPS", DEFAULT_MAX_RPS))
+            except ValueError:
+                max_rps = DEFAULT_MAX_RPS
+            _fal_limiter = RateLimiter(max_rps if max_rps > 0 else DEFAULT_MAX_RPS)
+        return _fal_limiter
+
+
+_imagen_limiter: Optional[RateLimiter] = None
+
+
+def get_imagen_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide limiter shared by every Imagen request.
+
+    Returns:
+        RateLimiter allowing IMAGEN_QPM requests per minute (default: DEFAULT_IMAGEN_QPM)
+    """
+    global _imagen_limiter
+    with _fal_limiter_lock:
+        if _imagen_limiter is None:
+            try:
+                qpm = float(os.environ.get("IMAGEN_QPM", DEFAULT_IMAGEN_QPM))
+            except ValueError:
+                qpm = DEFAULT_IMAGEN_QPM
+            _imagen_limiter = RateLimiter(qpm if qpm > 0 else DEFAULT_IMAGEN_QPM, time_period=60.0)
+        return _imagen_limiter
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of a fal_client/httpx/google-genai error, if it carries one"""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(exc, "code", None)  # google.genai.errors.APIError
+    return status if isinstance(status, int) else None
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for rate limiting, 5xx responses and dropped connections/timeouts"""
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    return isinstance(exc, (ConnectionError, TimeoutError)) or \
+        type(exc).__name__ in ("ConnectError", "ReadError", "RemoteProtocolError",
+                               "ConnectTimeout", "ReadTimeout", "PoolTimeout")
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header, if the error has one"""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retry(
+    func: Callable[..., Any],
+    *args,
+    attempts: int = RETRY_ATTEMPTS,
+    initial_delay: float = RETRY_INITIAL_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+    limiter: Optional[RateLimiter] = None,
+    **kwargs
+) -> Any:
+    """
+    Call func, retrying transient failures with exponential backoff and full jitter.
+    Each attempt first takes a token from limiter (the shared fal.ai limiter by
+    default), so retries from parallel workers don't arrive as one burst; a 429
+    pauses that limiter for the backoff (or Retry-After) delay.
+    
+    Args:
+        func: Callable to invoke (e.g. fal_client.subscribe)
+        *args: Positional arguments for func
+        attempts: Maximum number of calls
+        initial_delay: Backoff ceiling for the first retry, in seconds
+        max_delay: Upper bound on any single wait, in seconds
+        limiter: RateLimiter to acquire before each call
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        The return value of func
+        
+    Raises:
+        The last exception when it is not transient or attempts are exhausted
+    """
+    limiter = limiter or get_fal_rate_limiter()
+    for attempt in range(attempts):
+        limiter.acquire()
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            if attempt + 1 >= attempts or not is_transient_error(exc):
+                raise
+            delay = random.uniform(0, min(max_delay, initial_delay * (2 ** attempt)))
+            retry_after = _retry_after(exc)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, max_delay))
+            if _status_code(exc) == 429:
+                # Rate limited: the other workers sharing the limiter back off too
+                limiter.pause(delay)
+            time.sleep(delay)
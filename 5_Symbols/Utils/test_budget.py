@@ -0,0 +1,39 @@
+"""
+Unit tests for the shared spend tracker in budget
+"""
+import threading
+import unittest
+
+from Utils.budget import BudgetTracker
+
+
+class TestBudgetTracker(unittest.TestCase):
+    def test_reservations_stop_at_the_limit_and_release_frees_them(self):
+        budget = BudgetTracker(0.10)
+        self.assertTrue(budget.reserve(0.04))
+        self.assertTrue(budget.reserve(0.04))
+        self.assertFalse(budget.reserve(0.04))
+        budget.release(0.04)
+        self.assertTrue(budget.reserve(0.04))
+        self.assertAlmostEqual(budget.spent, 0.08)
+
+    def test_concurrent_reservations_never_overspend(self):
+        budget = BudgetTracker(1.0)
+        granted = []
+
+        def worker():
+            for _ in range(50):
+                if budget.reserve(0.01):
+                    granted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertLessEqual(len(granted), 100)
+        self.assertLessEqual(budget.spent, 1.0 + 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+Unit tests for the shared .env loader in env_utils
+"""
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from Utils import env_utils
+from Utils.env_utils import load_env
+
+
+class TestLoadEnv(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env_path = Path(self.tmp.name) / ".env"
+        self.env_path.write_text('ENV_UTILS_TEST_NEW="from file"\nENV_UTILS_TEST_SET=from file\n')
+        load_env.cache_clear()
+        self.addCleanup(load_env.cache_clear)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fallback_parser_keeps_existing_variables(self):
+        with patch.object(env_utils, "load_dotenv", None), \
+                patch.dict(os.environ, {"ENV_UTILS_TEST_SET": "already set"}):
+            load_env(self.env_path)
+            self.assertEqual(os.environ["ENV_UTILS_TEST_NEW"], "from file")
+            self.assertEqual(os.environ["ENV_UTILS_TEST_SET"], "already set")
+
+    def test_file_is_loaded_once_per_path(self):
+        with patch.object(env_utils, "load_dotenv") as mock_load:
+            load_env(self.env_path)
+            load_env(self.env_path)
+        mock_load.assert_called_once_with(self.env_path, override=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Unit tests for resumable fal.ai requests in fal_utils
+"""
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import fal_utils
+from fal_utils import PendingRequests, ResultMemo, fal_generate, subscribe_resumable
+
+MODEL = "fal-ai/flux/schnell"
+ARGS = {"prompt": "a lighthouse", "seed": 42}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestSubscribeResumable(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "pending_requests.json"
+        self.fal = patch.object(fal_utils, "fal_client").start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_request_id_is_persisted_before_waiting(self):
+        pending = PendingRequests(self.path)
+        handle = self.fal.submit.return_value
+        handle.request_id = "req-1"
+
+        def get():
+            # The id is on disk while the result is awaited
+            saved = json.loads(self.path.read_text())
+            self.assertEqual([e["request_id"] for e in saved.values()], ["req-1"])
+            return {"images": [{"url": "https://fal.media/a.png"}]}
+
+        handle.get.side_effect = get
+        result = subscribe_resumable(MODEL, ARGS, pending)
+        self.assertEqual(result["images"][0]["url"], "https://fal.media/a.png")
+        self.assertFalse(self.path.exists())  # cleared once the result arrived
+
+    def test_interrupted_request_is_resumed_not_resubmitted(self):
+        handle = self.fal.submit.return_value
+        handle.request_id = "req-2"
+        handle.get.side_effect = ConnectionError("dropped")
+        with self.assertRaises(ConnectionError):
+            subscribe_resumable(MODEL, ARGS, PendingRequests(self.path))
+
+        # Next run: same request picks the billed id back up
+        self.fal.submit.reset_mock()
+        resumed = self.fal.sync_client.get_handle.return_value
+        resumed.get.return_value = {"images": [{"url": "https://fal.media/b.png"}]}
+        result = subscribe_resumable(MODEL, ARGS, PendingRequests(self.path))
+        self.fal.sync_client.get_handle.assert_called_once_with(MODEL, "req-2")
+        self.fal.submit.assert_not_called()
+        self.assertEqual(result["images"][0]["url"], "https://fal.media/b.png")
+        self.assertFalse(self.path.exists())
+
+    def test_expired_request_is_resubmitted(self):
+        pending = PendingRequests(self.path)
+        pending.add(fal_utils.compute_cache_key(MODEL, ARGS), "gone", MODEL)
+        self.fal.sync_client.get_handle.return_value.get.side_effect = _HTTPError(404)
+        handle = self.fal.submit.return_value
+        handle.request_id = "req-3"
+        handle.get.return_value = {"images": []}
+        subscribe_resumable(MODEL, ARGS, pending)
+        self.fal.submit.assert_called_once()
+        self.assertEqual(len(pending), 0)
+
+    def test_resume_network_error_keeps_the_id(self):
+        pending = PendingRequests(self.path)
+        pending.add(fal_utils.compute_cache_key(MODEL, ARGS), "req-4", MODEL)
+        self.fal.sync_client.get_handle.return_value.get.side_effect = _HTTPError(503)
+        with self.assertRaises(_HTTPError):
+            subscribe_resumable(MODEL, ARGS, pending)
+        self.fal.submit.assert_not_called()
+        self.assertEqual(PendingRequests(self.path).get(fal_utils.compute_cache_key(MODEL, ARGS)), "req-4")
+
+    def test_rate_limited_resume_keeps_the_id(self):
+        """429/408 on resume are transient: no resubmission, the id stays for the retry"""
+        key = fal_utils.compute_cache_key(MODEL, ARGS)
+        for status in (429, 408):
+            pending = PendingRequests(self.path)
+            pending.add(key, "req-5", MODEL)
+            self.fal.sync_client.get_handle.return_value.get.side_effect = _HTTPError(status)
+            with self.assertRaises(_HTTPError):
+                subscribe_resumable(MODEL, ARGS, pending)
+            self.fal.submit.assert_not_called()
+            self.assertEqual(PendingRequests(self.path).get(key), "req-5")
+
+    def test_without_sidecar_plain_subscribe_is_used(self):
+        subscribe_resumable(MODEL, ARGS)
+        self.fal.subscribe.assert_called_once_with(MODEL, arguments=ARGS)
+        self.fal.submit.assert_not_called()
+
+
+
+class TestFalGenerate(unittest.TestCase):
+    def setUp(self):
+        self.fal = patch.object(fal_utils, "fal_client").start()
+        self.addCleanup(patch.stopall)
+
+    def test_returns_first_image_url_after_acquiring_the_limiter(self):
+        self.fal.subscribe.return_value = {"images": [{"url": "https://fal.media/a.png"}, {"url": "x"}]}
+        limiter = MagicMock()
+        self.assertEqual(fal_generate(MODEL, ARGS, limiter=limiter), "https://fal.media/a.png")
+        limiter.acquire.assert_called_once_with()
+
+    def test_rate_limited_call_is_retried_and_pauses_the_limiter(self):
+        self.fal.subscribe.side_effect = [_HTTPError(429), {"images": [{"url": "https://fal.media/b.png"}]}]
+        limiter = MagicMock()
+        with patch("rate_limit.time.sleep"):
+            self.assertEqual(fal_generate(MODEL, ARGS, limiter=limiter), "https://fal.media/b.png")
+        self.assertEqual(limiter.acquire.call_count, 2)
+        limiter.pause.assert_called_once()
+
+    def test_no_images_returns_none(self):
+        for result in (None, {}, {"images": []}):
+            self.fal.subscribe.return_value = result
+            self.assertIsNone(fal_generate(MODEL, ARGS))
+
+    def test_request_errors_propagate(self):
+        self.fal.subscribe.side_effect = _HTTPError(500)
+        with self.assertRaises(_HTTPError):
+            fal_generate(MODEL, ARGS)
+
+
+class TestResultMemo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name) / ".cache"
+        self.fal = patch.object(fal_utils, "fal_client").start()
+        self.fal.subscribe.return_value = {"images": [{"url": "https://fal.media/c.png"}]}
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_seeded_request_is_paid_once(self):
+        memo = ResultMemo(self.cache_dir)
+        first = subscribe_resumable(MODEL, ARGS, memo=memo)
+        second = subscribe_resumable(MODEL, dict(ARGS), memo=memo)
+        self.assertEqual(first, second)
+        self.assertEqual(self.fal.subscribe.call_count, 1)
+
+    def test_memo_survives_a_rerun(self):
+        subscribe_resumable(MODEL, ARGS, memo=ResultMemo(self.cache_dir))
+        result = subscribe_resumable(MODEL, ARGS, memo=ResultMemo(self.cache_dir))
+        self.assertEqual(result["images"][0]["url"], "https://fal.media/c.png")
+        self.assertEqual(self.fal.subscribe.call_count, 1)
+
+    def test_discarded_url_is_generated_again(self):
+        """A memoized URL that stopped downloading is dropped from memory and disk"""
+        memo = ResultMemo(self.cache_dir)
+        subscribe_resumable(MODEL, ARGS, memo=memo)
+        memo.discard_url("https://fal.media/c.png")
+        self.assertEqual(list(self.cache_dir.glob("*.result.json")), [])
+
+        subscribe_resumable(MODEL, ARGS, memo=memo)
+        subscribe_resumable(MODEL, ARGS, memo=ResultMemo(self.cache_dir))
+        self.assertEqual(self.fal.subscribe.call_count, 2)
+
+    def test_unseeded_requests_are_not_memoized(self):
+        memo = ResultMemo(self.cache_dir)
+        unseeded = {"prompt": "a lighthouse"}
+        subscribe_resumable(MODEL, unseeded, memo=memo)
+        subscribe_resumable(MODEL, unseeded, memo=memo)
+        self.assertEqual(self.fal.subscribe.call_count, 2)
+
+    def test_concurrent_duplicates_wait_for_the_first(self):
+        memo = ResultMemo(self.cache_dir)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_subscribe(model, arguments):
+            started.set()
+            release.wait(timeout=5)
+            return {"images": [{"url": "https://fal.media/slow.png"}]}
+
+        self.fal.subscribe.side_effect = slow_subscribe
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(subscribe_resumable(MODEL, ARGS, memo=memo)))
+                   for _ in range(3)]
+        for t in threads:
+            t.start()
+        started.wait(timeout=5)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.fal.subscribe.call_count, 1)
+        self.assertEqual(len(results), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Unit tests for the shared Gemini helpers in gemini_utils
+"""
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+import gemini_utils
+import rate_limit
+from gemini_utils import generate_image, summarize_results
+
+
+class TestGenerateImage(unittest.TestCase):
+    def setUp(self):
+        # google-genai may not be installed: a config factory is all the request needs
+        patch.object(gemini_utils, "types",
+                     types.SimpleNamespace(GenerateImagesConfig=lambda **kwargs: kwargs)).start()
+        patch.object(rate_limit.time, "sleep").start()
+        self.addCleanup(patch.stopall)
+        self.client = MagicMock()
+
+    def test_returns_first_image_bytes(self):
+        image = MagicMock()
+        image.image.image_bytes = b"PNG"
+        self.client.models.generate_images.return_value.generated_images = [image]
+        self.assertEqual(generate_image(self.client, "a prompt", "imagen-test"), b"PNG")
+        self.client.models.generate_images.assert_called_once_with(
+            model="imagen-test", prompt="a prompt", config={"number_of_images": 1})
+
+    def test_empty_response_returns_none(self):
+        self.client.models.generate_images.return_value.generated_images = []
+        self.assertIsNone(generate_image(self.client, "a prompt"))
+
+    def test_failure_returns_none(self):
+        self.client.models.generate_images.side_effect = ValueError("bad prompt")
+        self.assertIsNone(generate_image(self.client, "a prompt"))
+        self.assertEqual(self.client.models.generate_images.call_count, 1)  # not transient: no retry
+
+
+class TestSummarizeResults(unittest.TestCase):
+    def test_counts_successes_and_failures(self):
+        results = [{"success": True}, {"success": False}, {"success": True}]
+        self.assertEqual(summarize_results(results),
+                         {"total": 3, "successful": 2, "failed": 1, "results": results})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Unit tests for the pooled download helper in http_utils
+"""
+import os
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import http_utils
+from http_utils import download_file, fetch_bytes, get_http_client, close_http_client, prewarm_dns
+
+PAYLOAD = b"\x89PNG" + bytes(range(256)) * 1024
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    bodies_sent = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+        type(self).bodies_sent += 1
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipUnless(http_utils.HTTPX_AVAILABLE, "httpx not installed")
+class TestHttpUtils(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/image.png"
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        close_http_client()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_download_writes_the_full_body(self):
+        dest = download_file(self.url, Path(self.tmp.name) / "out.png")
+        self.assertEqual(dest.read_bytes(), PAYLOAD)
+
+    def test_client_is_shared_across_threads(self):
+        clients = []
+
+        def worker(n):
+            clients.append(get_http_client())
+            download_file(self.url, Path(self.tmp.name) / f"out_{n}.png")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(c) for c in clients}), 1)
+        for n in range(4):
+            self.assertEqual((Path(self.tmp.name) / f"out_{n}.png").read_bytes(), PAYLOAD)
+
+    def test_fetch_bytes_returns_the_body(self):
+        self.assertEqual(fetch_bytes(self.url), PAYLOAD)
+
+    def test_conditional_download_revalidates_with_etag(self):
+        dest = Path(self.tmp.name) / "cond.png"
+        download_file(self.url, dest, conditional=True)
+        self.assertEqual(Path(str(dest) + ".etag").read_text(), ETAG)
+        sent = _Handler.bodies_sent
+        download_file(self.url, dest, conditional=True)
+        self.assertEqual(_Handler.bodies_sent, sent)  # 304: no body transferred
+        self.assertEqual(dest.read_bytes(), PAYLOAD)
+
+    def test_conditional_download_does_not_write_through_hardlinks(self):
+        cached = Path(self.tmp.name) / "cached.png"
+        cached.write_bytes(b"old")
+        dest = Path(self.tmp.name) / "linked.png"
+        os.link(cached, dest)
+        download_file(self.url, dest, conditional=True)
+        self.assertEqual(dest.read_bytes(), PAYLOAD)
+        self.assertEqual(cached.read_bytes(), b"old")
+
+    def test_urllib_fallback_writes_the_full_body(self):
+        with unittest.mock.patch.object(http_utils, "HTTPX_AVAILABLE", False):
+            dest = download_file(self.url, Path(self.tmp.name) / "fallback.png")
+            dest_again = download_file(self.url, Path(self.tmp.name) / "fallback_2.png")
+        self.assertEqual(dest.read_bytes(), PAYLOAD)
+        self.assertEqual(dest_again.read_bytes(), PAYLOAD)
+
+
+class TestLocalDownload(unittest.TestCase):
+    def test_file_url_is_copied(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / "src.png"
+            src.write_bytes(PAYLOAD)
+            dest = download_file(src.as_uri(), Path(tmp) / "copy.png")
+            self.assertEqual(dest.read_bytes(), PAYLOAD)
+
+    def test_file_url_without_sendfile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / "src.png"
+            src.write_bytes(PAYLOAD)
+            with unittest.mock.patch.object(http_utils.os, "sendfile", side_effect=OSError("unsupported"),
+                                            create=True):
+                dest = download_file(src.as_uri(), Path(tmp) / "copy.png")
+            self.assertEqual(dest.read_bytes(), PAYLOAD)
+
+
+class TestPrewarmDns(unittest.TestCase):
+    def test_resolves_every_host_and_ignores_failures(self):
+        def fake_getaddrinfo(host, port, **kwargs):
+            if host == "bad.invalid":
+                raise OSError("no such host")
+            return []
+
+        with unittest.mock.patch.object(http_utils.socket, "getaddrinfo",
+                                        side_effect=fake_getaddrinfo) as mock_lookup:
+            prewarm_dns(("bad.invalid", "fal.media")).join(timeout=5)
+        self.assertEqual([c.args[0] for c in mock_lookup.call_args_list], ["bad.invalid", "fal.media"])
+
+
+if __name__ == "__main__":
+    unittest.main()
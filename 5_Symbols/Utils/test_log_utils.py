@@ -0,0 +1,46 @@
+"""
+Unit tests for the queued console logger in log_utils
+"""
+import io
+import threading
+import unittest
+
+import log_utils
+from log_utils import get_logger, flush_logs, LOGGER_NAME
+
+class TestLogUtils(unittest.TestCase):
+    def test_records_from_threads_pass_through_the_listener(self):
+        log = get_logger("test")
+        self.assertTrue(log.name.startswith(LOGGER_NAME + "."))
+        # Nothing is attached to the child logger: output must go via the queue
+        self.assertEqual(log.handlers, [])
+
+        # Capture at the listener's stream handler (the only writer to stdout)
+        stream_handler = log_utils._listener.handlers[0]
+        stream = io.StringIO()
+        flush_logs()
+        previous = stream_handler.setStream(stream)
+        try:
+            def worker(n):
+                for i in range(20):
+                    log.info("worker %s line %s", n, i)
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            flush_logs()
+        finally:
+            stream_handler.setStream(previous)
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 80)
+        self.assertTrue(all(line.startswith("worker ") for line in lines))
+
+    def test_flush_logs_is_safe_to_repeat(self):
+        get_logger("test")
+        flush_logs()
+        flush_logs()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Unit tests for the token-bucket rate limiter in rate_limit
+"""
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import rate_limit
+from rate_limit import RateLimiter, call_with_retry, get_fal_rate_limiter, get_imagen_rate_limiter, is_transient_error
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_is_free_then_requests_are_spaced(self):
+        limiter = RateLimiter(max_rate=5, time_period=0.1)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        # The next five tokens refill over one period
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_threads_never_exceed_the_rate(self):
+        limiter = RateLimiter(max_rate=4, time_period=0.1)
+        stamps = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(3):
+                limiter.acquire()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stamps.sort()
+        self.assertEqual(len(stamps), 12)
+        # 12 tokens at 4 per 0.1s (with a burst of 4) take at least 0.2s
+        self.assertGreaterEqual(stamps[-1] - stamps[0], 0.18)
+
+    def test_invalid_rate_is_rejected(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(max_rate=0)
+
+    def test_fal_limiter_reads_plan_rate(self):
+        with patch.object(rate_limit, "_fal_limiter", None), \
+                patch.dict(os.environ, {"FAL_MAX_RPS": "2.5"}):
+            limiter = get_fal_rate_limiter()
+            self.assertEqual(limiter.max_rate, 2.5)
+            self.assertIs(get_fal_rate_limiter(), limiter)
+
+    def test_imagen_limiter_is_per_minute(self):
+        with patch.object(rate_limit, "_imagen_limiter", None), \
+                patch.dict(os.environ, {"IMAGEN_QPM": "30"}):
+            limiter = get_imagen_rate_limiter()
+            self.assertEqual((limiter.max_rate, limiter.time_period), (30.0, 60.0))
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class TestCallWithRetry(unittest.TestCase):
+    def setUp(self):
+        # Fake clock for rate_limit only: sleeping advances it, so waits finish instantly
+        self.now = 0.0
+        clock = patch.object(rate_limit, "time").start()
+        clock.monotonic.side_effect = lambda: self.now
+        self.sleep = clock.sleep
+        self.sleep.side_effect = self.advance
+        self.addCleanup(patch.stopall)
+        self.limiter = RateLimiter(max_rate=100)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def test_transient_errors_are_retried(self):
+        calls = []
+
+        def flaky(value):
+            calls.append(value)
+            if len(calls) < 3:
+                raise _HTTPError(429 if len(calls) == 1 else 503)
+            return value
+
+        self.assertEqual(call_with_retry(flaky, "ok", limiter=self.limiter), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_permanent_errors_are_raised_immediately(self):
+        def bad_request():
+            raise _HTTPError(422)
+
+        with self.assertRaises(_HTTPError):
+            call_with_retry(bad_request, limiter=self.limiter)
+        self.sleep.assert_not_called()
+
+    def test_gives_up_after_the_last_attempt(self):
+        def always_busy():
+            raise _HTTPError(429)
+
+        with self.assertRaises(_HTTPError):
+            call_with_retry(always_busy, attempts=3, limiter=self.limiter)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_retry_after_header_is_honoured(self):
+        responses = iter([_HTTPError(429, {"retry-after": "7"})])
+
+        def limited():
+            for exc in responses:
+                raise exc
+            return "done"
+
+        self.assertEqual(call_with_retry(limited, limiter=self.limiter), "done")
+        self.assertEqual(self.sleep.call_args.args[0], 7)
+
+    def test_rate_limit_pauses_the_shared_limiter(self):
+        responses = iter([_HTTPError(429, {"retry-after": "7"})])
+
+        def limited():
+            for exc in responses:
+                raise exc
+            return "done"
+
+        def other_worker_acquires_during_the_backoff(seconds):
+            self.sleep.side_effect = self.advance
+            self.now += 1
+            waits.append(self.limiter.acquire())
+
+        waits = []
+        self.sleep.side_effect = other_worker_acquires_during_the_backoff
+        self.assertEqual(call_with_retry(limited, limiter=self.limiter), "done")
+        # The other worker was held for the rest of the Retry-After
+        self.assertGreaterEqual(waits[0], 6)
+
+    def test_transient_classification(self):
+        class APIError(Exception):  # google.genai.errors.APIError carries .code
+            code = 429
+        self.assertTrue(is_transient_error(APIError()))
+        self.assertTrue(is_transient_error(ConnectionResetError()))
+        self.assertTrue(is_transient_error(TimeoutError()))
+        self.assertFalse(is_transient_error(ValueError("bad prompt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
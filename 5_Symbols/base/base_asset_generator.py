@@ -9,8 +9,13 @@ import json
 import urllib.request
 import urllib.error
 import base64
+import hashlib
+import threading
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 
@@ -36,8 +41,12 @@ except ImportError:
 # Import from parent directory
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker
+from Utils.asset_utils import generate_filename, extract_scene_number, ManifestTracker, write_json_atomic
 from Utils.prompt_enhancer import enhance_prompt
+from Utils.generation_cache import GenerationCache, CACHE_DIR_NAME, compute_cache_key
+from Utils.log_utils import get_logger, flush_logs
+from Utils.http_utils import download_file, prewarm_dns
+from Utils.rate_limit import get_fal_rate_limiter
 
 # Import configuration (relative import from same package)
 from .generator_config import OUTPUT_FORMATS, MODEL_PRICING, check_generation_cost
@@ -46,6 +55,15 @@ from .generator_config import OUTPUT_FORMATS, MODEL_PRICING, check_generation_co
 IMAGE_ASSET_TYPES = [k for k, v in OUTPUT_FORMATS.items() 
                      if v in ('jpeg', 'png') and k != 'svg']
 
+# Image outputs smaller than this are treated as incomplete and regenerated
+MIN_IMAGE_BYTES = 1024
+
+# Write-through cache of Gemini prompt enhancements (stored in the output directory)
+ENHANCE_CACHE_FILENAME = ".enhance_cache.json"
+
+# Buffered logger: records are written by a background listener thread
+log = get_logger(__name__)
+
 
 class BaseAssetGenerator(ABC):
     """
@@ -79,7 +97,10 @@ class BaseAssetGenerator(ABC):
         brand_colors: Dict[str, str],
         asset_type: str,
         output_format: Optional[str] = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        use_cache: bool = True,
+        max_workers: int = 1,
+        force: bool = False
     ):
         """
         Initialize the base generator.
@@ -92,16 +113,28 @@ class BaseAssetGenerator(ABC):
             output_format: Override output format (e.g., 'jpeg', 'png'). 
                           If None, uses OUTPUT_FORMATS from config
             dry_run: If True, only generate and display prompts without making API calls
+            use_cache: If True, reuse previously generated assets for identical requests
+            max_workers: Number of assets submitted to fal.ai concurrently (1 = sequential)
+            force: If True, regenerate assets whose output file already exists
+                   (also enabled by the FAL_FORCE environment variable)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.seeds = seeds
-        self.brand_colors = brand_colors
+        # Read-only views: generators share these across concurrent workers
+        self.seeds = MappingProxyType(dict(seeds))
+        self.brand_colors = MappingProxyType(dict(brand_colors))
         self.asset_type = asset_type
         self.manifest = None
         self.output_format = output_format  # Store the desired output format
         self.dry_run = dry_run  # Dry-run mode for prompt generation without API calls
         self.credits_exhausted = False  # Track if credits have been exhausted
+        self.use_cache = use_cache
+        self.cache = GenerationCache(self.output_dir / CACHE_DIR_NAME)
+        self.max_workers = max(1, max_workers)
+        self._download_executor = None  # Set by process_queue() to pipeline downloads
+        self.force = force or bool(os.environ.get("FAL_FORCE"))
+        self._enhance_cache = None  # Loaded lazily by load_enhancement_cache()
+        self._enhance_cache_lock = threading.Lock()
         
     @abstractmethod
     def get_generation_queue(self) -> List[Dict]:
@@ -121,10 +154,10 @@ class BaseAssetGenerator(ABC):
             api_key = os.environ.get("FAL_API_KEY")
         
         if not api_key:
-            print("\n❌ ERROR: FAL_KEY or FAL_API_KEY environment variable not set")
-            print("   Set it in your shell with: export FAL_KEY='your-api-key-here'  (bash/zsh)")
-            print("   Or for Windows: set FAL_KEY=your-api-key-here  (cmd)")
-            print("   Or use FAL_API_KEY in GitHub Actions secrets")
+            log.error("\n❌ ERROR: FAL_KEY or FAL_API_KEY environment variable not set")
+            log.info("   Set it in your shell with: export FAL_KEY='your-api-key-here'  (bash/zsh)")
+            log.info("   Or for Windows: set FAL_KEY=your-api-key-here  (cmd)")
+            log.info("   Or use FAL_API_KEY in GitHub Actions secrets")
             raise ValueError("FAL_KEY or FAL_API_KEY not set")
         return api_key
     
@@ -170,8 +203,9 @@ class BaseAssetGenerator(ABC):
             arguments["image_size"] = asset_config["image_size"]
         if "num_inference_steps" in asset_config:
             arguments["num_inference_steps"] = asset_config["num_inference_steps"]
-        if "seed_key" in asset_config and asset_config["seed_key"] in self.seeds:
-            arguments["seed"] = self.seeds[asset_config["seed_key"]]
+        seed_value = self.get_seed_value(asset_config)
+        if seed_value is not None:
+            arguments["seed"] = seed_value
         if "num_images" in asset_config:
             arguments["num_images"] = asset_config["num_images"]
             
@@ -200,6 +234,20 @@ class BaseAssetGenerator(ABC):
             return result["video"]["url"]
         return None
     
+    def extract_result_urls(self, result: Dict) -> List[str]:
+        """
+        Extract every image URL from the API response (one per requested num_images).
+        
+        Args:
+            result: Response from fal.ai API
+            
+        Returns:
+            List of image URLs (empty if the response has no images array)
+        """
+        if result and "images" in result:
+            return [image["url"] for image in result["images"] if image.get("url")]
+        return []
+    
     def get_file_extension(self, asset_config: Dict) -> str:
         """
         Get the file extension for this asset type.
@@ -216,6 +264,214 @@ class BaseAssetGenerator(ABC):
             return self.output_format
         return self.ASSET_TYPE_EXTENSIONS.get(self.asset_type, 'bin')
     
+    def build_base_filename(self, asset_config: Dict, version: int = 1, provider: str = "fal") -> str:
+        """
+        Build the base filename (without extension) for an asset.
+        
+        Args:
+            asset_config: Configuration for the asset
+            version: Version number for the asset
+            provider: Provider suffix appended to the name (e.g., 'fal', 'gemini')
+            
+        Returns:
+            Base filename, e.g. '001_image_name_fal_v1'
+        """
+        scene_num = extract_scene_number(asset_config.get('id', '0.0'))
+        return generate_filename(
+            scene_num,
+            self.asset_type,
+            asset_config['name'] + "_" + provider,
+            version
+        )
+    
+    def find_existing_output(self, asset_config: Dict, version: int = 1) -> Optional[Path]:
+        """
+        Return the asset's output file if a previous run already produced it.
+        Empty files (and images under MIN_IMAGE_BYTES) are left over from an
+        interrupted write and don't count.
+        
+        Args:
+            asset_config: Configuration for the asset
+            version: Version number for the asset
+            
+        Returns:
+            Path of the existing output, or None if it must be generated
+        """
+        if self.force:
+            return None
+        extension = self.get_file_extension(asset_config)
+        asset_path = self.output_dir / f"{self.build_base_filename(asset_config, version)}.{extension}"
+        min_bytes = MIN_IMAGE_BYTES if self.asset_type in IMAGE_ASSET_TYPES else 1
+        try:
+            return asset_path if asset_path.stat().st_size >= min_bytes else None
+        except OSError:
+            return None
+    
+    def get_seed_value(self, asset_config: Dict) -> Optional[int]:
+        """Resolve an asset's seed_key to its seed value (None if unset or unknown)."""
+        seed_key = asset_config.get("seed_key")
+        return self.seeds.get(seed_key) if seed_key is not None else None
+    
+    def get_cache_key(self, asset_config: Dict) -> Optional[str]:
+        """
+        Compute the result-cache key for an asset from the model and the exact
+        arguments prepare_arguments() would send. Uses the original
+        (pre-enhancement) prompt so cache hits also skip enhancement.
+        
+        Returns:
+            Cache key, or None if the request is not cacheable (unseeded requests
+            are not deterministic; multi-image requests are not stored)
+        """
+        if asset_config.get("num_images", 1) > 1:
+            return None
+        original_config = {
+            **asset_config,
+            "prompt": asset_config.get("original_prompt", asset_config.get("prompt", "")),
+        }
+        arguments = self.prepare_arguments(original_config)
+        if arguments.get("seed") is None:
+            return None
+        return compute_cache_key(asset_config.get("model", ""), arguments)
+    
+    def restore_from_cache(self, asset_config: Dict, version: int = 1) -> Optional[Dict]:
+        """
+        Serve an asset from the result cache if an identical request was generated before.
+        
+        Args:
+            asset_config: Configuration for the asset
+            version: Version number for the asset
+            
+        Returns:
+            Result dictionary on a cache hit, None on a miss
+        """
+        cache_key = self.get_cache_key(asset_config)
+        if cache_key is None:
+            return None
+        extension = self.get_file_extension(asset_config)
+        base_filename = self.build_base_filename(asset_config, version)
+        filename_asset = base_filename + '.' + extension
+        asset_path = self.output_dir / filename_asset
+        
+        try:
+            if not self.cache.restore(cache_key, extension, asset_path):
+                return None
+        except OSError as e:
+            log.warning("⚠️  Warning: Failed to restore cached asset, regenerating: %s", e)
+            return None
+        
+        cached_metadata = self.cache.load_metadata(cache_key)
+        result_url = cached_metadata.get("result_url")
+        
+        metadata = {
+            **asset_config,
+            "provider": "fal",
+            "result_url": result_url,
+            "filename": filename_asset,
+            "cache_key": cache_key,
+        }
+        if 'seed_key' in asset_config:
+            metadata["seed_value"] = self.get_seed_value(asset_config)
+        write_json_atomic(self.output_dir / (base_filename + '.json'), metadata)
+        
+        log.info("♻️  Cache hit for %s - reused %s (no API call)", asset_config['name'], asset_path.name)
+        
+        if self.manifest:
+            self.manifest.add_asset(
+                filename=filename_asset,
+                prompt=asset_config["prompt"],
+                asset_type=self.asset_type,
+                asset_id=asset_config.get("id", "unknown"),
+                result_url=result_url,
+                local_path=str(asset_path),
+                metadata={
+                    "scene": asset_config.get("scene", ""),
+                    "priority": asset_config.get("priority", ""),
+                    "model": asset_config.get("model", ""),
+                    "provider": "fal",
+                    "cached": True,
+                }
+            )
+        
+        return {
+            "success": True,
+            "url": result_url,
+            "local_path": str(asset_path),
+            "cached": True,
+        }
+    
+    def load_enhancement_cache(self) -> Dict[str, str]:
+        """Load the prompt-enhancement cache from disk once and keep it in memory."""
+        if self._enhance_cache is None:
+            cache_path = self.output_dir / ENHANCE_CACHE_FILENAME
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self._enhance_cache = json.load(f)
+            except (OSError, ValueError):
+                self._enhance_cache = {}
+        return self._enhance_cache
+    
+    def enhance_prompt_cached(self, prompt: str, context: Optional[str] = None) -> str:
+        """
+        Enhance a prompt with Gemini, reusing any previous enhancement of the same prompt.
+        
+        Args:
+            prompt: The original prompt
+            context: Optional enhancement context override
+            
+        Returns:
+            The enhanced prompt (or the original if enhancement failed)
+        """
+        cache = self.load_enhancement_cache()
+        key = hashlib.sha256(json.dumps(
+            {"p": prompt, "c": context, "t": self.asset_type}, sort_keys=True
+        ).encode("utf-8")).hexdigest()
+        
+        cached = cache.get(key)
+        if cached:
+            return cached
+        
+        log_path = self.output_dir / "prompt_enhancements_log.txt"
+        enhanced = enhance_prompt(prompt, context=context, asset_type=self.asset_type, log_path=str(log_path))
+        
+        # Only remember real enhancements so failed calls are retried next run
+        if enhanced and enhanced != prompt:
+            with self._enhance_cache_lock:
+                cache[key] = enhanced
+                write_json_atomic(self.output_dir / ENHANCE_CACHE_FILENAME, cache)
+        return enhanced
+    
+    def prewarm_enhancements(self, queue: List[Dict], max_workers: int = 4):
+        """
+        Enhance all queued prompts concurrently before generation starts,
+        so each generate_asset() call finds its enhancement already cached.
+        """
+        pending = []
+        for asset in queue:
+            if not asset.get("prompt") or "original_prompt" in asset:
+                continue
+            if self.find_existing_output(asset):
+                continue  # Already generated by a previous run
+            cache_key = self.get_cache_key(asset) if self.use_cache else None
+            if cache_key and self.cache.lookup(cache_key, self.get_file_extension(asset)):
+                continue  # Served from the result cache, no enhancement needed
+            pending.append(asset)
+        
+        if not pending:
+            return
+        
+        log.info("\n✨ Pre-warming prompt enhancements for %s asset(s)...", len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.enhance_prompt_cached, asset["prompt"], asset.get("enhancement_context")): asset
+                for asset in pending
+            }
+            for future, asset in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    # generate_asset() retries the enhancement for this asset
+                    log.warning("⚠️  Warning: Pre-warm enhancement failed for %s: %s", asset.get("name", "?"), e)
+    
     def convert_to_jpeg(self, png_path: Path, jpeg_path: Path, quality: int = 95) -> bool:
         """
         Convert a PNG image to JPEG format.
@@ -256,7 +512,7 @@ class BaseAssetGenerator(ABC):
                 
             return True
         except Exception as e:
-            print(f"⚠️  Warning: Failed to convert to JPEG: {e}")
+            log.warning("⚠️  Warning: Failed to convert to JPEG: %s", e)
             return False
     
     def optimize_png_for_resolve(self, png_path: Path) -> bool:
@@ -293,7 +549,7 @@ class BaseAssetGenerator(ABC):
                 # - 1: Binary → RGBA
                 if img.mode != 'RGBA':
                     img = img.convert('RGBA')
-                    print(f"   🔄 Converted PNG mode: {original_mode} → RGBA (32-bit)")
+                    log.info("   🔄 Converted PNG mode: %s → RGBA (32-bit)", original_mode)
                 
                 # Save with optimized settings for DaVinci Resolve
                 # - No metadata (exif=b'' removes EXIF, XMP, and other metadata)
@@ -303,7 +559,7 @@ class BaseAssetGenerator(ABC):
                 
             return True
         except Exception as e:
-            print(f"⚠️  Warning: Failed to optimize PNG for Resolve: {e}")
+            log.warning("⚠️  Warning: Failed to optimize PNG for Resolve: %s", e)
             return False
     
     def check_cost(self, asset_config: Dict) -> bool:
@@ -330,10 +586,10 @@ class BaseAssetGenerator(ABC):
         """
         api_key = os.environ.get("GEMINIKEY") or os.environ.get("GEMINI_API_KEY")
         if not api_key:
-            print("❌ No GEMINI_API_KEY found for fallback.")
+            log.error("❌ No GEMINI_API_KEY found for fallback.")
             return {"success": False, "error": "No Gemini API Key"}
 
-        print("✨ Generating with Gemini (Imagen 4)...")
+        log.info("✨ Generating with Gemini (Imagen 4)...")
 
         # Endpoint for Imagen 4 on Generative Language API
         url = f"https://generativelanguage.googleapis.com/v1beta/models/imagen-3.0-generate-001:predict?key={api_key}"
@@ -370,7 +626,7 @@ class BaseAssetGenerator(ABC):
                 
                 if not b64_data:
                      # Check alternate format if needed
-                     print(f"⚠️ Unexpected Gemini response format: {result.keys()}")
+                     log.warning("⚠️ Unexpected Gemini response format: %s", result.keys())
                      return {"success": False, "error": "No image data in Gemini response"}
                      
                 # Decode and save
@@ -380,7 +636,7 @@ class BaseAssetGenerator(ABC):
                 
                 # Handle video fallback (Gemini only does images currently)
                 if self.asset_type == 'video':
-                    print("⚠️  Warning: Gemini fallback uses Imagen 3 (Image). Saving as PNG instead of MP4.")
+                    log.warning("⚠️  Warning: Gemini fallback uses Imagen 3 (Image). Saving as PNG instead of MP4.")
                     extension = 'png'
                 else:
                     extension = self.get_file_extension(asset_config)
@@ -404,21 +660,20 @@ class BaseAssetGenerator(ABC):
                     "filename": filename_asset,
                 }
                 if 'seed_key' in asset_config:
-                    metadata["seed_value"] = self.seeds.get(asset_config["seed_key"])
+                    metadata["seed_value"] = self.get_seed_value(asset_config)
                 
                 metadata_path = self.output_dir / filename_json
-                with open(metadata_path, 'w') as f:
-                    json.dump(metadata, f, indent=2)
+                write_json_atomic(metadata_path, metadata)
                 
                 asset_path = self.output_dir / filename_asset
                 with open(asset_path, "wb") as f:
                     f.write(image_data)
                     
-                print(f"💾 Gemini Asset saved: {asset_path}")
+                log.info("💾 Gemini Asset saved: %s", asset_path)
                 
                 # Optimize PNG if needed
                 if extension == 'png':
-                    print(self.MSG_OPTIMIZING_PNG)
+                    log.info(self.MSG_OPTIMIZING_PNG)
                     self.optimize_png_for_resolve(asset_path)
                     
                 # Add to manifest if available
@@ -445,14 +700,165 @@ class BaseAssetGenerator(ABC):
                 }
                 
         except Exception as e:
-            print(f"❌ Gemini Fallback Error: {e}")
+            log.error("❌ Gemini Fallback Error: %s", e)
             if hasattr(e, 'read'): # Handle HTTPError
                 try:
-                    print(f"   Response: {e.read().decode('utf-8')}")
+                    log.info("   Response: %s", e.read().decode('utf-8'))
                 except Exception:
                     pass
             return {"success": False, "error": str(e)}
     
+    def download_asset(self, result_url: str, asset_path: Path, base_filename: str, extension: str):
+        """
+        Download a generated asset and apply format post-processing.
+        Images are always downloaded as PNG; they are converted to JPEG when the
+        output format requires it, otherwise PNGs are optimized for DaVinci Resolve.
+        
+        Args:
+            result_url: URL of the generated asset
+            asset_path: Final path for the asset
+            base_filename: Base filename (used for the temporary download)
+            extension: Output file extension
+        """
+        # Use UUID to ensure unique temporary filename for guaranteed thread safety
+        unique_id = uuid.uuid4().hex[:8]  # First 8 hexadecimal characters (4 bytes)
+        temp_path = self.output_dir / f"{base_filename}_temp_{unique_id}.png"
+
+        # Drop any previous file (possibly a hardlink into the result cache)
+        # so the new download never overwrites cached data in place
+        asset_path.unlink(missing_ok=True)
+
+        # Determine if we need conversion
+        # Only convert to JPEG if:
+        # 1. The output format is 'jpeg'
+        # 2. The asset type is one that supports conversion (image-based assets)
+        needs_conversion = (
+            extension == 'jpeg' and 
+            self.asset_type in IMAGE_ASSET_TYPES
+        )
+
+        if needs_conversion:
+            # Download as temporary PNG first
+            try:
+                download_file(result_url, temp_path)
+            except Exception:
+                temp_path.unlink(missing_ok=True)
+                raise
+            log.info("💾 Downloaded temporary PNG: %s", temp_path)
+
+            # Convert to JPEG
+            if self.convert_to_jpeg(temp_path, asset_path, quality=95):
+                log.info("🔄 Converted to JPEG: %s", asset_path)
+                # Get file size comparison
+                png_size = temp_path.stat().st_size / 1024  # KB
+                jpeg_size = asset_path.stat().st_size / 1024  # KB
+                savings = ((png_size - jpeg_size) / png_size) * 100
+                log.info("   📦 Size: %.1fKB (PNG) → %.1fKB (JPEG) - %.1f%% smaller", png_size, jpeg_size, savings)
+                # Clean up temporary PNG
+                temp_path.unlink()
+            else:
+                # Conversion failed, use PNG instead
+                log.warning("⚠️  Using PNG format instead")
+                temp_path.rename(asset_path)
+                # Optimize the PNG for DaVinci Resolve since we're keeping it
+                log.info(self.MSG_OPTIMIZING_PNG)
+                self.optimize_png_for_resolve(asset_path)
+        else:
+            # Direct download to a temporary file, moved into place only once complete,
+            # so an interrupted download never leaves a truncated asset behind
+            partial_path = self.output_dir / f"{base_filename}_temp_{unique_id}.{extension}"
+            try:
+                download_file(result_url, partial_path)
+                os.replace(partial_path, asset_path)
+            finally:
+                partial_path.unlink(missing_ok=True)
+            log.info("💾 Asset saved: %s", asset_path)
+
+            # Optimize PNG files for DaVinci Resolve compatibility
+            if extension == 'png':
+                log.info(self.MSG_OPTIMIZING_PNG)
+                self.optimize_png_for_resolve(asset_path)
+    
+    def finish_asset(
+        self,
+        asset_config: Dict,
+        result: Dict,
+        result_url: str,
+        base_filename: str,
+        extension: str,
+        metadata: Dict,
+        use_cache: bool
+    ) -> Dict:
+        """
+        Download a generated asset (plus any num_images variants), cache it and
+        record it in the manifest.
+        
+        Args:
+            asset_config: Configuration for the asset
+            result: Response from fal.ai API
+            result_url: URL of the primary generated asset
+            base_filename: Base filename for the asset
+            extension: Output file extension
+            metadata: Metadata saved alongside the asset
+            use_cache: Whether to store the asset in the result cache
+            
+        Returns:
+            Dictionary with success status and local path
+        """
+        filename_asset = base_filename + '.' + extension
+        asset_path = self.output_dir / filename_asset
+        try:
+            # Download asset from fal.ai and post-process (JPEG conversion / PNG optimization)
+            self.download_asset(result_url, asset_path, base_filename, extension)
+            
+            # Save any additional variants returned when num_images > 1
+            variant_paths = []
+            for j, variant_url in enumerate(self.extract_result_urls(result)[1:], 2):
+                variant_base = f"{base_filename}_var{j}"
+                variant_path = self.output_dir / f"{variant_base}.{extension}"
+                self.download_asset(variant_url, variant_path, variant_base, extension)
+                variant_paths.append(str(variant_path))
+            
+            # Keep the final asset in the result cache for identical future requests
+            if use_cache:
+                self.cache.store(self.get_cache_key(asset_config), asset_path, metadata)
+            
+            # Add to manifest if available
+            if self.manifest:
+                self.manifest.add_asset(
+                    filename=filename_asset,
+                    prompt=asset_config["prompt"],
+                    asset_type=self.asset_type,
+                    asset_id=asset_config.get("id", "unknown"),
+                    result_url=result_url,
+                    local_path=str(asset_path),
+                    metadata={
+                        "scene": asset_config.get("scene", ""),
+                        "priority": asset_config.get("priority", ""),
+                        "model": asset_config.get("model", ""),
+                        "provider": "fal",
+                    }
+                )
+            
+            generation_result = {
+                "success": True,
+                "url": result_url,
+                "local_path": str(asset_path),
+            }
+            if variant_paths:
+                generation_result["variants"] = variant_paths
+            return generation_result
+            
+        except Exception as e:
+            error_msg = str(e)
+            log.error("❌ Error: %s", error_msg)
+            # Don't leave a half-written asset for the next run to mistake as finished
+            asset_path.unlink(missing_ok=True)
+            return {
+                "success": False,
+                "error": error_msg,
+            }
+    
     def generate_asset(
         self,
         asset_config: Dict,
@@ -469,6 +875,26 @@ class BaseAssetGenerator(ABC):
         Returns:
             Dictionary with success status and metadata
         """
+        # Skip assets already generated by a previous run (use force to regenerate)
+        if not self.dry_run:
+            existing_path = self.find_existing_output(asset_config, version)
+            if existing_path:
+                log.info("⏭️  Skipping %s - already generated: %s", asset_config['name'], existing_path.name)
+                return {
+                    "success": True,
+                    "local_path": str(existing_path),
+                    "filename": existing_path.name,
+                    "skipped": True,
+                }
+        
+        # Serve identical seeded requests from the on-disk result cache
+        # (unseeded and multi-image requests always go to fal.ai)
+        use_cache = self.use_cache and self.get_cache_key(asset_config) is not None
+        if use_cache and not self.dry_run and not self.credits_exhausted:
+            cached_result = self.restore_from_cache(asset_config, version)
+            if cached_result:
+                return cached_result
+        
         # Enhance prompt if Gemini key is available
         original_prompt = asset_config.get("prompt", "")
         # Only enhance if prompt exists and is not empty
@@ -476,42 +902,43 @@ class BaseAssetGenerator(ABC):
             # Check if this specific asset has an enhancement context override
             context = asset_config.get("enhancement_context")
             
-            print("✨ Enhancing prompt with Gemini...")
-            # Create a log file for prompt enhancements in the output directory
-            log_path = self.output_dir / "prompt_enhancements_log.txt"
-            enhanced_prompt = enhance_prompt(original_prompt, context=context, asset_type=self.asset_type, log_path=str(log_path))
+            log.info("✨ Enhancing prompt with Gemini...")
+            enhanced_prompt = self.enhance_prompt_cached(original_prompt, context=context)
             
             if enhanced_prompt and enhanced_prompt != original_prompt:
                 # Update the prompt in the config for this generation
                 # We store the original for reference if needed, but for generation we use enhanced
                 asset_config["original_prompt"] = original_prompt
                 asset_config["prompt"] = enhanced_prompt
-                print(f"   Original: {original_prompt[:60]}..." if len(original_prompt) > 60 else f"   Original: {original_prompt}")
-                print(f"   Enhanced: {enhanced_prompt[:60]}..." if len(enhanced_prompt) > 60 else f"   Enhanced: {enhanced_prompt}")
+                log.info("   Original: %s", original_prompt[:60] + "..." if len(original_prompt) > 60 else original_prompt)
+                log.info("   Enhanced: %s", enhanced_prompt[:60] + "..." if len(enhanced_prompt) > 60 else enhanced_prompt)
             else:
-                 print("   Prompt enhancement skipped or returned same prompt")
+                 log.info("   Prompt enhancement skipped or returned same prompt")
 
-        print(f"\n{'='*60}")
-        print(f"🎨 Generating {self.asset_type}: {asset_config['name']}")
-        print(f"   Scene: {asset_config.get('scene', 'Unknown')}")
-        print(f"   Priority: {asset_config.get('priority', 'MEDIUM')}")
+        # Resolve the seed once and reuse it for logging and metadata
+        seed_value = self.get_seed_value(asset_config)
+        
+        log.info("\n%s", "=" * 60)
+        log.info("🎨 Generating %s: %s", self.asset_type, asset_config['name'])
+        log.info("   Scene: %s", asset_config.get('scene', 'Unknown'))
+        log.info("   Priority: %s", asset_config.get('priority', 'MEDIUM'))
         if 'seed_key' in asset_config:
-            print(f"   Seed: {asset_config['seed_key']} ({self.seeds.get(asset_config['seed_key'], 'N/A')})")
-        print(f"{'='*60}")
+            log.info("   Seed: %s (%s)", asset_config['seed_key'], 'N/A' if seed_value is None else seed_value)
+        log.info("=" * 60)
         
         # Get estimated cost
         model = asset_config.get("model", "unknown")
         estimated_cost = MODEL_PRICING.get(model, 0.0)
         
         # Display prompt and cost information
-        print(f"\n📝 Prompt: {asset_config['prompt']}")
-        print(f"💰 Estimated Cost: ${estimated_cost:.2f}")
-        print(f"🔧 Model: {model}")
+        log.info("\n📝 Prompt: %s", asset_config['prompt'])
+        log.info("💰 Estimated Cost: $%.2f", estimated_cost)
+        log.info("🔧 Model: %s", model)
         
         # If in dry-run mode or credits exhausted, just display info and return
         if self.credits_exhausted:
-            print("\n💳 NO CREDITS AVAILABLE - Displaying prompt and cost only")
-            print("   Top up your balance at: https://fal.ai/dashboard/billing")
+            log.info("\n💳 NO CREDITS AVAILABLE - Displaying prompt and cost only")
+            log.info("   Top up your balance at: https://fal.ai/dashboard/billing")
             
             return {
                 "success": False,
@@ -522,7 +949,7 @@ class BaseAssetGenerator(ABC):
                 "dry_run": True
             }
         elif self.dry_run:
-            print("\n🔍 DRY-RUN MODE - Skipping actual generation")
+            log.info("\n🔍 DRY-RUN MODE - Skipping actual generation")
             
             return {
                 "success": False,
@@ -548,24 +975,26 @@ class BaseAssetGenerator(ABC):
             arguments = self.prepare_arguments(asset_config)
             
             # Generate asset
-            print("⏳ Sending request to fal.ai...")
+            log.info("⏳ Sending request to fal.ai...")
             result = None
             try:
+                # Wait for a token so parallel workers stay under the plan's request rate
+                get_fal_rate_limiter().acquire()
                 result = fal_client.subscribe(
                     asset_config["model"],
                     arguments=arguments,
                 )
             except Exception as e:
                 error_msg = str(e)
-                print(f"❌ Error: {error_msg}")
+                log.error("❌ Error: %s", error_msg)
                 
                 # Check for insufficient credits or payment required
                 is_credit_issue = self.is_credit_error(error_msg) or \
                                   any(x in error_msg.lower() for x in ["payment", "credit", "balance", "quota", "insufficient", "402"])
                 
                 if is_credit_issue:
-                    print("\n💳 CREDIT ERROR DETECTED!")
-                    print("   Attempting fallback to Gemini (Imagen 3)...")
+                    log.info("\n💳 CREDIT ERROR DETECTED!")
+                    log.info("   Attempting fallback to Gemini (Imagen 3)...")
                     return self.generate_asset_with_gemini(asset_config, version)
                 
                 return {
@@ -582,22 +1011,12 @@ class BaseAssetGenerator(ABC):
                     "error": "No URL in result",
                 }
             
-            print("✅ Generated successfully!")
-            print(f"   URL: {result_url}")
+            log.info("✅ Generated successfully!")
+            log.info("   URL: %s", result_url)
             
             # Generate filename
-            scene_num = extract_scene_number(asset_config.get('id', '0.0'))
             extension = self.get_file_extension(asset_config)
-            
-            # Append provider to name
-            name_with_provider = asset_config['name'] + "_fal"
-            
-            base_filename = generate_filename(
-                scene_num,
-                self.asset_type,
-                name_with_provider,
-                version
-            )
+            base_filename = self.build_base_filename(asset_config, version)
             filename_json = base_filename + '.json'
             filename_asset = base_filename + '.' + extension
             
@@ -609,92 +1028,44 @@ class BaseAssetGenerator(ABC):
                 "filename": filename_asset,
             }
             if 'seed_key' in asset_config:
-                metadata["seed_value"] = self.seeds.get(asset_config["seed_key"])
+                metadata["seed_value"] = seed_value
             
             metadata_path = self.output_dir / filename_json
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            print(f"💾 Metadata saved: {metadata_path}")
-            
-            # Download asset from fal.ai (always downloads as PNG for images)
-            # Use UUID to ensure unique temporary filename for guaranteed thread safety
-            unique_id = uuid.uuid4().hex[:8]  # First 8 hexadecimal characters (4 bytes)
-            temp_path = self.output_dir / f"{base_filename}_temp_{unique_id}.png"
-            asset_path = self.output_dir / filename_asset
-            
-            # Determine if we need conversion
-            # Only convert to JPEG if:
-            # 1. The output format is 'jpeg'
-            # 2. The asset type is one that supports conversion (image-based assets)
-            needs_conversion = (
-                extension == 'jpeg' and 
-                self.asset_type in IMAGE_ASSET_TYPES
-            )
-            
-            if needs_conversion:
-                # Download as temporary PNG first
-                urllib.request.urlretrieve(result_url, temp_path)
-                print(f"💾 Downloaded temporary PNG: {temp_path}")
-                
-                # Convert to JPEG
-                if self.convert_to_jpeg(temp_path, asset_path, quality=95):
-                    print(f"🔄 Converted to JPEG: {asset_path}")
-                    # Get file size comparison
-                    png_size = temp_path.stat().st_size / 1024  # KB
-                    jpeg_size = asset_path.stat().st_size / 1024  # KB
-                    savings = ((png_size - jpeg_size) / png_size) * 100
-                    print(f"   📦 Size: {png_size:.1f}KB (PNG) → {jpeg_size:.1f}KB (JPEG) - {savings:.1f}% smaller")
-                    # Clean up temporary PNG
-                    temp_path.unlink()
-                else:
-                    # Conversion failed, use PNG instead
-                    print("⚠️  Using PNG format instead")
-                    temp_path.rename(asset_path)
-                    # Optimize the PNG for DaVinci Resolve since we're keeping it
-                    print(self.MSG_OPTIMIZING_PNG)
-                    self.optimize_png_for_resolve(asset_path)
-            else:
-                # Direct download without conversion
-                urllib.request.urlretrieve(result_url, asset_path)
-                print(f"💾 Asset saved: {asset_path}")
-                
-                # Optimize PNG files for DaVinci Resolve compatibility
-                if extension == 'png':
-                    print(self.MSG_OPTIMIZING_PNG)
-                    self.optimize_png_for_resolve(asset_path)
+            write_json_atomic(metadata_path, metadata)
+            log.info("💾 Metadata saved: %s", metadata_path)
             
-            # Add to manifest if available
-            if self.manifest:
-                self.manifest.add_asset(
-                    filename=filename_asset,
-                    prompt=asset_config["prompt"],
-                    asset_type=self.asset_type,
-                    asset_id=asset_config.get("id", "unknown"),
-                    result_url=result_url,
-                    local_path=str(asset_path),
-                    metadata={
-                        "scene": asset_config.get("scene", ""),
-                        "priority": asset_config.get("priority", ""),
-                        "model": asset_config.get("model", ""),
-                        "provider": "fal",
-                    }
-                )
-            
-            return {
-                "success": True,
-                "url": result_url,
-                "local_path": str(asset_path),
-            }
+            # Download and post-process; inside process_queue() this runs on the
+            # download pool so the next fal.ai request is sent without waiting
+            finish_args = (asset_config, result, result_url, base_filename, extension, metadata, use_cache)
+            if self._download_executor is not None:
+                return {"pending": self._download_executor.submit(self.finish_asset, *finish_args)}
+            return self.finish_asset(*finish_args)
             
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Error: {error_msg}")
+            log.error("❌ Error: %s", error_msg)
             return {
                 "success": False,
                 "error": error_msg,
             }
 
     
+    def bucket_queue(self, queue: List[Dict]) -> List[List[int]]:
+        """
+        Group queue indices by (model, seed_key), keeping first-appearance order.
+        
+        Args:
+            queue: Generation queue
+            
+        Returns:
+            List of buckets, each a list of indices into queue
+        """
+        buckets: Dict[tuple, List[int]] = {}
+        for i, asset in enumerate(queue):
+            key = (asset.get("model", ""), asset.get("seed_key"))
+            buckets.setdefault(key, []).append(i)
+        return list(buckets.values())
+    
     def process_queue(
         self,
         queue: Optional[List[Dict]] = None
@@ -711,105 +1082,156 @@ class BaseAssetGenerator(ABC):
         if queue is None:
             queue = self.get_generation_queue()
             
-        print("="*60)
-        print(f"   🎨 fal.ai {self.asset_type.title()} Generator")
-        print("   Project: The Agentic Era - Managing 240+ Workflows")
-        print("="*60)
-        
-        # Check API key
+        # Check API key before any other setup so misconfigured runs fail fast
         try:
             self.check_api_key()
         except ValueError:
+            flush_logs()
             return []
         
-        print("\n✅ API Key found")
-        print(f"📁 Output directory: {self.output_dir.absolute()}")
-        print(f"\n📊 Assets to generate: {len(queue)}")
+        log.info("=" * 60)
+        log.info("   🎨 fal.ai %s Generator", self.asset_type.title())
+        log.info("   Project: The Agentic Era - Managing 240+ Workflows")
+        log.info("=" * 60)
+        
+        log.info("\n✅ API Key found")
+        log.info("📁 Output directory: %s", self.output_dir.absolute())
+        log.info("\n📊 Assets to generate: %s", len(queue))
         
         if not queue:
-            print("\n⚠️  QUEUE IS EMPTY.")
+            log.warning("\n⚠️  QUEUE IS EMPTY.")
             return []
         
-        # Count by priority
-        high_priority = [a for a in queue if a.get("priority") == "HIGH"]
-        medium_priority = [a for a in queue if a.get("priority") == "MEDIUM"]
-        low_priority = [a for a in queue if a.get("priority") == "LOW"]
+        # Resolve the fal.ai hosts in the background while prompts are prepared
+        if not self.dry_run:
+            prewarm_dns()
         
-        print(f"   • HIGH priority: {len(high_priority)}")
-        print(f"   • MEDIUM priority: {len(medium_priority)}")
-        print(f"   • LOW priority: {len(low_priority)}")
+        # Enhance all prompts up front (cached on disk, run concurrently)
+        if os.environ.get("GEMINIKEY") or os.environ.get("GEMINI_API_KEY"):
+            self.load_enhancement_cache()
+            self.prewarm_enhancements(queue)
+        
+        # Count by priority (single pass)
+        priority_counts = Counter(a.get("priority") for a in queue)
+        
+        log.info("   • HIGH priority: %s", priority_counts["HIGH"])
+        log.info("   • MEDIUM priority: %s", priority_counts["MEDIUM"])
+        log.info("   • LOW priority: %s", priority_counts["LOW"])
         
         # Generate assets
-        results = []
-        for i, asset in enumerate(queue, 1):
-            print(f"\n\n{'#'*60}")
-            print(f"# Asset {i}/{len(queue)}")
-            print(f"{'#'*60}")
+        def run_one(i: int, asset: Dict) -> Dict:
+            log.info("\n\n%s", "#" * 60)
+            log.info("# Asset %s/%s", i, len(queue))
+            log.info("#" * 60)
             
             result = self.generate_asset(asset)
-            results.append({
+            return {
                 "asset_id": asset.get("id", f"auto_{i}"),
                 "name": asset["name"],
                 "priority": asset.get("priority", "MEDIUM"),
                 **result
-            })
+            }
+        
+        # Downloads/post-processing run on their own pool, overlapping the next
+        # generation request instead of serializing with it
+        with ThreadPoolExecutor(max_workers=self.max_workers) as downloads:
+            self._download_executor = downloads
+            try:
+                if self.max_workers > 1 and not self.dry_run:
+                    # Submit assets grouped by (model, seed) so requests with the same
+                    # configuration go out together; results keep the original queue order
+                    ordered = [None] * len(queue)
+                    order = [i for bucket in self.bucket_queue(queue) for i in bucket]
+                    
+                    # Warm up the model with the first asset that needs generating before
+                    # fanning out, so the batch does not hit fal.ai with parallel cold starts
+                    warmup = next((i for i in order if not self.find_existing_output(queue[i])), None)
+                    if warmup is not None:
+                        log.info("\n🔥 Warming up %s with the first asset before running in parallel",
+                                 queue[warmup].get("model", "the model"))
+                        ordered[warmup] = run_one(warmup + 1, queue[warmup])
+                    
+                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                        futures = {
+                            executor.submit(run_one, i + 1, queue[i]): i
+                            for i in order if i != warmup
+                        }
+                        for future, i in futures.items():
+                            ordered[i] = future.result()
+                    results = ordered
+                else:
+                    results = [run_one(i, asset) for i, asset in enumerate(queue, 1)]
+            finally:
+                self._download_executor = None
+        
+        for r in results:
+            pending = r.pop("pending", None)
+            if pending is not None:
+                r.update(pending.result())
         
         # Summary
-        print("\n\n" + "="*60)
-        print("📊 GENERATION SUMMARY")
-        print("="*60)
+        log.info("\n\n%s", "=" * 60)
+        log.info("📊 GENERATION SUMMARY")
+        log.info("=" * 60)
         
-        successful = [r for r in results if r["success"]]
-        failed = [r for r in results if not r["success"]]
+        # Split results in one pass: successes, dry-run/no-credit items and real failures
+        successful, dry_run_items, actual_failures = [], [], []
+        dry_run_count = credit_error_count = 0
+        for r in results:
+            if r.get('dry_run', False):
+                dry_run_count += 1
+            if r.get('credit_error', False):
+                credit_error_count += 1
+            if r["success"]:
+                successful.append(r)
+            elif r.get('dry_run', False):
+                dry_run_items.append(r)
+            else:
+                actual_failures.append(r)
+        failed_count = len(results) - len(successful)
         
-        print(f"\n✅ Successful: {len(successful)}/{len(results)}")
-        print(f"❌ Failed: {len(failed)}/{len(results)}")
+        log.info("\n✅ Successful: %s/%s", len(successful), len(results))
+        log.info("❌ Failed: %s/%s", failed_count, len(results))
         
         if successful:
-            print("\n✅ SUCCESSFUL GENERATIONS:")
+            log.info("\n✅ SUCCESSFUL GENERATIONS:")
             for r in successful:
-                print(f"   • {r['asset_id']}: {r['name']} ({r['priority']})")
-        
-        # Separate dry-run and actual failures
-        dry_run_items = [r for r in failed if r.get('dry_run', False)]
-        actual_failures = [r for r in failed if not r.get('dry_run', False)]
+                log.info("   • %s: %s (%s)", r['asset_id'], r['name'], r['priority'])
         
         if dry_run_items:
-            print("\n📝 DRY-RUN / NO CREDITS (Prompt & Cost Displayed):")
+            log.info("\n📝 DRY-RUN / NO CREDITS (Prompt & Cost Displayed):")
             for r in dry_run_items:
                 cost = r.get('estimated_cost', 0.0)
-                print(f"   • {r['asset_id']}: {r['name']} - ${cost:.2f}")
+                log.info("   • %s: %s - $%.2f", r['asset_id'], r['name'], cost)
                 if r.get('prompt'):
                     prompt_preview = r['prompt'][:80] + "..." if len(r['prompt']) > 80 else r['prompt']
-                    print(f"     Prompt: {prompt_preview}")
+                    log.info("     Prompt: %s", prompt_preview)
         
         if actual_failures:
-            print("\n❌ FAILED GENERATIONS:")
+            log.info("\n❌ FAILED GENERATIONS:")
             for r in actual_failures:
                 error_msg = r.get('error', 'Unknown error')
                 if r.get('credit_error'):
-                    print(f"   • {r['asset_id']}: {r['name']} - CREDIT ERROR: {error_msg}")
+                    log.info("   • %s: %s - CREDIT ERROR: %s", r['asset_id'], r['name'], error_msg)
                 else:
-                    print(f"   • {r['asset_id']}: {r['name']} - {error_msg}")
+                    log.info("   • %s: %s - %s", r['asset_id'], r['name'], error_msg)
         
         # Save summary
         summary_path = self.output_dir / "generation_summary.json"
-        dry_run_count = len([r for r in results if r.get('dry_run', False)])
-        credit_error_count = len([r for r in results if r.get('credit_error', False)])
-        
-        with open(summary_path, 'w') as f:
-            json.dump({
-                "asset_type": self.asset_type,
-                "total": len(results),
-                "successful": len(successful),
-                "failed": len(failed),
-                "dry_run": dry_run_count,
-                "credit_errors": credit_error_count,
-                "results": results,
-            }, f, indent=2)
-        
-        print(f"\n💾 Summary saved: {summary_path}")
-        print("\n✅ Done!")
+        
+        write_json_atomic(summary_path, {
+            "asset_type": self.asset_type,
+            "total": len(results),
+            "successful": len(successful),
+            "failed": failed_count,
+            "dry_run": dry_run_count,
+            "credit_errors": credit_error_count,
+            "results": results,
+        })
+        
+        log.info("\n💾 Summary saved: %s", summary_path)
+        log.info("\n✅ Done!")
+        flush_logs()
         
         return results
     
@@ -821,6 +1243,7 @@ class BaseAssetGenerator(ABC):
             confirm: Whether to ask for confirmation before proceeding
         """
         if confirm:
+            flush_logs()
             print("\n" + "="*60)
             response = input("🤔 Proceed with generation? (yes/no): ").strip().lower()
             if response not in ['yes', 'y']:
@@ -4,27 +4,28 @@ Single source of truth for seeds, colors, and common settings
 """
 
 from pathlib import Path
+from types import MappingProxyType
 
 # Default EDL path for chapter marker generation
 DEFAULT_EDL_PATH = "../3_Simulation/Feb1Youtube/source_edl.md"
 
-# Consistency seeds for different asset categories
-SEEDS = {
+# Consistency seeds for different asset categories (read-only)
+SEEDS = MappingProxyType({
     "SEED_001": 42,      # B-roll (can vary)
     "SEED_002": 123456,  # Infographics (MUST match)
     "SEED_003": 789012,  # Motion graphics (brand)
     "SEED_004": 345678,  # UI overlays (template)
-}
+})
 
-# Brand color palette (reference for prompts)
-BRAND_COLORS = {
+# Brand color palette (reference for prompts, read-only)
+BRAND_COLORS = MappingProxyType({
     "primary_dark": "#1a1a2e",
     "accent_blue": "#00d4ff",
     "accent_purple": "#7b2cbf",
     "secondary_teal": "#00bfa5",
     "highlight_orange": "#ff6b35",
     "text_white": "#ffffff",
-}
+})
 
 # Default models for different asset types
 DEFAULT_MODELS = {
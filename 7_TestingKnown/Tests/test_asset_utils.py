@@ -4,8 +4,10 @@ Unit tests for asset_utils module
 """
 import unittest
 import json
+import os
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 try:
     from base_test import BaseAssetGeneratorTest
@@ -20,7 +22,9 @@ from Utils.asset_utils import (
     clean_description,
     generate_filename,
     extract_scene_number,
-    ManifestTracker
+    ManifestTracker,
+    write_json_atomic,
+    preflight
 )
 
 class TestAssetUtils(BaseAssetGeneratorTest):
@@ -108,5 +112,40 @@ class TestAssetUtils(BaseAssetGeneratorTest):
         self.assertIn("completion_timestamp", manifest_data)
         self.assertEqual(len(manifest_data["assets"]), 2)
 
+    def test_write_json_atomic(self):
+        """Test atomic JSON writes replace the file and leave no temp files"""
+        out_dir = self.test_output_root / "utils_test_atomic"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        target = out_dir / "data.json"
+        
+        write_json_atomic(target, {"a": 1})
+        write_json_atomic(target, {"a": 2, "items": ["x", "y"]})
+        
+        with open(target, 'r') as f:
+            self.assertEqual(json.load(f), {"a": 2, "items": ["x", "y"]})
+        self.assertEqual([p.name for p in out_dir.iterdir()], ["data.json"])
+        
+        # Non-ASCII text is written as UTF-8 (same bytes as the orjson path)
+        write_json_atomic(target, {"title": "Café ✓"})
+        self.assertIn("Café ✓", target.read_text(encoding="utf-8"))
+        
+        # Permissions follow the umask like a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(target.stat().st_mode & 0o777, 0o666 & ~umask)
+
+    def test_preflight(self):
+        """Test preflight fails without an API key and creates the output directory"""
+        out_dir = self.test_output_root / "utils_test_preflight"
+        env = {k: v for k, v in os.environ.items() if k not in ("FAL_KEY", "FAL_API_KEY")}
+        with patch.dict(os.environ, env, clear=True):
+            self.assertFalse(preflight(out_dir))
+        with patch.dict(os.environ, {"FAL_KEY": "test-key"}):
+            self.assertTrue(preflight(out_dir, require_yaml=True))
+        with patch.dict(os.environ, {**env, "FAL_API_KEY": "test-key"}, clear=True):
+            self.assertTrue(preflight(out_dir))
+            self.assertFalse(preflight(out_dir, key_names=("FAL_KEY",)))
+        self.assertTrue(out_dir.is_dir())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pipelined BulkIllustrationGenerator batch (no network)
+"""
+import io
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+try:
+    from Images import BulkIllustrationGenerator as bulk
+except ImportError:  # requests / yaml / Pillow not installed
+    bulk = None
+
+
+@unittest.skipIf(bulk is None, "BulkIllustrationGenerator dependencies not installed")
+class TestBulkIllustrationPipeline(unittest.TestCase):
+    """Test suite for BulkIllustrationGenerator.process_batch"""
+
+    def setUp(self):
+        self.items = [
+            {"name": "alpha", "prompt": "alpha prompt"},
+            {"name": "beta", "prompt": "beta prompt", "search_query": "beta query"},
+            {"name": "gamma", "prompt": "gamma prompt"},
+        ]
+
+    def run_batch(self, search, illustrate, text_to_image=None):
+        def fake_save(url, filename):
+            return Path("/tmp") / filename
+
+        with patch.object(bulk, "get_google_image", side_effect=search), \
+                patch.object(bulk, "illustrate_image", side_effect=illustrate), \
+                patch.object(bulk, "generate_text_to_image",
+                             side_effect=text_to_image or (lambda prompt, pending=None, memo=None: None)), \
+                patch.object(bulk, "save_image", side_effect=fake_save):
+            return bulk.process_batch(self.items)
+
+    def test_generation_starts_before_searches_finish(self):
+        """The first transform runs while a later search is still in flight"""
+        transform_started = threading.Event()
+
+        def search(query):
+            if query == "gamma":
+                # Only returns once another item's transform has begun
+                self.assertTrue(transform_started.wait(timeout=5))
+            return f"https://img.example/{query}.png"
+
+        def illustrate(url, prompt, pending=None, memo=None):
+            transform_started.set()
+            return url + "?illustrated"
+
+        results = self.run_batch(search, illustrate)
+        self.assertEqual([r["name"] for r in results], ["alpha", "beta", "gamma"])
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(results[1]["source_url"], "https://img.example/beta query.png")
+
+    def test_failed_search_falls_back_to_text_to_image(self):
+        """No search result: the item is generated from its prompt instead"""
+        results = self.run_batch(
+            search=lambda query: None if query == "alpha" else f"https://img.example/{query}.png",
+            illustrate=lambda url, prompt, pending=None, memo=None: url + "?illustrated",
+            text_to_image=lambda prompt, pending=None, memo=None: "https://img.example/generated.png",
+        )
+        self.assertEqual(results[0]["url"], "https://img.example/generated.png")
+        self.assertTrue(results[0]["success"])
+
+    def test_items_without_any_image_are_reported(self):
+        """An item that fails every stage is returned with success False"""
+        results = self.run_batch(
+            search=lambda query: None,
+            illustrate=lambda url, prompt, pending=None, memo=None: None,
+        )
+        self.assertEqual([r["success"] for r in results], [False, False, False])
+    def test_undownloadable_url_is_dropped_from_the_memo(self):
+        """A generated URL that fails to save is not served again by the result memo"""
+        with patch.object(bulk, "ResultMemo") as memo_cls, \
+                patch.object(bulk, "get_google_image", return_value=None), \
+                patch.object(bulk, "generate_text_to_image",
+                             side_effect=lambda prompt, pending=None, memo=None: "https://fal.media/dead.png"), \
+                patch.object(bulk, "save_image", return_value=None):
+            results = bulk.process_batch(self.items[:1])
+        self.assertFalse(results[0]["success"])
+        memo_cls.return_value.discard_url.assert_called_once_with("https://fal.media/dead.png")
+
+
+@unittest.skipIf(bulk is None, "BulkIllustrationGenerator dependencies not installed")
+class TestLoadConfig(unittest.TestCase):
+    """Test suite for BulkIllustrationGenerator.load_config"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.temp_dir.name) / "batch_generation_data.yaml"
+        self.data_path.write_text("images:\n  - name: alpha\n    prompt: a\n", encoding="utf-8")
+        patch.object(bulk, "DATA_PATH", self.data_path).start()
+        patch.object(bulk, "_CONFIG_CACHE", {}).start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_yaml_is_parsed_once_and_copies_are_returned(self):
+        """Repeated loads skip the parse; mutations don't leak between callers"""
+        with patch.object(bulk.yaml, "load", wraps=bulk.yaml.load) as mock_load:
+            first = bulk.load_config()
+            first[0]["name"] = "changed"
+            second = bulk.load_config()
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(second, [{"name": "alpha", "prompt": "a"}])
+
+    def test_missing_file_returns_empty_list(self):
+        self.data_path.unlink()
+        self.assertEqual(bulk.load_config(), [])
+
+
+@unittest.skipIf(bulk is None, "BulkIllustrationGenerator dependencies not installed")
+class TestSaveImage(unittest.TestCase):
+    """Test suite for BulkIllustrationGenerator.save_image"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def save(self, image, formats=("png", "jpg")):
+        buf = io.BytesIO()
+        image.save(buf, "PNG")
+        data = buf.getvalue()
+        with patch.object(bulk, "OUTPUT_DIR", self.output_dir), \
+                patch.object(bulk, "fetch_bytes", return_value=data):
+            return bulk.save_image("https://fal.media/x.png", "item_illustration.png", formats), data
+
+    def test_png_is_written_verbatim_and_jpg_decoded_from_memory(self):
+        """The downloaded bytes are stored as-is; the JPG comes from the same bytes"""
+        path, data = self.save(bulk.Image.new("RGB", (32, 16), (200, 10, 10)))
+        self.assertEqual(path.read_bytes(), data)
+        with bulk.Image.open(path.with_suffix(".jpg")) as jpg:
+            self.assertEqual((jpg.format, jpg.size), ("JPEG", (32, 16)))
+
+    def test_transparent_png_gets_white_jpg_background(self):
+        """Alpha is flattened onto white for the JPG"""
+        path, _ = self.save(bulk.Image.new("RGBA", (8, 8), (0, 0, 0, 0)))
+        with bulk.Image.open(path.with_suffix(".jpg")) as jpg:
+            self.assertGreater(min(jpg.convert("RGB").getpixel((4, 4))), 245)
+
+    def test_png_only_skips_the_jpg_encode(self):
+        """Without "jpg" in formats Pillow is never used"""
+        with patch.object(bulk.Image, "open") as mock_open:
+            path, data = self.save(bulk.Image.new("RGB", (8, 8)), formats=("png",))
+        mock_open.assert_not_called()
+        self.assertEqual(path.read_bytes(), data)
+        self.assertFalse(path.with_suffix(".jpg").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
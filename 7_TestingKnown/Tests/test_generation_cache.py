@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the on-disk generation result cache
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+from Utils.generation_cache import GenerationCache, compute_cache_key
+from base.base_asset_generator import BaseAssetGenerator
+from base.generator_config import SEEDS, BRAND_COLORS
+
+
+class CacheTestGenerator(BaseAssetGenerator):
+    def get_generation_queue(self):
+        return []
+
+
+class TestGenerationCache(unittest.TestCase):
+    """Test suite for the generation result cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cache_key_is_stable(self):
+        """Identical requests map to the same key, any argument change to a new one"""
+        args = {"prompt": "a prompt", "seed": 123456, "image_size": {"width": 1920, "height": 1080}}
+        key = compute_cache_key("fal-ai/flux/schnell", args)
+        self.assertEqual(key, compute_cache_key("fal-ai/flux/schnell", dict(args)))
+        self.assertNotEqual(key, compute_cache_key("fal-ai/flux/schnell", {**args, "seed": 42}))
+        self.assertNotEqual(key, compute_cache_key("fal-ai/flux/dev", args))
+        self.assertNotEqual(key, compute_cache_key("fal-ai/flux/schnell", {**args, "prompt": "other"}))
+        self.assertNotEqual(key, compute_cache_key("fal-ai/flux/schnell", {**args, "negative_prompt": "x"}))
+
+    def test_generator_cache_key_covers_prepared_arguments(self):
+        """Subclass arguments change the key; unseeded requests are not cached"""
+        class ExtraArgsGenerator(CacheTestGenerator):
+            def prepare_arguments(self, asset_config):
+                arguments = super().prepare_arguments(asset_config)
+                arguments["duration"] = asset_config.get("duration", 30)
+                return arguments
+
+        generator = ExtraArgsGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+        )
+        asset = {"prompt": "A prompt", "model": "fal-ai/flux/schnell", "seed_key": "SEED_002"}
+        key = generator.get_cache_key(asset)
+        self.assertIsNotNone(key)
+        self.assertNotEqual(key, generator.get_cache_key({**asset, "duration": 60}))
+        self.assertEqual(key, generator.get_cache_key(
+            {**asset, "prompt": "Enhanced prompt", "original_prompt": "A prompt"}))
+        self.assertIsNone(generator.get_cache_key({"prompt": "A prompt", "model": "fal-ai/flux/schnell"}))
+
+    def test_store_and_restore(self):
+        """Stored assets are restored byte-for-byte with their metadata"""
+        cache = GenerationCache(self.output_dir / ".cache")
+        asset = self.output_dir / "asset.png"
+        asset.write_bytes(b"png-bytes")
+
+        self.assertIsNone(cache.lookup("k1", "png"))
+        cache.store("k1", asset, {"result_url": "https://example.com/a.png"})
+
+        restored = self.output_dir / "restored.png"
+        self.assertTrue(cache.restore("k1", "png", restored))
+        self.assertEqual(restored.read_bytes(), b"png-bytes")
+        self.assertEqual(cache.load_metadata("k1")["result_url"], "https://example.com/a.png")
+        self.assertFalse(cache.restore("missing", "png", restored))
+
+    @patch('base.base_asset_generator.fal_client.subscribe')
+    def test_generator_cache_hit_skips_api(self, mock_subscribe):
+        """A cached request is served from disk without calling fal.ai"""
+        generator = CacheTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+            output_format="png",
+        )
+        asset_config = {
+            "id": "1.1",
+            "name": "cached_asset",
+            "prompt": "A cached prompt",
+            "model": "fal-ai/flux/schnell",
+            "seed_key": "SEED_002",
+        }
+        source = self.output_dir / "source.png"
+        source.write_bytes(b"cached-bytes")
+        generator.cache.store(generator.get_cache_key(asset_config), source,
+                              {"result_url": "https://example.com/cached.png"})
+
+        result = generator.generate_asset(dict(asset_config))
+
+        mock_subscribe.assert_not_called()
+        self.assertTrue(result["success"])
+        self.assertTrue(result["cached"])
+        self.assertEqual(result["url"], "https://example.com/cached.png")
+        self.assertEqual(Path(result["local_path"]).read_bytes(), b"cached-bytes")
+
+    def test_generator_cache_restore_error_is_a_miss(self):
+        """An OSError while restoring falls through to a normal generation"""
+        generator = CacheTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+            output_format="png",
+        )
+        asset_config = {
+            "name": "cached_asset",
+            "prompt": "A cached prompt",
+            "model": "fal-ai/flux/schnell",
+            "seed_key": "SEED_002",
+        }
+        with patch.object(generator.cache, "restore", side_effect=OSError("disk full")):
+            self.assertIsNone(generator.restore_from_cache(asset_config))
+
+    @patch('base.base_asset_generator.enhance_prompt')
+    def test_enhancement_cache_reuses_gemini_result(self, mock_enhance):
+        """Each distinct prompt is enhanced once and persisted across generator instances"""
+        mock_enhance.return_value = "An enhanced prompt"
+        generator = CacheTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+        )
+
+        self.assertEqual(generator.enhance_prompt_cached("A prompt"), "An enhanced prompt")
+        self.assertEqual(generator.enhance_prompt_cached("A prompt"), "An enhanced prompt")
+        self.assertEqual(mock_enhance.call_count, 1)
+
+        fresh = CacheTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+        )
+        self.assertEqual(fresh.enhance_prompt_cached("A prompt"), "An enhanced prompt")
+        self.assertEqual(mock_enhance.call_count, 1)
+
+    @patch('base.base_asset_generator.enhance_prompt')
+    def test_prewarm_enhances_each_prompt_once_and_survives_errors(self, mock_enhance):
+        """Pre-warm fills the enhancement cache; a failing prompt does not abort the rest"""
+        def enhance(prompt, **kwargs):
+            if prompt == "Broken prompt":
+                raise RuntimeError("Gemini unavailable")
+            return f"Enhanced {prompt}"
+        mock_enhance.side_effect = enhance
+        generator = CacheTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+        )
+        queue = [
+            {"name": "a", "prompt": "Prompt A"},
+            {"name": "b", "prompt": "Prompt B"},
+            {"name": "broken", "prompt": "Broken prompt"},
+        ]
+
+        generator.prewarm_enhancements(queue)
+
+        self.assertEqual(mock_enhance.call_count, 3)
+        self.assertEqual(generator.enhance_prompt_cached("Prompt A"), "Enhanced Prompt A")
+        self.assertEqual(generator.enhance_prompt_cached("Prompt B"), "Enhanced Prompt B")
+        self.assertEqual(mock_enhance.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the green screen background generator (no network)
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+from Images import FalaiGreenScreenBgGenerator as gen_greenscreen
+
+
+def fake_download(url, path, conditional=False):
+    Path(path).unlink(missing_ok=True)
+    Path(path).write_bytes(url.encode("utf-8"))
+
+
+def background(bg_id, prompt):
+    return {"id": bg_id, "name": bg_id.title(), "scene": "Scene", "timecode": "00:00:00", "prompt": prompt}
+
+
+class TestGreenScreenBackgrounds(unittest.TestCase):
+    """Test suite for FalaiGreenScreenBgGenerator.main"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+        self.submitted = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def submit(self, model, arguments):
+        self.submitted.append(arguments["prompt"])
+        handle = MagicMock()
+        handle.request_id = f"req-{len(self.submitted)}"
+        handle.get.return_value = {"images": [{"url": f"https://fal.media/{len(self.submitted)}.png"}]}
+        return handle
+
+    def run_main(self, backgrounds):
+        with patch.dict(os.environ, {"FAL_KEY": "test-key"}), \
+                patch.object(gen_greenscreen, "OUTPUT_DIR", self.output_dir), \
+                patch.object(gen_greenscreen, "AROLL_BACKGROUNDS", backgrounds), \
+                patch.object(gen_greenscreen.fal_client, "submit", side_effect=self.submit), \
+                patch.object(gen_greenscreen, "download_file", side_effect=fake_download):
+            gen_greenscreen.main()
+        summaries = sorted(self.output_dir.glob("greenscreen_bg_falai_summary_*.json"))
+        return json.loads(summaries[-1].read_text(encoding="utf-8"))
+
+    def test_duplicate_prompts_are_generated_once(self):
+        """A second background with the same request is restored from the cache for free"""
+        summary = self.run_main([background("bg_a", "same plate"), background("bg_b", "same plate")])
+        self.assertEqual(self.submitted, ["same plate"])
+        self.assertEqual(summary["successful"], 2)
+        self.assertAlmostEqual(summary["total_cost"], gen_greenscreen.COST_PER_IMAGE)
+        # Concurrent workers: either duplicate may be the one that generates
+        self.assertEqual(sorted(r["cached"] for r in summary["results"]), [False, True])
+
+    def test_no_pending_requests_left_after_success(self):
+        """Request ids are cleared from the sidecar once results arrive"""
+        self.run_main([background("bg_a", "plate a"), background("bg_b", "plate b")])
+        self.assertEqual(len(self.submitted), 2)
+        self.assertFalse((self.output_dir / gen_greenscreen.PENDING_FILENAME).exists())
+
+    def test_failed_generation_is_not_charged(self):
+        """Concurrent run: results keep their order and only successes count toward the cost"""
+        submit = self.submit
+
+        def flaky_submit(model, arguments):
+            if arguments["prompt"] == "plate b":
+                raise RuntimeError("boom")
+            return submit(model, arguments)
+
+        self.submit = flaky_submit
+        summary = self.run_main([background(f"bg_{c}", f"plate {c}") for c in "abc"])
+        self.assertEqual([r["success"] for r in summary["results"]], [True, False, True])
+        self.assertAlmostEqual(summary["total_cost"], 2 * gen_greenscreen.COST_PER_IMAGE)
+
+    def test_backgrounds_over_budget_are_skipped_without_submitting(self):
+        """Only as many requests as the budget covers are sent; the rest are reported"""
+        with patch.object(gen_greenscreen, "BUDGET_LIMIT", 2 * gen_greenscreen.COST_PER_IMAGE):
+            summary = self.run_main([background(f"bg_{c}", f"plate {c}") for c in "abcd"])
+        self.assertEqual(sorted(self.submitted), ["plate a", "plate b"])
+        self.assertEqual([r["success"] for r in summary["results"]], [True, True, False, False])
+        self.assertEqual(summary["results"][-1]["error"], "Budget limit reached")
+
+
+if __name__ == "__main__":
+    unittest.main()
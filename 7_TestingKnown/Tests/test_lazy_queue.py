@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Unit tests for lazy, mtime-memoized YAML queue loading
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+from Images import BatchAssetGeneratorGraphics as gen_graphics
+
+
+class TestLazyQueue(unittest.TestCase):
+    """Test suite for load_queue() / GENERATION_QUEUE"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.temp_dir.name) / "batch_generation_data.yaml"
+        self.data_path.write_text("graphics:\n  - id: G.1\n    name: first\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_queue_is_not_loaded_at_import(self):
+        """GENERATION_QUEUE is resolved on attribute access, not stored at import"""
+        self.assertNotIn("GENERATION_QUEUE", vars(gen_graphics))
+        with patch.object(gen_graphics, "DATA_PATH", self.data_path):
+            self.assertEqual(gen_graphics.GENERATION_QUEUE[0]["id"], "G.1")
+
+    def test_load_queue_memoized_until_file_changes(self):
+        """Unchanged files are parsed once; a newer mtime triggers a reload"""
+        with patch.object(gen_graphics, "DATA_PATH", self.data_path):
+            first = gen_graphics.load_queue()
+            with patch("yaml.load") as mock_load:
+                second = gen_graphics.load_queue()
+                mock_load.assert_not_called()
+            self.assertEqual(second, first)
+
+            # Mutating a returned entry must not leak into later loads
+            first[0]["name"] = "mutated"
+            self.assertEqual(gen_graphics.load_queue()[0]["name"], "first")
+
+            self.data_path.write_text("graphics:\n  - id: G.2\n    name: second\n", encoding="utf-8")
+            stat = self.data_path.stat()
+            os.utime(self.data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(gen_graphics.load_queue()[0]["id"], "G.2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the memory palace batch generator (budget and prompt cache)
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+from Images import BatchAssetGeneratorMemoryPalace as gen_memory_palace
+
+
+def fake_download(url, path):
+    # Large enough to count as a complete image
+    Path(path).write_bytes(url.encode("utf-8") * 100)
+
+
+class TestMemoryPalace(unittest.TestCase):
+    """Test suite for BatchAssetGeneratorMemoryPalace"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+        self.asset = gen_memory_palace.GENERATION_QUEUE[0]
+        self.patches = [
+            patch.object(gen_memory_palace, "download_file", side_effect=fake_download),
+            patch.object(gen_memory_palace, "compress_png"),
+        ]
+        for p in self.patches:
+            p.start()
+        gen_memory_palace.load_prompt_cache(self.output_dir)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.temp_dir.cleanup()
+
+    def generate(self, budget, timestamp="20260101_000000"):
+        result = {"images": [{"url": "https://example.com/mp.png"}]}
+        with patch.object(gen_memory_palace.fal_client, "subscribe", return_value=result) as mock_subscribe:
+            outcome = gen_memory_palace.generate_asset(self.asset, 1, 1, budget, timestamp, self.output_dir)
+        return outcome, mock_subscribe.call_count
+
+    def test_queue_is_loaded_lazily_from_json(self):
+        """GENERATION_QUEUE is read from memory_palace_queue.json on access, as copies"""
+        self.assertNotIn("GENERATION_QUEUE", vars(gen_memory_palace))
+        queue = gen_memory_palace.GENERATION_QUEUE
+        self.assertEqual(len(queue), 12)
+        self.assertEqual(queue[0]["id"], "MP.01")
+        queue[0]["prompt"] = "mutated"
+        self.assertNotEqual(gen_memory_palace.load_queue()[0]["prompt"], "mutated")
+
+    def test_process_queue_records_results_and_manifest(self):
+        """process_queue returns results in queue order and fills the manifest"""
+        from Utils.asset_utils import ManifestTracker
+        queue = gen_memory_palace.load_queue()[:3]
+        manifest = ManifestTracker(self.output_dir)
+        out_dir = self.output_dir / "generated_memory_palace"
+
+        def fake_subscribe(model, arguments):
+            return {"images": [{"url": "https://example.com/" + arguments["prompt"][:20].replace(" ", "_")}]}
+
+        with patch.object(gen_memory_palace.fal_client, "subscribe", side_effect=fake_subscribe):
+            results = gen_memory_palace.process_queue(queue, out_dir, manifest=manifest, max_workers=3)
+
+        self.assertEqual([r["asset_id"] for r in results], [a["id"] for a in queue])
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(sorted(a["asset_id"] for a in manifest.assets), sorted(a["id"] for a in queue))
+        self.assertEqual(len(list(out_dir.glob("memory_palace_summary_*.json"))), 1)
+        self.assertEqual(gen_memory_palace.process_queue([], out_dir), [])
+
+    def test_budget_reservation(self):
+        """Requests reserve their cost up front and cannot exceed the limit"""
+        budget = gen_memory_palace.BudgetTracker(0.015)
+        self.assertTrue(budget.reserve(0.01))
+        self.assertFalse(budget.reserve(0.01))
+        budget.release(0.01)
+        self.assertTrue(budget.reserve(0.01))
+
+    def test_identical_request_is_served_from_cache(self):
+        """A rerun with the same request skips fal.ai while the PNG exists"""
+        budget = gen_memory_palace.BudgetTracker(1.0)
+        first, calls = self.generate(budget)
+        self.assertTrue(first["success"])
+        self.assertEqual(calls, 1)
+
+        # New run: cache is reloaded from disk
+        gen_memory_palace.load_prompt_cache(self.output_dir)
+        second, calls = self.generate(gen_memory_palace.BudgetTracker(1.0), timestamp="20260102_000000")
+        self.assertEqual(calls, 0)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["local_path"], first["local_path"])
+
+        # A truncated PNG (e.g. from a crash) is not reused
+        Path(first["local_path"]).write_bytes(b"")
+        gen_memory_palace.load_prompt_cache(self.output_dir)
+        third, calls = self.generate(gen_memory_palace.BudgetTracker(1.0), timestamp="20260103_000000")
+        self.assertEqual(calls, 1)
+        self.assertNotIn("cached", third)
+
+        # Once the PNG is gone the request is generated again
+        Path(third["local_path"]).unlink()
+        third, calls = self.generate(gen_memory_palace.BudgetTracker(1.0))
+        self.assertEqual(calls, 1)
+        self.assertNotIn("cached", third)
+
+    def test_formatting_only_prompt_edits_share_a_cache_key(self):
+        """Whitespace, case and comma changes map to the same key; real edits do not"""
+        key = gen_memory_palace.prompt_cache_key
+        base = {"prompt": "A golden microphone, dramatic spotlight, 8K"}
+        self.assertEqual(key(base), key({"prompt": "  a golden  microphone dramatic spotlight,\n8K. "}))
+        self.assertNotEqual(key(base), key({"prompt": "A silver microphone, dramatic spotlight, 8K"}))
+
+    @unittest.skipUnless(gen_memory_palace.PIL_AVAILABLE, "Pillow not installed")
+    def test_compress_png_is_lossless(self):
+        """Recompressed PNGs keep identical pixels and never grow"""
+        from PIL import Image
+        path = self.output_dir / "raw.png"
+        img = Image.new("RGB", (64, 64), (10, 20, 30))
+        img.save(path, "PNG", compress_level=0)
+        before = path.stat().st_size
+        with patch.object(gen_memory_palace.shutil, "which", return_value=None):
+            gen_memory_palace.compress_png(path)
+        self.assertLessEqual(path.stat().st_size, before)
+        with Image.open(path) as result:
+            self.assertEqual(result.convert("RGB").tobytes(), img.tobytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
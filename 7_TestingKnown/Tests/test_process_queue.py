@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Unit tests for BaseAssetGenerator.process_queue scheduling
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+from base.base_asset_generator import BaseAssetGenerator, MIN_IMAGE_BYTES
+from base.generator_config import SEEDS, BRAND_COLORS
+
+
+class QueueTestGenerator(BaseAssetGenerator):
+    def get_generation_queue(self):
+        return []
+
+
+def fake_download(self, result_url, asset_path, base_filename, extension):
+    # Padded past MIN_IMAGE_BYTES so reruns see a finished image
+    Path(asset_path).write_bytes(result_url.encode("utf-8").ljust(MIN_IMAGE_BYTES, b"\0"))
+
+
+class TestProcessQueue(unittest.TestCase):
+    """Test suite for queue scheduling"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+        self.queue = [
+            {
+                "id": f"1.{n}",
+                "name": f"asset_{n}",
+                "prompt": f"Prompt {n}",
+                "model": "fal-ai/flux/schnell",
+                "seed_key": "SEED_002" if n % 2 else "SEED_001",
+            }
+            for n in range(1, 6)
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_queue(self, max_workers, output_dir=None, force=False, on_subscribe=None, download=fake_download):
+        generator = QueueTestGenerator(
+            output_dir=output_dir or self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+            output_format="png",
+            use_cache=False,
+            max_workers=max_workers,
+            force=force,
+        )
+
+        def fake_subscribe(model, arguments):
+            if on_subscribe:
+                on_subscribe(arguments)
+            return {"images": [{"url": f"https://example.com/{arguments['prompt'].replace(' ', '_')}.png"}]}
+
+        env = {k: v for k, v in os.environ.items() if k not in ("GEMINIKEY", "GEMINI_API_KEY")}
+        env["FAL_KEY"] = "test-key"
+        with patch.dict(os.environ, env, clear=True), \
+                patch("base.base_asset_generator.fal_client.subscribe", side_effect=fake_subscribe) as mock_subscribe, \
+                patch.object(QueueTestGenerator, "download_asset", download):
+            results = generator.process_queue(list(self.queue))
+        self.subscribe_calls = mock_subscribe.call_count
+        return results
+
+    def test_results_are_complete_and_ordered(self):
+        """Sequential and concurrent runs return every asset in queue order"""
+        for max_workers in (1, 3):
+            results = self.run_queue(max_workers, output_dir=self.output_dir / f"workers_{max_workers}")
+            self.assertEqual([r["asset_id"] for r in results], [a["id"] for a in self.queue])
+            for result, asset in zip(results, self.queue):
+                self.assertTrue(result["success"])
+                self.assertNotIn("pending", result)
+                self.assertTrue(Path(result["local_path"]).read_bytes()
+                                .startswith(result["url"].encode("utf-8")))
+                self.assertIn(asset["prompt"].replace(" ", "_"), result["url"])
+
+    def test_download_overlaps_next_request(self):
+        """The next fal.ai request is sent while the previous image downloads"""
+        second_request = threading.Event()
+        overlapped = []
+
+        def on_subscribe(arguments):
+            if arguments["prompt"] == self.queue[1]["prompt"]:
+                second_request.set()
+
+        def slow_download(generator, result_url, asset_path, base_filename, extension):
+            if f"{self.queue[0]['name']}_" in base_filename:
+                overlapped.append(second_request.wait(timeout=2))
+            fake_download(generator, result_url, asset_path, base_filename, extension)
+
+        results = self.run_queue(1, on_subscribe=on_subscribe, download=slow_download)
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(overlapped, [True])
+
+    def test_existing_outputs_are_skipped_unless_forced(self):
+        """A rerun skips assets whose output file exists; force regenerates them"""
+        self.run_queue(1)
+        self.assertEqual(self.subscribe_calls, len(self.queue))
+
+        results = self.run_queue(1)
+        self.assertEqual(self.subscribe_calls, 0)
+        self.assertTrue(all(r["success"] and r.get("skipped") for r in results))
+
+        self.run_queue(1, force=True)
+        self.assertEqual(self.subscribe_calls, len(self.queue))
+
+    def test_failed_download_is_regenerated_on_rerun(self):
+        """A download that dies mid-body leaves no file a rerun would skip"""
+        def broken_download_file(url, dest, conditional=False):
+            Path(dest).write_bytes(b"\x89PNG partial")
+            raise OSError("connection reset")
+
+        with patch("base.base_asset_generator.download_file", side_effect=broken_download_file):
+            results = self.run_queue(1, download=BaseAssetGenerator.download_asset)
+        self.assertFalse(any(r["success"] for r in results))
+        self.assertEqual(list(self.output_dir.glob("*.png")), [])
+
+        results = self.run_queue(1)
+        self.assertEqual(self.subscribe_calls, len(self.queue))
+        self.assertTrue(all(r["success"] and not r.get("skipped") for r in results))
+
+    def test_truncated_output_is_not_treated_as_finished(self):
+        """An existing image below MIN_IMAGE_BYTES is regenerated, not skipped"""
+        self.run_queue(1)
+        first = self.output_dir / Path(self.run_queue(1)[0]["local_path"]).name
+        first.write_bytes(b"\x89PNG partial")
+        self.run_queue(1)
+        self.assertEqual(self.subscribe_calls, 1)
+
+    def test_first_asset_warms_up_before_fan_out(self):
+        """With workers, the first asset finishes before the others are submitted"""
+        events = []
+        lock = threading.Lock()
+
+        def on_subscribe(arguments):
+            with lock:
+                events.append(("start", arguments["prompt"]))
+            time.sleep(0.02)
+            with lock:
+                events.append(("end", arguments["prompt"]))
+
+        results = self.run_queue(3, on_subscribe=on_subscribe)
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(len(events), 2 * len(self.queue))
+        # The warm-up call is the first asset in bucket order and runs alone
+        self.assertEqual(events[0], ("start", self.queue[0]["prompt"]))
+        self.assertEqual(events[1], ("end", self.queue[0]["prompt"]))
+
+    def test_bucket_queue_groups_by_model_and_seed(self):
+        """Assets sharing model and seed land in the same bucket, in queue order"""
+        generator = QueueTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+        )
+        queue = [
+            {"model": "fal-ai/flux/schnell", "seed_key": "SEED_002"},
+            {"model": "fal-ai/flux/dev", "seed_key": "SEED_002"},
+            {"model": "fal-ai/flux/schnell", "seed_key": "SEED_002"},
+            {"model": "fal-ai/flux/schnell", "seed_key": "SEED_001"},
+        ]
+        self.assertEqual(generator.bucket_queue(queue), [[0, 2], [1], [3]])
+
+    def test_extract_result_urls_returns_all_images(self):
+        """Every image of a num_images request is returned"""
+        generator = QueueTestGenerator(
+            output_dir=self.output_dir,
+            seeds=SEEDS,
+            brand_colors=BRAND_COLORS,
+            asset_type="image",
+        )
+        result = {"images": [{"url": "https://example.com/1.png"}, {"url": "https://example.com/2.png"}]}
+        self.assertEqual(generator.extract_result_urls(result),
+                         ["https://example.com/1.png", "https://example.com/2.png"])
+        self.assertEqual(generator.extract_result_urls({}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent thumbnail generation (no network)
+"""
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add 5_Symbols to path
+project_root = Path(__file__).resolve().parent.parent.parent
+symbols_path = project_root / "5_Symbols"
+sys.path.insert(0, str(symbols_path))
+
+from Images import BatchAssetGeneratorThumbnails as gen_thumbnails
+from Utils.asset_utils import ManifestTracker
+
+
+def fake_download(url, path, conditional=False):
+    Path(path).unlink(missing_ok=True)
+    Path(path).write_bytes(url.encode("utf-8"))
+
+
+class TestThumbnailsQueue(unittest.TestCase):
+    """Test suite for BatchAssetGeneratorThumbnails.process_queue"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+        self.queue = gen_thumbnails.THUMBNAIL_PROMPTS[:3]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_queue(self, subscribe, manifest=None):
+        with patch.object(gen_thumbnails.fal_client, "subscribe", side_effect=subscribe), \
+                patch.object(gen_thumbnails, "download_file", side_effect=fake_download):
+            return gen_thumbnails.process_queue(self.queue, self.output_dir, manifest)
+
+    def test_requests_run_concurrently_and_results_keep_order(self):
+        """All jobs are in flight together; results come back in queue order"""
+        # Each request waits until every request has started: only passes if all run at once
+        barrier = threading.Barrier(len(self.queue), timeout=5)
+
+        def subscribe(model, arguments):
+            barrier.wait()
+            return {"images": [{"url": "https://example.com/" + arguments["prompt"][:10].replace(" ", "_")}]}
+
+        manifest = ManifestTracker(self.output_dir)
+        results = self.run_queue(subscribe, manifest)
+        self.assertEqual([r["id"] for r in results], [c.id for c in self.queue])
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(sorted(a["asset_id"] for a in manifest.assets), sorted(c.id for c in self.queue))
+        # The manifest entry reuses the timestamp taken for the result
+        stamps = {a["asset_id"]: a["timestamp"] for a in manifest.assets}
+        self.assertEqual(stamps, {r["id"]: r["timestamp"] for r in results})
+
+    def test_failures_are_reported_per_thumbnail(self):
+        """A failing request does not stop the others"""
+        def subscribe(model, arguments):
+            if arguments["prompt"] == self.queue[1].prompt:
+                raise RuntimeError("boom")
+            return {"images": [{"url": "https://example.com/ok.png"}]}
+
+        results = self.run_queue(subscribe)
+        self.assertEqual([r["success"] for r in results], [True, False, True])
+        self.assertEqual(results[1]["error"], "boom")
+
+    def test_rate_limited_requests_are_retried(self):
+        """A 429 is retried instead of failing the thumbnail"""
+        class RateLimited(Exception):
+            status_code = 429
+
+        calls = []
+
+        def subscribe(model, arguments):
+            calls.append(arguments["prompt"])
+            if calls.count(arguments["prompt"]) == 1:
+                raise RateLimited("too many requests")
+            return {"images": [{"url": "https://example.com/ok.png"}]}
+
+        with patch("Utils.rate_limit.time.sleep"):
+            results = self.run_queue(subscribe)
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(len(calls), 2 * len(self.queue))
+
+    def test_dict_configs_are_accepted(self):
+        """Callers may still pass plain dict configs"""
+        self.queue = [{"id": "thumb_dict", "name": "Dict Config", "scene": 7,
+                       "prompt": "dict prompt", "description": "from a dict"}]
+        results = self.run_queue(lambda model, arguments: {"images": [{"url": "https://example.com/d.png"}]})
+        self.assertTrue(results[0]["success"])
+        self.assertEqual(results[0]["id"], "thumb_dict")
+
+    def test_output_dir_is_created_on_first_run(self):
+        """Importing the module creates nothing; process_queue makes the directory"""
+        self.output_dir = self.output_dir / "nested" / "out"
+        results = self.run_queue(lambda model, arguments: {"images": [{"url": "https://example.com/n.png"}]})
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertTrue(self.output_dir.is_dir())
+
+    def test_identical_requests_are_served_from_cache(self):
+        """A second run restores unchanged thumbnails without calling fal.ai"""
+        calls = []
+
+        def subscribe(model, arguments):
+            calls.append(arguments["prompt"])
+            return {"images": [{"url": "https://example.com/" + arguments["prompt"][:10].replace(" ", "_")}]}
+
+        first = self.run_queue(subscribe)
+        self.assertEqual(len(calls), len(self.queue))
+
+        # Remove outputs; the cache alone must bring them back
+        for r in first:
+            Path(r["filepath"]).unlink()
+        second = self.run_queue(subscribe)
+        self.assertEqual(len(calls), len(self.queue))
+        for before, after in zip(first, second):
+            self.assertTrue(after["cached"])
+            self.assertEqual(after["url"], before["url"])
+            self.assertEqual(Path(after["filepath"]).read_bytes(), before["url"].encode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()